@@ -7,19 +7,31 @@ Autor: Sistema de Análisis Sísmico
 Fecha: 2025
 """
 
+import uuid
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
 # Importar módulos personalizados
-from components.sidebar import render_sidebar
+from components.sidebar import (
+    render_sidebar, render_job_progress, render_fragment_timings, render_export_panel
+)
 from components.intro import render_intro
 from components.eda import render_eda_section
 from components.conclusions import render_conclusions
 from components.ml import render_ml_section
-from utils.data_loader import load_data, get_filtered_data
+from components.sql_console import render_sql_console
+from utils.data_loader import load_data, get_filtered_data, get_data_fingerprint
+from utils.fragments import get_fragment_timings
+from utils.cancellation import rerun_checkpoint
+from utils.jobs import get_job
+from utils.rates import wilson_interval
 from utils.styles import apply_custom_css
+from utils.warmup import (
+    record_filter_usage, start_view_warmup, start_warmup, WARMUP_JOB_KEY
+)
 
 # ============================================================================
 # CONFIGURACIÓN DE LA PÁGINA
@@ -57,6 +69,10 @@ def init_session_state():
         st.session_state.data_loaded = False
     if 'current_section' not in st.session_state:
         st.session_state.current_section = 'Introducción'
+    if 'session_key' not in st.session_state:
+        st.session_state.session_key = uuid.uuid4().hex
+    if 'view_fingerprint' not in st.session_state:
+        st.session_state.view_fingerprint = None
 
 # ============================================================================
 # FUNCIÓN PRINCIPAL
@@ -104,7 +120,28 @@ def main():
     filters = render_sidebar(df)
     
     # Aplicar filtros a los datos
-    df_filtered = get_filtered_data(df, filters)
+    df_filtered = get_filtered_data(df, filters, checkpoint=rerun_checkpoint)
+    
+    # ========================================================================
+    # PRECÁLCULO EN SEGUNDO PLANO
+    # ========================================================================
+    
+    # Filtros predefinidos y populares (al arrancar, si cambian los datos o si
+    # cambia el ranking de populares)
+    start_warmup(df)
+    
+    # Variantes de la vista actual; un cambio de filtros cancela el trabajo
+    # anterior de la sesión
+    view_fingerprint = get_data_fingerprint(df_filtered)
+    if view_fingerprint != st.session_state.view_fingerprint:
+        st.session_state.view_fingerprint = view_fingerprint
+        record_filter_usage(filters)
+        start_view_warmup(st.session_state.session_key, df_filtered)
+    
+    with st.sidebar:
+        render_job_progress([get_job(WARMUP_JOB_KEY),
+                             get_job(f"view:{st.session_state.session_key}")])
+        render_export_panel(df, df_filtered, st.session_state.session_key)
     
     # ========================================================================
     # MÉTRICAS RÁPIDAS (KPIs)
@@ -124,10 +161,13 @@ def main():
     with col2:
         tsunami_count = df_filtered['tsunami'].sum()
         tsunami_pct = (tsunami_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
+        ci_low, ci_high = wilson_interval(tsunami_count, len(df_filtered))
         st.metric(
             label="🌊 Tsunamis",
             value=f"{int(tsunami_count):,}",
-            delta=f"{tsunami_pct:.1f}%"
+            delta=f"{tsunami_pct:.1f}%",
+            help=(f"IC 95% (Wilson) de la tasa de tsunami: {ci_low * 100:.1f}% – {ci_high * 100:.1f}%"
+                  if len(df_filtered) > 0 else None)
         )
     
     with col3:
@@ -161,25 +201,32 @@ def main():
     # ========================================================================
     
     # Tabs principales
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📖 Introducción & Contexto",
         "📊 Análisis Exploratorio (EDA)",
         "📌 Conclusiones & Recomendaciones",
-        "🤖 Machine Learning (Próximamente)"
+        "🤖 Machine Learning",
+        "🧮 Consulta Avanzada"
     ])
     
     with tab1:
         render_intro(df_filtered)
     
     with tab2:
+        rerun_checkpoint()
         render_eda_section(df_filtered)
     
     with tab3:
+        rerun_checkpoint()
         render_conclusions(df_filtered)
     
     with tab4:
+        rerun_checkpoint()
         render_ml_section(df_filtered)
     
+    with tab5:
+        render_sql_console(df, get_data_fingerprint(df))
+    
     # ========================================================================
     # FOOTER
     # ========================================================================
@@ -195,6 +242,10 @@ def main():
             </p>
         </div>
     """, unsafe_allow_html=True)
+    
+    # Al final del script: incluye los tiempos de las regiones de esta ejecución
+    with st.sidebar:
+        render_fragment_timings(get_fragment_timings())
 
 # ============================================================================
 # PUNTO DE ENTRADA
@@ -0,0 +1,166 @@
+"""
+Prueba de Carga del Modo Multiproceso
+======================================
+Simula sesiones concurrentes de navegador contra el proxy de `cluster.py`
+(o contra un único `streamlit run`, para comparar):
+
+1. GET de la página (recibe la cookie de afinidad del proxy)
+2. Websocket a `/_stcore/stream` con esa cookie
+3. N ejecuciones del script (`rerun_script`), midiendo el tiempo hasta
+   `script_finished`
+
+Requiere el paquete opcional `websockets` (`pip install websockets`).
+
+Uso:
+    python cluster.py --workers 4 &
+    python bench_cluster.py --sessions 40 --reruns 5
+    python bench_cluster.py --url http://127.0.0.1:8501 --sessions 10
+
+Autor: Sistema de Análisis Sísmico
+Fecha: 2025
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+from http.cookies import SimpleCookie
+from typing import Dict, List, Any
+from urllib.parse import urlparse
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from utils.balancer import AFFINITY_COOKIE
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+DEFAULT_URL = "http://127.0.0.1:8501"
+STREAM_PATH = "/_stcore/stream"
+RUN_TIMEOUT_S = 300
+
+# ============================================================================
+# SESIONES SIMULADAS
+# ============================================================================
+
+async def fetch_cookies(host: str, port: int) -> Dict[str, str]:
+    """GET de la página principal; devuelve las cookies recibidas."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        head = await reader.readuntil(b'\r\n\r\n')
+        await reader.read()
+    finally:
+        writer.close()
+
+    cookies = SimpleCookie()
+    for line in head.decode('latin-1').split('\r\n')[1:]:
+        if line.lower().startswith('set-cookie:'):
+            cookies.load(line.split(':', 1)[1].strip())
+    return {name: morsel.value for name, morsel in cookies.items()}
+
+
+def rerun_message() -> bytes:
+    """BackMsg que pide una ejecución completa del script."""
+    msg = BackMsg()
+    msg.rerun_script.query_string = ''
+    msg.rerun_script.page_script_hash = ''
+    return msg.SerializeToString()
+
+
+async def run_session(websockets, url: str, reruns: int) -> Dict[str, Any]:
+    """
+    Una sesión de navegador simulada.
+
+    Returns:
+        Dict con 'worker', 'connect_ms' y 'runs_ms' (una por ejecución)
+    """
+    parsed = urlparse(url)
+    start = time.perf_counter()
+    cookies = await fetch_cookies(parsed.hostname, parsed.port or 80)
+    cookie_header = '; '.join(f"{name}={value}" for name, value in cookies.items())
+
+    ws_url = f"ws://{parsed.hostname}:{parsed.port or 80}{STREAM_PATH}"
+    async with websockets.connect(ws_url, subprotocols=['streamlit'], max_size=None,
+                                  additional_headers={'Cookie': cookie_header}) as ws:
+        connect_ms = (time.perf_counter() - start) * 1000
+        runs_ms: List[float] = []
+        for _ in range(reruns):
+            run_start = time.perf_counter()
+            await ws.send(rerun_message())
+            while True:
+                raw = await asyncio.wait_for(ws.recv(), RUN_TIMEOUT_S)
+                msg = ForwardMsg()
+                msg.ParseFromString(raw)
+                if msg.WhichOneof('type') == 'script_finished':
+                    break
+            runs_ms.append((time.perf_counter() - run_start) * 1000)
+
+    return {'worker': cookies.get(AFFINITY_COOKIE, '-'), 'connect_ms': connect_ms, 'runs_ms': runs_ms}
+
+# ============================================================================
+# INFORME
+# ============================================================================
+
+def percentiles(values: List[float]) -> str:
+    """p50 / p95 / p99 / máximo de una lista de latencias (ms)."""
+    if not values:
+        return "sin datos"
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return (f"p50 = {statistics.median(ordered):.0f} ms | p95 = {pick(0.95):.0f} ms | "
+            f"p99 = {pick(0.99):.0f} ms | máx = {ordered[-1]:.0f} ms")
+
+
+async def run_load_test(url: str, sessions: int, reruns: int, ramp_s: float) -> int:
+    """Lanza las sesiones concurrentes e imprime el resumen."""
+    try:
+        import websockets
+    except ImportError:
+        print("❌ Falta el paquete opcional 'websockets': pip install websockets")
+        return 1
+
+    async def delayed(i: int):
+        await asyncio.sleep(ramp_s * i / max(sessions, 1))
+        return await run_session(websockets, url, reruns)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(delayed(i) for i in range(sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    ok = [result for result in results if isinstance(result, dict)]
+    errors = [result for result in results if not isinstance(result, dict)]
+    first_runs = [result['runs_ms'][0] for result in ok if result['runs_ms']]
+    reruns_ms = [ms for result in ok for ms in result['runs_ms'][1:]]
+    total_runs = sum(len(result['runs_ms']) for result in ok)
+
+    print(f"Sesiones: {len(ok)}/{sessions} correctas en {elapsed:.1f} s "
+          f"({total_runs / elapsed:.1f} ejecuciones/s)")
+    print(f"Conexión (GET + websocket): {percentiles([r['connect_ms'] for r in ok])}")
+    print(f"Primera ejecución:          {percentiles(first_runs)}")
+    print(f"Reejecuciones:              {percentiles(reruns_ms)}")
+    distribution = Counter(result['worker'] for result in ok)
+    print("Sesiones por worker: " + ", ".join(f"{worker}: {count}"
+                                              for worker, count in sorted(distribution.items())))
+    for error in errors[:5]:
+        print(f"⚠️ {type(error).__name__}: {error}")
+    return 1 if errors else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga del panel en modo multiproceso")
+    parser.add_argument('--url', default=DEFAULT_URL, help="URL del proxy (o de un worker)")
+    parser.add_argument('--sessions', type=int, default=20, help="Sesiones concurrentes")
+    parser.add_argument('--reruns', type=int, default=3, help="Ejecuciones por sesión")
+    parser.add_argument('--ramp', type=float, default=2.0, help="Segundos para abrir todas las sesiones")
+    args = parser.parse_args(argv)
+    return asyncio.run(run_load_test(args.url, args.sessions, args.reruns, args.ramp))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
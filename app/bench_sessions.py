@@ -0,0 +1,358 @@
+"""
+Simulador de Sesiones de Analistas
+===================================
+Prueba de carga y de fugas de memoria sin navegador: cada analista es una
+sesión de `AppTest` que ejecuta el script completo y aplica interacciones
+aleatorias como las de un uso real:
+
+- Filtros de la barra lateral (formulario + "Aplicar filtros"), estado de
+  tsunami, región, análisis avanzados y tema de gráficos
+- Tipo de mapa de la pestaña de EDA
+- Cambios de pestaña: un widget de la pestaña elegida (variable de
+  distribución, serie, ventana móvil, simulación del modelo, método del
+  intervalo, regla a calibrar)
+
+Las sesiones se intercalan en un único proceso, como las atiende un worker
+(un solo GIL y cachés compartidas entre sesiones). AppTest ejecuta el script
+completo en cada interacción, también cuando en el navegador solo se
+reejecutaría un fragmento: las latencias son una cota superior.
+
+Informe: throughput, percentiles de latencia (global y por interacción),
+sesiones que soporta una instancia según el tiempo de reflexión, crecimiento
+de memoria por sesión y pendiente de memoria tras el calentamiento (con las
+líneas que más crecen si se sospecha una fuga).
+
+Uso:
+    python bench_sessions.py                              # 8 sesiones x 25 interacciones
+    python bench_sessions.py --sessions 20 --interactions 100 --think 10
+    python bench_sessions.py --sessions 4 --interactions 1000   # Detección de fugas
+    python bench_sessions.py --sessions 2 --interactions 200 --tracemalloc
+
+Autor: Sistema de Análisis Sísmico
+Fecha: 2025
+"""
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from utils.aggregations import DISTRIBUTION_VARIABLES
+from utils.alerts import ALERT_RULES
+from utils.rates import INTERVAL_METHODS
+from utils.rolling import ROLLING_WINDOWS
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+APP_PATH = str(Path(__file__).parent / 'app.py')
+RUN_TIMEOUT_S = 300
+RANGE_STEPS = 5                   # Valores posibles por extremo de cada rango
+DEFAULT_THINK_S = 15.0
+TARGET_UTILIZATION = 0.7
+LEAK_THRESHOLD_KB = 256           # Por cada 1000 ejecuciones, tras el calentamiento
+TOP_GROWTH_LINES = 10
+
+APPLY_BUTTON = "✅ Aplicar filtros"
+MAP_RADIO = "Selecciona el tipo de visualización:"
+
+# ============================================================================
+# INTERACCIONES
+# ============================================================================
+
+def _find(container, kind: str, label: str):
+    """Primer widget de un tipo con esa etiqueta, o None si no se muestra."""
+    for widget in getattr(container, kind):
+        if widget.label == label:
+            return widget
+    return None
+
+
+def _random_range(rng: random.Random, widget) -> List:
+    """Rango aleatorio de un slider sobre una rejilla de RANGE_STEPS puntos."""
+    grid = np.linspace(widget.proto.min, widget.proto.max, RANGE_STEPS)
+    low, high = sorted(rng.sample(range(RANGE_STEPS), 2))
+    cast = int if isinstance(widget.value[0], int) else lambda v: round(float(v), 1)
+    return [cast(grid[low]), cast(grid[high])]
+
+
+def change_filters(at: AppTest, rng: random.Random) -> bool:
+    """Rellena el formulario de filtros y pulsa "Aplicar filtros"."""
+    sidebar = at.sidebar
+    button = _find(sidebar, 'button', APPLY_BUTTON)
+    if button is None:
+        return False
+    for label in ("Rango de Años", "Magnitud", "Profundidad (km)"):
+        slider = _find(sidebar, 'slider', label)
+        if slider is not None and rng.random() < 0.5:
+            slider.set_range(*_random_range(rng, slider))
+    months = _find(sidebar, 'multiselect', "Meses del Año")
+    if months is not None:
+        months.set_value(list(range(1, 13)) if rng.random() < 0.6
+                         else sorted(rng.sample(range(1, 13), rng.randint(3, 11))))
+    mainshocks = _find(sidebar, 'checkbox', "Solo eventos principales")
+    if mainshocks is not None:
+        mainshocks.set_value(rng.random() < 0.3)
+    scale = _find(sidebar, 'select_slider', "Escala de ventanas")
+    if scale is not None:
+        scale.set_value(rng.choice([0.5, 0.75, 1.0, 1.5, 2.0]))
+    button.click()
+    return True
+
+
+def _choose(kind: str, label: str, options: Optional[List] = None, where: str = 'main') -> Callable:
+    """
+    Interacción que elige una opción aleatoria de un widget.
+
+    Args:
+        kind: Tipo de widget en AppTest ('radio', 'selectbox', 'slider', ...)
+        label: Etiqueta del widget
+        options: Valores admitidos; None usa las opciones que muestra el widget
+            (solo válido si no tiene `format_func`)
+        where: 'main' o 'sidebar'
+
+    Returns:
+        Callable(at, rng) -> bool (False si el widget no se muestra)
+    """
+    def interact(at: AppTest, rng: random.Random) -> bool:
+        widget = _find(getattr(at, where), kind, label)
+        if widget is None:
+            return False
+        widget.set_value(rng.choice(options if options is not None else widget.options))
+        return True
+    return interact
+
+
+# Nombre -> (peso, interacción)
+INTERACTIONS: Dict[str, Any] = {
+    'filtros': (6, change_filters),
+    'tsunami': (2, _choose('radio', "Estado de Tsunami", where='sidebar')),
+    'región': (2, _choose('radio', "Región", where='sidebar')),
+    'avanzados': (1, _choose('checkbox', "Mostrar análisis avanzados", [True, False], 'sidebar')),
+    'tema': (1, _choose('selectbox', "Tema de Gráficos", where='sidebar')),
+    'mapa': (5, _choose('radio', MAP_RADIO)),
+    'pestaña EDA: variable': (2, _choose('selectbox', "Selecciona Variable", DISTRIBUTION_VARIABLES)),
+    'pestaña EDA: serie': (1, _choose('radio', "Serie", ['events', 'tsunami_rate'])),
+    'pestaña EDA: ventana': (1, _choose('radio', "Ventana", ROLLING_WINDOWS)),
+    'pestaña ML: magnitud': (2, _choose('slider', "Magnitud", [6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0])),
+    'pestaña ML: profundidad': (1, _choose('slider', "Profundidad (km)", [10, 30, 50, 100, 300, 700])),
+    'pestaña conclusiones: intervalo': (2, _choose('radio', "Método del intervalo", INTERVAL_METHODS)),
+    'pestaña conclusiones: regla': (1, _choose('selectbox', "Regla a calibrar", list(range(len(ALERT_RULES))))),
+}
+
+# ============================================================================
+# MEMORIA
+# ============================================================================
+
+def current_rss() -> Optional[int]:
+    """Memoria residente actual del proceso (bytes), o None si no se puede leer."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def memory_slope(samples: List[Dict[str, Any]], field: str) -> Optional[float]:
+    """Pendiente (bytes por ejecución) de una serie de memoria por mínimos cuadrados."""
+    points = [(s['runs'], s[field]) for s in samples if s[field] is not None]
+    if len(points) < 3:
+        return None
+    runs, values = zip(*points)
+    return float(np.polyfit(runs, values, 1)[0])
+
+# ============================================================================
+# SIMULACIÓN
+# ============================================================================
+
+def run_simulation(sessions: int, interactions: int, seed: int, warmup: float,
+                   trace: bool) -> Dict[str, Any]:
+    """
+    Ejecuta las sesiones intercaladas (una interacción de cada sesión por ronda).
+
+    Args:
+        sessions: Sesiones simultáneas
+        interactions: Interacciones por sesión (además de la apertura)
+        seed: Semilla de las interacciones aleatorias
+        warmup: Fracción inicial de rondas excluida del análisis de fugas
+        trace: Si se mide la memoria de Python con tracemalloc
+
+    Returns:
+        Dict con latencias, muestras de memoria, errores y snapshots
+    """
+    names = list(INTERACTIONS)
+    weights = [INTERACTIONS[name][0] for name in names]
+    rngs = [random.Random(seed + i) for i in range(sessions)]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    session_growth = [0] * sessions
+    errors: Dict[str, int] = defaultdict(int)
+    skipped = 0
+    samples: List[Dict[str, Any]] = []
+    warmup_rounds = int(interactions * warmup)
+    baseline_snapshot = None
+    total_runs = 0
+
+    if trace:
+        tracemalloc.start()
+
+    def measure() -> int:
+        return tracemalloc.get_traced_memory()[0] if trace else (current_rss() or 0)
+
+    def timed_run(at: AppTest, name: str, index: int):
+        nonlocal total_runs
+        before = measure()
+        start = time.perf_counter()
+        at.run()
+        latencies[name].append((time.perf_counter() - start) * 1000)
+        session_growth[index] += measure() - before
+        total_runs += 1
+        if at.exception:
+            errors[name] += 1
+
+    start = time.perf_counter()
+    apps = []
+    for i in range(sessions):
+        at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT_S)
+        timed_run(at, 'apertura', i)
+        apps.append(at)
+
+    for round_index in range(interactions):
+        for i, at in enumerate(apps):
+            name = rngs[i].choices(names, weights)[0]
+            if INTERACTIONS[name][1](at, rngs[i]):
+                timed_run(at, name, i)
+            else:
+                skipped += 1
+
+        gc.collect()
+        samples.append({
+            'runs': total_runs,
+            'traced': tracemalloc.get_traced_memory()[0] if trace else None,
+            'rss': current_rss(),
+        })
+        if trace and round_index + 1 == warmup_rounds:
+            baseline_snapshot = tracemalloc.take_snapshot()
+
+    elapsed = time.perf_counter() - start
+    final_snapshot = tracemalloc.take_snapshot() if trace else None
+    if trace:
+        tracemalloc.stop()
+
+    return {
+        'elapsed': elapsed,
+        'latencies': latencies,
+        'session_growth': session_growth,
+        'errors': errors,
+        'skipped': skipped,
+        'samples': samples[warmup_rounds:],
+        'baseline_snapshot': baseline_snapshot,
+        'final_snapshot': final_snapshot,
+    }
+
+# ============================================================================
+# INFORME
+# ============================================================================
+
+def percentiles(values: List[float]) -> str:
+    """p50 / p95 / p99 / máximo de una lista de latencias (ms)."""
+    if not values:
+        return "sin datos"
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return (f"p50 = {statistics.median(ordered):.0f} ms | p95 = {pick(0.95):.0f} ms | "
+            f"p99 = {pick(0.99):.0f} ms | máx = {ordered[-1]:.0f} ms")
+
+
+def _mb(value: float) -> str:
+    return f"{value / 1e6:+.2f} MB" if value else "+0.00 MB"
+
+
+def print_report(result: Dict[str, Any], sessions: int, think_s: float, trace: bool) -> int:
+    """Imprime el informe; devuelve 1 si hubo excepciones o se sospecha una fuga."""
+    latencies = result['latencies']
+    interaction_ms = [ms for name, values in latencies.items() if name != 'apertura' for ms in values]
+    total = sum(len(values) for values in latencies.values())
+
+    print(f"Ejecuciones: {total} en {result['elapsed']:.1f} s "
+          f"({total / result['elapsed']:.2f} ejecuciones/s, {sessions} sesiones intercaladas)")
+    print(f"Apertura de sesión: {percentiles(latencies['apertura'])}")
+    print(f"Interacciones:      {percentiles(interaction_ms)}")
+    for name in sorted(latencies, key=lambda n: -statistics.mean(latencies[n])):
+        if name != 'apertura':
+            print(f"  {name:<34} n = {len(latencies[name]):>4} | {percentiles(latencies[name])}")
+    if result['skipped']:
+        print(f"  ({result['skipped']} interacciones omitidas: el widget no estaba visible)")
+
+    # Capacidad: analistas por instancia con un tiempo de reflexión entre interacciones
+    if interaction_ms:
+        service_s = statistics.mean(interaction_ms) / 1000
+        analysts = TARGET_UTILIZATION * (think_s + service_s) / service_s
+        print(f"Capacidad estimada: ~{analysts:.0f} analistas por instancia "
+              f"({think_s:.0f} s de reflexión, {TARGET_UTILIZATION:.0%} de ocupación)")
+
+    source = 'tracemalloc' if trace else 'RSS'
+    growth = result['session_growth']
+    print(f"Memoria por sesión ({source}): media {_mb(statistics.mean(growth))} | "
+          f"máx {_mb(max(growth))}")
+
+    status = 0
+    samples = result['samples']
+    slope = memory_slope(samples, 'traced' if trace else 'rss')
+    rss_slope = memory_slope(samples, 'rss') if trace else None
+    if slope is None:
+        print("Pendiente de memoria: muy pocas rondas tras el calentamiento")
+    else:
+        per_thousand_kb = slope * 1000 / 1024
+        line = f"Pendiente de memoria ({source}): {per_thousand_kb:+.0f} KB por 1000 ejecuciones"
+        if rss_slope is not None:
+            line += f" (RSS {rss_slope * 1000 / 1024:+.0f} KB)"
+        print(line)
+        if per_thousand_kb > LEAK_THRESHOLD_KB:
+            status = 1
+            print(f"⚠️ Posible fuga: más de {LEAK_THRESHOLD_KB} KB por 1000 ejecuciones. "
+                  "Las cachés acotadas (LRU) crecen hasta llenarse: confírmalo con más interacciones.")
+            if result['baseline_snapshot'] is not None:
+                stats = result['final_snapshot'].compare_to(result['baseline_snapshot'], 'lineno')
+                for stat in stats[:TOP_GROWTH_LINES]:
+                    print(f"  {stat}")
+            else:
+                print("  Repite con --tracemalloc para ver qué líneas crecen.")
+
+    for name, count in result['errors'].items():
+        status = 1
+        print(f"❌ {count} ejecuciones con excepción tras '{name}'")
+    return status
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulador de sesiones de analistas del panel")
+    parser.add_argument('--sessions', type=int, default=8, help="Sesiones intercaladas")
+    parser.add_argument('--interactions', type=int, default=25, help="Interacciones por sesión")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warmup', type=float, default=0.2,
+                        help="Fracción de rondas excluida del análisis de fugas")
+    parser.add_argument('--think', type=float, default=DEFAULT_THINK_S,
+                        help="Segundos de reflexión entre interacciones (estimación de capacidad)")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Mide la memoria de Python con tracemalloc y muestra las líneas que "
+                             "más crecen (unas 4 veces más lento)")
+    args = parser.parse_args(argv)
+
+    trace = args.tracemalloc
+    result = run_simulation(args.sessions, args.interactions, args.seed, args.warmup, trace)
+    return print_report(result, args.sessions, args.think, trace)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark de Arranque del Panel
+================================
+Mide el coste de arranque en frío, cada repetición en un proceso nuevo:
+
+1. `python -X importtime -c "import app"`: tiempo total de imports y los
+   módulos más costosos.
+2. Tiempo hasta el primer pintado: desde que empieza la ejecución del script
+   (incluidos sus imports) hasta que se emite la cabecera del panel, más el
+   tiempo de la ejecución completa. También indica qué librerías pesadas ya
+   estaban cargadas al pintar la cabecera.
+
+Uso:
+    python bench_startup.py                 # 5 repeticiones
+    python bench_startup.py --runs 10 --top 15
+
+Autor: Sistema de Análisis Sísmico
+Fecha: 2025
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+APP_DIR = Path(__file__).parent
+HEAVY_MODULES = ['scipy.stats', 'plotly.express', 'plotly.graph_objects', 'plotly.subplots']
+
+# Se ejecuta en un proceso nuevo: cronometra la ejecución del script con
+# AppTest y marca el momento en que se emite la cabecera
+FIRST_PAINT_PROBE = """
+import json, sys, time
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+HEAVY = {heavy!r}
+marks = {{}}
+_markdown = st.markdown
+
+def markdown(body, *args, **kwargs):
+    if 'first_paint' not in marks and 'main-header' in str(body):
+        marks['first_paint'] = time.perf_counter()
+        marks['loaded'] = [name for name in HEAVY if name in sys.modules]
+    return _markdown(body, *args, **kwargs)
+
+st.markdown = markdown
+at = AppTest.from_file('app.py', default_timeout=300)
+start = time.perf_counter()
+at.run()
+end = time.perf_counter()
+print(json.dumps({{
+    'first_paint_ms': (marks['first_paint'] - start) * 1000,
+    'full_run_ms': (end - start) * 1000,
+    'loaded': marks['loaded'],
+    'exceptions': len(at.exception)
+}}))
+"""
+
+# ============================================================================
+# MEDICIONES
+# ============================================================================
+
+def measure_importtime(top: int) -> dict:
+    """
+    Ejecuta `python -X importtime -c "import app"` y resume la salida.
+
+    Returns:
+        Dict con el total (ms) y los `top` módulos de mayor tiempo acumulado
+        entre los de primer nivel
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # Sangría = profundidad
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    total_us = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+    top_level = sorted((row for row in rows if row[3] <= 1), key=lambda row: -row[2])[:top]
+    return {'total_ms': total_us / 1000,
+            'top': [(name, cumulative / 1000) for name, _, cumulative, _ in top_level]}
+
+
+def measure_first_paint() -> dict:
+    """Mide el primer pintado y la ejecución completa en un proceso nuevo."""
+    result = subprocess.run([sys.executable, '-c', FIRST_PAINT_PROBE.format(heavy=HEAVY_MODULES)],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    raise RuntimeError(f"La sonda de primer pintado falló:\n{result.stderr[-2000:]}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque del panel")
+    parser.add_argument('--runs', type=int, default=5, help="Repeticiones (procesos en frío)")
+    parser.add_argument('--top', type=int, default=10, help="Módulos a listar en importtime")
+    args = parser.parse_args(argv)
+
+    imports = [measure_importtime(args.top) for _ in range(args.runs)]
+    print(f"import app: mediana {statistics.median(r['total_ms'] for r in imports):.0f} ms "
+          f"({args.runs} procesos)")
+    for name, cumulative_ms in imports[-1]['top']:
+        print(f"    {cumulative_ms:8.1f} ms  {name}")
+
+    paints = [measure_first_paint() for _ in range(args.runs)]
+    first_paint = statistics.median(p['first_paint_ms'] for p in paints)
+    full_run = statistics.median(p['full_run_ms'] for p in paints)
+    print(f"Primer pintado (cabecera): mediana {first_paint:.0f} ms")
+    print(f"Ejecución completa:        mediana {full_run:.0f} ms")
+    loaded = paints[-1]['loaded']
+    print(f"Librerías pesadas cargadas al pintar: {', '.join(loaded) if loaded else 'ninguna'}")
+    if any(p['exceptions'] for p in paints):
+        print("⚠️ La ejecución del panel produjo excepciones")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
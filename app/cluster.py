@@ -0,0 +1,135 @@
+"""
+Modo Multiproceso del Panel
+============================
+Lanza N procesos de Streamlit detrás de un proxy local con sesiones
+persistentes. Cada worker tiene su propio intérprete (y su propio GIL);
+todos comparten el almacén columnar del dataset (`utils/store.py`) y la
+caché de resultados en disco (`utils/cache.py`), así que ningún worker lee
+el CSV ni recalcula lo que otro ya calculó.
+
+Uso:
+    python cluster.py                          # un worker por CPU, http://localhost:8501
+    python cluster.py --workers 4 --port 8501
+    python bench_cluster.py --sessions 50      # Prueba de carga contra el proxy
+
+Los workers caídos se relanzan automáticamente; el proxy deja de enviarles
+tráfico mientras no respondan al endpoint de salud.
+
+Autor: Sistema de Análisis Sísmico
+Fecha: 2025
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+from utils.balancer import StickyBalancer, Worker
+from utils.dataset import get_dataset_version, read_events
+from utils.store import build_store
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+APP_DIR = Path(__file__).parent
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8501
+DEFAULT_BASE_PORT = 8510
+SUPERVISE_INTERVAL_S = 1.0
+
+logger = logging.getLogger("cluster")
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def start_worker(port: int, public_port: int) -> subprocess.Popen:
+    """
+    Lanza un proceso de Streamlit en `port` (solo escucha en localhost).
+
+    Args:
+        port: Puerto interno del worker
+        public_port: Puerto del proxy (el que ve el navegador)
+
+    Returns:
+        subprocess.Popen del worker
+    """
+    env = dict(os.environ, TSUNAMI_SHARED_STORE='1')
+    return subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'app.py',
+         '--server.address', DEFAULT_HOST,
+         '--server.port', str(port),
+         '--server.headless', 'true',
+         '--browser.serverPort', str(public_port)],
+        cwd=APP_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+    )
+
+
+async def supervise(processes: List[subprocess.Popen], workers: List[Worker], public_port: int):
+    """Relanza los workers cuyo proceso haya terminado."""
+    while True:
+        for i, process in enumerate(processes):
+            if process.poll() is not None:
+                logger.warning("Worker %d terminó (código %s); relanzando", i, process.returncode)
+                workers[i].healthy = False
+                processes[i] = start_worker(workers[i].port, public_port)
+        await asyncio.sleep(SUPERVISE_INTERVAL_S)
+
+
+async def run_cluster(n_workers: int, host: str, port: int, base_port: int):
+    """Lanza los workers y el proxy; no retorna hasta que se interrumpe."""
+    workers = [Worker(i, DEFAULT_HOST, base_port + i) for i in range(n_workers)]
+    processes = [start_worker(worker.port, port) for worker in workers]
+    balancer = StickyBalancer(workers)
+    print(f"🌊 {n_workers} workers (puertos {base_port}-{base_port + n_workers - 1}) "
+          f"detrás de http://{host}:{port}")
+
+    # SIGTERM/SIGINT cancelan el clúster y se detienen todos los workers
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, main_task.cancel)
+
+    try:
+        await asyncio.gather(balancer.serve(host, port),
+                             supervise(processes, workers, port))
+    except asyncio.CancelledError:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Panel sísmico en modo multiproceso")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--base-port', type=int, default=DEFAULT_BASE_PORT,
+                        help="Puerto interno del primer worker")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+
+    # El almacén se publica una vez antes de arrancar los workers
+    version = get_dataset_version()
+    build_store(read_events(), version)
+    print(f"📦 Almacén compartido del dataset: versión {version}")
+
+    asyncio.run(run_cluster(args.workers, args.host, args.port, args.base_port))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
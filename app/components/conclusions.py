@@ -6,6 +6,28 @@ Renderiza la sección de conclusiones y recomendaciones del análisis.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+from typing import Dict, Any
+
+from utils.alerts import (
+    ALERT_RULES, DEFAULT_ALERT, COMPILED_RULES, describe_rule,
+    evaluate_alerts, alert_confusion, rule_sweep
+)
+from utils.assets import render_static
+from utils.cache import shared_cache
+from utils.cancellation import rerun_checkpoint
+from utils.data_loader import get_data_fingerprint, HIGH_MAGNITUDE_THRESHOLD, SHALLOW_DEPTH_KM
+from utils.fragments import timed_fragment
+from utils.lazy import lazy_module
+from utils.rates import get_segment_rates, SEGMENT_COLUMNS, INTERVAL_METHODS
+from utils.stat_tests import run_group_comparison
+from utils.thresholds import (
+    build_threshold_table, curves_at_depth, lookup_threshold, DEPTH_STEP_KM
+)
+
+# Librerías pesadas: se importan al renderizar la primera gráfica
+px = lazy_module('plotly.express')
+
 
 def render_conclusions(df: pd.DataFrame):
     """
@@ -17,14 +39,14 @@ def render_conclusions(df: pd.DataFrame):
     
     st.markdown("## 📌 Conclusiones y Recomendaciones")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p style="font-size: 1.1rem;">
             Síntesis de hallazgos clave y recomendaciones estratégicas para 
             sistemas de alerta, modelado predictivo y gestión de riesgos.
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # ========================================================================
     # HALLAZGOS PRINCIPALES
@@ -107,6 +129,20 @@ def render_conclusions(df: pd.DataFrame):
     
     st.markdown("---")
     
+    # ========================================================================
+    # EVIDENCIA ESTADÍSTICA
+    # ========================================================================
+    
+    rerun_checkpoint()
+    render_statistical_evidence(df)
+    
+    st.markdown("---")
+    
+    rerun_checkpoint()
+    render_segment_rates(df)
+    
+    st.markdown("---")
+    
     # ========================================================================
     # RECOMENDACIONES ESTRATÉGICAS
     # ========================================================================
@@ -206,10 +242,224 @@ def render_conclusions(df: pd.DataFrame):
                     st.markdown("🟢 **BAJA**")
 
 
+def render_statistical_evidence(df: pd.DataFrame):
+    """Pruebas inferenciales que respaldan los hallazgos (tsunami vs no tsunami)."""
+    
+    st.markdown("## 🔬 Evidencia Estadística")
+    
+    render_static("""
+    <div class="info-card">
+        <p>Comparación de eventos con y sin tsunami en la vista filtrada: 
+        U de Mann-Whitney y delta de Cliff para variables numéricas, 
+        intervalos bootstrap (95%) de la diferencia de medias y chi-cuadrado 
+        para las categorías de profundidad y magnitud.</p>
+    </div>
+    """)
+    
+    results = run_group_comparison(df, get_data_fingerprint(df))
+    
+    if not results:
+        st.info("ℹ️ Se necesitan eventos con y sin tsunami en la vista filtrada para comparar grupos")
+        return
+    
+    numeric = results['numeric']
+    
+    st.markdown("#### 📊 Variables Numéricas")
+    st.dataframe(
+        numeric.style.format({
+            'Media (tsunami)': '{:.2f}',
+            'Media (sin tsunami)': '{:.2f}',
+            'Diferencia': '{:.2f}',
+            'IC 95% inf.': '{:.2f}',
+            'IC 95% sup.': '{:.2f}',
+            'U de Mann-Whitney': '{:,.0f}',
+            'P-valor': '{:.2e}',
+            'Delta de Cliff': '{:.3f}'
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    if not results['categorical'].empty:
+        st.markdown("#### 🧮 Variables Categóricas (Chi-cuadrado)")
+        st.dataframe(
+            results['categorical'].style.format({
+                'Chi²': '{:.2f}',
+                'P-valor': '{:.2e}',
+                'V de Cramér': '{:.3f}'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    significant = numeric[(numeric['P-valor'] < 0.05) & (numeric['Efecto'] != 'Despreciable')]
+    
+    if significant.empty:
+        render_static("""
+        <div class="warning-card">
+            <p>⚠️ Ninguna variable numérica muestra una diferencia significativa con 
+            tamaño de efecto relevante entre eventos con y sin tsunami en esta vista.</p>
+        </div>
+        """)
+    else:
+        summary = ', '.join(
+            f"<code>{row['Variable']}</code> (δ = {row['Delta de Cliff']:.2f}, {row['Efecto'].lower()})"
+            for _, row in significant.iterrows()
+        )
+        st.markdown(f"""
+        <div class="success-card">
+            <p>✅ Diferencias significativas (p < 0.05) con efecto relevante: {summary}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+@shared_cache(max_entries=64)
+def get_alert_evaluation(_df: pd.DataFrame, fingerprint: str) -> Dict[str, Any]:
+    """
+    Aplica los niveles de alerta a la vista filtrada y los compara con la
+    etiqueta de tsunami.
+    
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        
+    Returns:
+        Dict con las tablas por nivel y de confusión acumulada
+    """
+    codes = evaluate_alerts(_df['magnitude'], _df['depth'], _df['ring_of_fire'])
+    levels = COMPILED_RULES['levels']
+    confusion = alert_confusion(codes, _df['tsunami'], len(levels))
+    
+    by_level = pd.DataFrame({
+        'Nivel': levels,
+        'Eventos': confusion['by_level'].sum(axis=1),
+        'Con Tsunami': confusion['by_level'][:, 1],
+        'Sin Tsunami': confusion['by_level'][:, 0]
+    })
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        by_level['Tasa de Tsunami'] = by_level['Con Tsunami'] / by_level['Eventos']
+        cumulative = pd.DataFrame({
+            'Alerta desde': levels[:-1],
+            'VP': confusion['tp'],
+            'FP': confusion['fp'],
+            'FN': confusion['fn'],
+            'VN': confusion['tn'],
+            'Precisión': confusion['tp'] / (confusion['tp'] + confusion['fp']),
+            'Recall': confusion['tp'] / (confusion['tp'] + confusion['fn'])
+        })
+    
+    return {'by_level': by_level, 'cumulative': cumulative}
+
+
+@shared_cache(max_entries=128)
+def get_rule_sweep(_df: pd.DataFrame, fingerprint: str, rule_index: int,
+                   field: str) -> pd.DataFrame:
+    """
+    Barrido del umbral de una regla sobre una rejilla fija.
+    
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        rule_index: Índice de la regla en `ALERT_RULES`
+        field: 'min_magnitude' o 'max_depth'
+        
+    Returns:
+        pd.DataFrame con umbral, eventos disparados, precisión y recall
+    """
+    if field == 'min_magnitude':
+        grid = np.round(np.arange(6.0, 9.05, 0.1), 1)
+    else:
+        grid = np.arange(10.0, 710.0, 10.0)
+    
+    sweep = rule_sweep(_df['magnitude'], _df['depth'], _df['ring_of_fire'],
+                       _df['tsunami'], rule_index, field, grid)
+    
+    return pd.DataFrame({
+        'Umbral': grid,
+        'Eventos Disparados': sweep['triggered'],
+        'Tsunamis Capturados': sweep['tp'],
+        'Precisión': sweep['precision'],
+        'Recall': sweep['recall']
+    })
+
+
+@shared_cache(max_entries=64)
+def get_threshold_table(_df: pd.DataFrame, fingerprint: str) -> Dict[str, Any]:
+    """
+    Tabla magnitud × profundidad de conteos acumulados de la vista filtrada.
+    
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        
+    Returns:
+        Dict de `build_threshold_table`
+    """
+    return build_threshold_table(_df['magnitude'].to_numpy(), _df['depth'].to_numpy(),
+                                 _df['tsunami'].to_numpy())
+
+
+@timed_fragment("Tasas por segmento")
+def render_segment_rates(df: pd.DataFrame):
+    """Tasas de tsunami por segmento con intervalos de confianza."""
+    
+    st.markdown("## 📈 Tasas de Tsunami por Segmento")
+    
+    render_static("""
+    <div class="info-card">
+        <p>Tasa de tsunami con intervalo de confianza del 95% por año, categoría de 
+        magnitud, categoría de profundidad y pertenencia al Ring of Fire. Los segmentos 
+        con pocos eventos muestran intervalos amplios: sus tasas deben leerse con cautela.</p>
+    </div>
+    """)
+    
+    method = st.radio(
+        "Método del intervalo",
+        options=INTERVAL_METHODS,
+        horizontal=True,
+        help="Wilson y Clopper-Pearson son analíticos; Bootstrap usa 10.000 remuestras"
+    )
+    
+    fingerprint = get_data_fingerprint(df)
+    segment_tabs = st.tabs(list(SEGMENT_COLUMNS.values()))
+    
+    for segment_tab, (segment, label) in zip(segment_tabs, SEGMENT_COLUMNS.items()):
+        with segment_tab:
+            rates = get_segment_rates(df, fingerprint, segment, method)
+            
+            if rates.empty:
+                st.info("ℹ️ No hay eventos en la vista filtrada")
+                continue
+            
+            plot_df = rates.assign(**{segment: rates[segment].astype(str)})
+            
+            fig = px.scatter(
+                plot_df,
+                x=segment,
+                y='rate',
+                error_y=plot_df['ci_high'] - plot_df['rate'],
+                error_y_minus=plot_df['rate'] - plot_df['ci_low'],
+                size='events',
+                hover_data=['events', 'tsunamis'],
+                title=f'Tasa de Tsunami por {label} (IC 95%, {method})',
+                labels={segment: label, 'rate': 'Tasa de Tsunami (%)',
+                        'events': 'Eventos', 'tsunamis': 'Tsunamis'},
+                color_discrete_sequence=['#667eea']
+            )
+            
+            fig.update_layout(
+                template='plotly_dark',
+                height=400
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+
+
 def render_alert_recommendations(df: pd.DataFrame):
     """Recomendaciones para sistemas de alerta."""
     
-    st.markdown("""
+    render_static("""
     ### 🚨 Diseño de Sistema de Alerta Temprana
     
     #### Umbrales Recomendados (Alerta Alta de Tsunami):
@@ -218,24 +468,37 @@ def render_alert_recommendations(df: pd.DataFrame):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Magnitud", "≥ 7.0", "Crítico")
+        st.metric("Magnitud", f"≥ {HIGH_MAGNITUDE_THRESHOLD:.1f}", "Crítico")
     
     with col2:
-        st.metric("Profundidad", "< 70 km", "Superficial")
+        st.metric("Profundidad", f"< {SHALLOW_DEPTH_KM:.0f} km", "Superficial")
     
     with col3:
         st.metric("Zona", "Ring of Fire", "Alto Riesgo")
     
-    st.markdown("""
+    # La tabla se genera a partir de las reglas que usa la API de puntuación
+    alert_rows = '\n'.join(
+        f"    | {rule['icon']} **{rule['level']}** | {describe_rule(rule)} | {rule['action']} |"
+        for rule in ALERT_RULES
+    )
+    
+    st.markdown(f"""
     #### Niveles de Alerta Propuestos:
     
     | Nivel | Condiciones | Acciones |
     |-------|------------|----------|
-    | 🔴 **ROJA** | Mag ≥ 7.5, Depth < 50 km, Ring of Fire | Evacuación inmediata de zonas costeras |
-    | 🟠 **NARANJA** | Mag 7.0-7.5, Depth < 70 km, Ring of Fire | Alerta y preparación para evacuación |
-    | 🟡 **AMARILLA** | Mag 6.5-7.0, Depth < 70 km | Monitoreo intensificado |
-    | 🟢 **VERDE** | Otras condiciones | Monitoreo estándar |
+{alert_rows}
+    | {DEFAULT_ALERT['icon']} **{DEFAULT_ALERT['level']}** | Otras condiciones | {DEFAULT_ALERT['action']} |
     
+    *Los niveles se evalúan en orden: cada evento recibe el primero cuyas condiciones cumple.*
+    """)
+    
+    rerun_checkpoint()
+    render_alert_impact(df)
+    rerun_checkpoint()
+    render_threshold_explorer(df)
+    
+    render_static("""
     #### Consideraciones Adicionales:
     
     - ✅ **Monitoreo en tiempo real** de estaciones cercanas (alta `nst`, baja `dmin`)
@@ -245,10 +508,183 @@ def render_alert_recommendations(df: pd.DataFrame):
     """)
 
 
+@timed_fragment("Impacto de alertas")
+def render_alert_impact(df: pd.DataFrame):
+    """Impacto histórico de los niveles de alerta sobre la vista filtrada."""
+    
+    st.markdown("#### 📊 Impacto Histórico de los Niveles de Alerta")
+    
+    if len(df) == 0:
+        st.info("ℹ️ No hay eventos en la vista filtrada")
+        return
+    
+    fingerprint = get_data_fingerprint(df)
+    evaluation = get_alert_evaluation(df, fingerprint)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Eventos por nivel**")
+        st.dataframe(
+            evaluation['by_level'].style.format({'Tasa de Tsunami': '{:.1%}'}),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    with col2:
+        st.markdown("**Confusión acumulada (alerta de ese nivel o superior)**")
+        st.dataframe(
+            evaluation['cumulative'].style.format({'Precisión': '{:.1%}', 'Recall': '{:.1%}'}),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    # Barrido de umbrales de una regla
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        rule_index = st.selectbox(
+            "Regla a calibrar",
+            options=list(range(len(ALERT_RULES))),
+            format_func=lambda i: f"{ALERT_RULES[i]['icon']} {ALERT_RULES[i]['level']}"
+        )
+    
+    with col2:
+        field = st.radio(
+            "Umbral a barrer",
+            options=['min_magnitude', 'max_depth'],
+            format_func=lambda f: 'Magnitud mínima' if f == 'min_magnitude' else 'Profundidad máxima',
+            horizontal=True
+        )
+    
+    sweep = get_rule_sweep(df, fingerprint, rule_index, field)
+    current = ALERT_RULES[rule_index][field]
+    
+    fig = px.line(
+        sweep,
+        x='Umbral',
+        y=['Precisión', 'Recall'],
+        hover_data=['Eventos Disparados', 'Tsunamis Capturados'],
+        title=f"Barrido de {'magnitud mínima' if field == 'min_magnitude' else 'profundidad máxima (km)'} "
+              f"— nivel {ALERT_RULES[rule_index]['level']}",
+        labels={'value': 'Métrica', 'variable': 'Métrica'}
+    )
+    fig.add_vline(x=current, line_dash='dash', line_color='orange',
+                  annotation_text=f"Actual: {current:g}")
+    fig.update_layout(template='plotly_dark', height=400)
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.caption("El recall se mide sobre todos los tsunamis de la vista; el resto de "
+               "condiciones de la regla se mantienen fijas durante el barrido.")
+
+
+@timed_fragment("Explorador de umbrales")
+def render_threshold_explorer(df: pd.DataFrame):
+    """Explorador interactivo de los umbrales de magnitud y profundidad."""
+    
+    st.markdown("#### 🎚️ Explorador de Umbrales")
+    
+    if len(df) == 0 or df['tsunami'].nunique() < 2:
+        st.info("ℹ️ Se necesitan eventos con y sin tsunami en la vista filtrada")
+        return
+    
+    # La tabla se construye una vez por filtro; mover los deslizadores solo
+    # consulta celdas ya calculadas
+    table = get_threshold_table(df, get_data_fingerprint(df))
+    mag_grid, depth_grid = table['mag_grid'], table['depth_grid']
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        min_magnitude = st.slider(
+            "Magnitud mínima (≥)",
+            min_value=float(np.floor(mag_grid[0] * 10) / 10),
+            max_value=float(np.ceil(mag_grid[-1] * 10) / 10),
+            value=float(np.clip(HIGH_MAGNITUDE_THRESHOLD, mag_grid[0], mag_grid[-1])),
+            step=0.1,
+            key="threshold_magnitude"
+        )
+    
+    with col2:
+        max_depth = st.slider(
+            "Profundidad máxima (< km)",
+            min_value=float(depth_grid[0]),
+            max_value=float(depth_grid[-1]),
+            value=float(np.clip(SHALLOW_DEPTH_KM, depth_grid[0], depth_grid[-1])),
+            step=DEPTH_STEP_KM,
+            key="threshold_depth"
+        )
+    
+    point = lookup_threshold(table, min_magnitude, max_depth)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Eventos Disparados", f"{point['triggered']:,}")
+    with col2:
+        st.metric("Recall (TPR)", f"{point['tpr']:.1%}")
+    with col3:
+        st.metric("Tasa de Falsos Positivos", f"{point['fpr']:.1%}")
+    with col4:
+        precision = point['precision']
+        st.metric("Precisión", "—" if np.isnan(precision) else f"{precision:.1%}")
+    
+    # Curvas al variar la magnitud con la profundidad elegida
+    curves = curves_at_depth(table, max_depth)
+    curve_df = pd.DataFrame({
+        'Magnitud ≥': curves['mag_grid'],
+        'TPR': curves['tpr'],
+        'FPR': curves['fpr'],
+        'Precisión': curves['precision']
+    })
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = px.line(
+            curve_df,
+            x='FPR',
+            y='TPR',
+            markers=True,
+            hover_data=['Magnitud ≥'],
+            title=f"Curva ROC (profundidad < {max_depth:.0f} km)"
+        )
+        fig.add_shape(type='line', x0=0, y0=0, x1=1, y1=1,
+                      line=dict(color='gray', dash='dot'))
+        fig.add_scatter(x=[point['fpr']], y=[point['tpr']], mode='markers',
+                        marker=dict(color='orange', size=14, symbol='star'),
+                        name='Umbral actual')
+        fig.update_layout(template='plotly_dark', height=400, showlegend=False,
+                          xaxis_range=[0, 1], yaxis_range=[0, 1.02])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.line(
+            curve_df.dropna(subset=['Precisión']),
+            x='TPR',
+            y='Precisión',
+            markers=True,
+            hover_data=['Magnitud ≥'],
+            title=f"Curva Precisión-Recall (profundidad < {max_depth:.0f} km)",
+            labels={'TPR': 'Recall'}
+        )
+        if not np.isnan(precision):
+            fig.add_scatter(x=[point['tpr']], y=[precision], mode='markers',
+                            marker=dict(color='orange', size=14, symbol='star'),
+                            name='Umbral actual')
+        fig.update_layout(template='plotly_dark', height=400, showlegend=False,
+                          xaxis_range=[0, 1], yaxis_range=[0, 1.02])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.caption(f"Regla evaluada: magnitud ≥ {min_magnitude:.1f} y profundidad < {max_depth:.0f} km, "
+               f"sin condición regional. Las curvas recorren todos los cortes de magnitud "
+               f"observados en la vista.")
+
+
 def render_modeling_recommendations(df: pd.DataFrame):
     """Recomendaciones para modelado predictivo."""
     
-    st.markdown("""
+    render_static("""
     ### 🤖 Ingeniería de Características para Modelos ML
     
     #### Features Recomendadas:
@@ -287,7 +723,7 @@ def render_modeling_recommendations(df: pd.DataFrame):
             for feature in feature_list:
                 st.markdown(f"- {feature}")
     
-    st.markdown("""
+    render_static("""
     #### Modelos Recomendados (orden de complejidad):
     
     1. **Logistic Regression** - Baseline interpretable
@@ -307,7 +743,7 @@ def render_modeling_recommendations(df: pd.DataFrame):
 def render_dashboard_recommendations(df: pd.DataFrame):
     """Recomendaciones para panel operativo."""
     
-    st.markdown("""
+    render_static("""
     ### 📊 Diseño de Panel Operativo
     
     #### Componentes Esenciales:
@@ -346,7 +782,7 @@ def render_dashboard_recommendations(df: pd.DataFrame):
         """)
         st.markdown("---")
     
-    st.markdown("""
+    render_static("""
     #### Filtros Interactivos Recomendados:
     
     - 📅 **Temporal**: Últimas 24h, 7 días, 30 días, Año actual, Rango personalizado
@@ -359,7 +795,7 @@ def render_dashboard_recommendations(df: pd.DataFrame):
 def render_monitoring_recommendations(df: pd.DataFrame):
     """Recomendaciones para mejoras en monitoreo."""
     
-    st.markdown("""
+    render_static("""
     ### 📈 Mejoras en Infraestructura de Monitoreo
     
     #### Zonas Prioritarias para Expansión:
@@ -386,7 +822,7 @@ def render_monitoring_recommendations(df: pd.DataFrame):
             f"⚠️ Alto Riesgo"
         )
     
-    st.markdown("""
+    render_static("""
     #### Recomendaciones de Inversión:
     
     1. **🌊 Zonas Costeras Remotas**
@@ -7,11 +7,33 @@ Renderiza la sección completa de análisis exploratorio con visualizaciones int
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy import stats
 from typing import Dict, Any
 
+from utils.aggregations import (
+    get_box_summary, get_correlation_matrix, get_histogram,
+    CORRELATION_COLUMNS, DISTRIBUTION_VARIABLES
+)
+from utils.assets import render_static
+from utils.cancellation import rerun_checkpoint
+from utils.data_loader import get_data_fingerprint
+from utils.decomposition import decompose_monthly, monthly_series
+from utils.fragments import timed_fragment
+from utils.lazy import lazy_module
+from utils.parallel import get_thread_pool
+from utils.query import sample_rows
+from utils.rolling import get_rolling_stats, ROLLING_WINDOWS
+from utils.seismicity import (
+    get_gr_grid, DEFAULT_CELL_DEG, GLOBAL_CELL_DEG, GR_CELL_SIZES, GR_YEAR_WINDOWS, MIN_EVENTS
+)
+from utils.stat_tests import run_normality_tests
+
+# Librerías pesadas: se importan al renderizar la primera gráfica
+px = lazy_module('plotly.express')
+go = lazy_module('plotly.graph_objects')
+subplots = lazy_module('plotly.subplots')
+stats = lazy_module('scipy.stats')
+
+
 def render_eda_section(df: pd.DataFrame):
     """
     Renderiza la sección completa de EDA con múltiples subsecciones.
@@ -22,7 +44,7 @@ def render_eda_section(df: pd.DataFrame):
     
     st.markdown("## 📊 Análisis Exploratorio de Datos (EDA)")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p style="font-size: 1.1rem;">
             Exploración profunda de patrones sísmicos, distribuciones estadísticas 
@@ -30,7 +52,7 @@ def render_eda_section(df: pd.DataFrame):
             pruebas estadísticas y mapas geoespaciales.
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # ========================================================================
     # SUBTABS PARA ORGANIZAR EL EDA
@@ -56,6 +78,7 @@ def render_eda_section(df: pd.DataFrame):
     # ========================================================================
     
     with eda_tab2:
+        rerun_checkpoint()
         render_correlations(df)
     
     # ========================================================================
@@ -63,6 +86,7 @@ def render_eda_section(df: pd.DataFrame):
     # ========================================================================
     
     with eda_tab3:
+        rerun_checkpoint()
         render_geospatial(df)
     
     # ========================================================================
@@ -70,6 +94,7 @@ def render_eda_section(df: pd.DataFrame):
     # ========================================================================
     
     with eda_tab4:
+        rerun_checkpoint()
         render_temporal(df)
     
     # ========================================================================
@@ -77,26 +102,28 @@ def render_eda_section(df: pd.DataFrame):
     # ========================================================================
     
     with eda_tab5:
+        rerun_checkpoint()
         render_multivariate(df)
 
 # ============================================================================
 # FUNCIONES DE RENDERIZADO POR SUBSECCIÓN
 # ============================================================================
 
+@timed_fragment("Distribuciones")
 def render_distributions(df: pd.DataFrame):
     """Renderiza análisis de distribuciones."""
     
     st.markdown("### 📊 Distribuciones de Variables")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p>Análisis de las distribuciones de las principales variables sísmicas, 
         incluyendo pruebas de normalidad y estadísticas descriptivas.</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # Variable selector
-    variables = ['magnitude', 'depth', 'sig', 'nst', 'dmin', 'gap', 'cdi', 'mmi']
+    variables = DISTRIBUTION_VARIABLES
     
     col1, col2 = st.columns([1, 3])
     
@@ -114,17 +141,19 @@ def render_distributions(df: pd.DataFrame):
     col1, col2 = st.columns(2)
     
     with col1:
-        # Histograma
-        fig_hist = px.histogram(
-            df,
-            x=selected_var,
-            nbins=50,
-            title=f'Distribución de {selected_var.title()}',
-            labels={selected_var: selected_var.title()},
-            color_discrete_sequence=['#667eea']
-        )
-        
+        # Histograma (conteos calculados en el servidor)
+        histogram = get_histogram(df, get_data_fingerprint(df), selected_var)
+        fig_hist = go.Figure(go.Bar(
+            x=histogram['centers'],
+            y=histogram['counts'],
+            width=np.diff(histogram['edges']),
+            marker_color='#667eea'
+        ))
         fig_hist.update_layout(
+            title=f'Distribución de {selected_var.title()}',
+            xaxis_title=selected_var.title(),
+            yaxis_title='count',
+            bargap=0,
             template='plotly_dark',
             height=400,
             showlegend=False
@@ -133,23 +162,41 @@ def render_distributions(df: pd.DataFrame):
         st.plotly_chart(fig_hist, use_container_width=True)
     
     with col2:
-        # Box plot por tsunami
-        fig_box = px.box(
-            df,
-            x='tsunami',
-            y=selected_var,
-            color='tsunami',
-            title=f'{selected_var.title()} por Estado de Tsunami',
-            labels={
-                selected_var: selected_var.title(),
-                'tsunami': 'Tsunami'
-            },
-            color_discrete_map={0: 'lightblue', 1: 'red'}
-        )
+        # Box plot por tsunami (cuartiles y bigotes calculados en el servidor)
+        box_summary = get_box_summary(df, get_data_fingerprint(df), selected_var)
+        box_colors = {0: 'lightblue', 1: 'red'}
+        
+        fig_box = go.Figure()
+        for group, summary in box_summary.items():
+            color = box_colors.get(group, '#667eea')
+            fig_box.add_trace(go.Box(
+                x=[group],
+                q1=[summary['q1']],
+                median=[summary['median']],
+                q3=[summary['q3']],
+                lowerfence=[summary['lowerfence']],
+                upperfence=[summary['upperfence']],
+                name=str(group),
+                marker_color=color,
+                boxpoints=False
+            ))
+            if len(summary['outliers']) > 0:
+                fig_box.add_trace(go.Scatter(
+                    x=np.full(len(summary['outliers']), group),
+                    y=summary['outliers'],
+                    mode='markers',
+                    marker=dict(color=color, size=4),
+                    name=f"Outliers {group}",
+                    showlegend=False
+                ))
         
         fig_box.update_layout(
             template='plotly_dark',
-            height=400
+            height=400,
+            title=f'{selected_var.title()} por Estado de Tsunami',
+            xaxis_title='Tsunami',
+            yaxis_title=selected_var.title(),
+            legend_title_text='Tsunami'
         )
         
         st.plotly_chart(fig_box, use_container_width=True)
@@ -174,30 +221,61 @@ def render_distributions(df: pd.DataFrame):
         st.metric("Q3 - Q1", f"{stats_data['75%'] - stats_data['25%']:.2f}")
     
     # Test de normalidad
-    with st.expander("🔬 Test de Normalidad (Shapiro-Wilk)"):
-        sample_size = min(5000, len(df))
-        sample_data = df[selected_var].dropna().sample(sample_size)
-        stat, p_value = stats.shapiro(sample_data)
-        
-        is_normal = p_value > 0.05
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.metric("Estadístico", f"{stat:.4f}")
-            st.metric("P-valor", f"{p_value:.4e}")
+    with st.expander("🔬 Tests de Normalidad (Shapiro-Wilk, D'Agostino, Anderson-Darling)"):
+        # El expander ejecuta su contenido aunque esté plegado; las pruebas
+        # solo se calculan cuando el usuario las solicita explícitamente
+        run_tests = st.toggle(
+            "Calcular pruebas de normalidad",
+            value=False,
+            key=f"normality_{selected_var}",
+            help="Los resultados se cachean por variable y filtro"
+        )
         
-        with col2:
-            if is_normal:
-                st.success("✅ La variable parece seguir una distribución normal")
+        if run_tests:
+            results = run_normality_tests(df, get_data_fingerprint(df), selected_var)
+            
+            if not results:
+                st.info("ℹ️ Se necesitan al menos 8 observaciones para las pruebas de normalidad")
             else:
-                st.warning("⚠️ La variable NO sigue una distribución normal")
-        
-        st.markdown(f"""
-        **Interpretación:** {'Con p-valor > 0.05, no rechazamos la hipótesis de normalidad.' 
-        if is_normal else 
-        'Con p-valor < 0.05, rechazamos la hipótesis de normalidad. Se recomienda usar métodos no paramétricos.'}
-        """)
+                shapiro = results['shapiro']
+                is_normal = shapiro['is_normal']
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.metric("Estadístico", f"{shapiro['statistic']:.4f}")
+                    st.metric("P-valor", f"{shapiro['p_value']:.4e}")
+                
+                with col2:
+                    if is_normal:
+                        st.success("✅ La variable parece seguir una distribución normal")
+                    else:
+                        st.warning("⚠️ La variable NO sigue una distribución normal")
+                
+                st.markdown(f"""
+                **Interpretación:** {'Con p-valor > 0.05, no rechazamos la hipótesis de normalidad.' 
+                if is_normal else 
+                'Con p-valor < 0.05, rechazamos la hipótesis de normalidad. Se recomienda usar métodos no paramétricos.'}
+                """)
+                
+                # Batería completa de pruebas
+                tests_df = pd.DataFrame([
+                    {
+                        'Prueba': result['name'],
+                        'Estadístico': round(result['statistic'], 4),
+                        'P-valor': (f"{result['p_value']:.4e}" if 'p_value' in result
+                                    else f"Crítico 5%: {result['critical_value']:.4f}"),
+                        'N': result['n'],
+                        'Normal': '✅' if result['is_normal'] else '❌'
+                    }
+                    for result in results.values()
+                ])
+                st.dataframe(tests_df, hide_index=True, use_container_width=True)
+                
+                st.caption(
+                    f"Shapiro-Wilk usa una muestra reproducible de {shapiro['n']:,} eventos; "
+                    "D'Agostino y Anderson-Darling usan la columna completa."
+                )
 
 
 def render_correlations(df: pd.DataFrame):
@@ -205,21 +283,18 @@ def render_correlations(df: pd.DataFrame):
     
     st.markdown("### 🔗 Análisis de Correlaciones")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p>Matriz de correlación de Spearman (no paramétrica) para identificar 
         relaciones entre variables. Ideal cuando las variables no siguen distribución normal.</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # Selección de variables para correlación
-    numeric_cols = ['magnitude', 'depth', 'sig', 'nst', 'dmin', 'gap', 
-                   'cdi', 'mmi', 'Year', 'Month', 'tsunami']
-    
-    available_cols = [col for col in numeric_cols if col in df.columns]
+    available_cols = [col for col in CORRELATION_COLUMNS if col in df.columns]
     
     # Calcular matriz de correlación
-    corr_matrix = df[available_cols].corr(method='spearman')
+    corr_matrix = get_correlation_matrix(df, get_data_fingerprint(df), tuple(available_cols))
     
     # Heatmap de correlación
     fig_corr = px.imshow(
@@ -271,7 +346,7 @@ def render_correlations(df: pd.DataFrame):
     
     # Interpretación
     with st.expander("📖 Interpretación de Correlaciones"):
-        st.markdown("""
+        render_static("""
         **Guía de interpretación:**
         
         - **|r| > 0.7:** Correlación fuerte
@@ -287,17 +362,18 @@ def render_correlations(df: pd.DataFrame):
         """)
 
 
+@timed_fragment("Mapas geoespaciales")
 def render_geospatial(df: pd.DataFrame):
     """Renderiza análisis geoespacial."""
     
     st.markdown("### 🗺️ Análisis Geoespacial")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p>Mapas interactivos que revelan patrones geográficos de actividad sísmica 
         y eventos tsunamigénicos a nivel global.</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # Selector de tipo de mapa
     map_type = st.radio(
@@ -306,7 +382,8 @@ def render_geospatial(df: pd.DataFrame):
             '🌍 Distribución Global por Magnitud',
             '🌊 Tsunamis vs Profundidad',
             '🔥 Ring of Fire - Zonas de Alto Riesgo',
-            '🎯 Calidad del Monitoreo Sísmico'
+            '🎯 Calidad del Monitoreo Sísmico',
+            '📈 Gutenberg-Richter (b-value)'
         ],
         horizontal=False
     )
@@ -322,6 +399,9 @@ def render_geospatial(df: pd.DataFrame):
     
     elif map_type == '🎯 Calidad del Monitoreo Sísmico':
         render_monitoring_quality_map(df)
+    
+    elif map_type == '📈 Gutenberg-Richter (b-value)':
+        render_gutenberg_richter_map(df)
 
 
 def render_global_magnitude_map(df: pd.DataFrame):
@@ -470,16 +550,117 @@ def render_monitoring_quality_map(df: pd.DataFrame):
     st.plotly_chart(fig, use_container_width=True)
 
 
+def render_gutenberg_richter_map(df: pd.DataFrame):
+    """Mapa de b-values de Gutenberg-Richter por celda y ventana de años."""
+    
+    if len(df) == 0:
+        st.info("ℹ️ No hay eventos en la vista filtrada")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        cell_deg = st.select_slider(
+            "Tamaño de celda (°)",
+            options=GR_CELL_SIZES,
+            value=DEFAULT_CELL_DEG
+        )
+    
+    with col2:
+        window_label = st.selectbox(
+            "Ventana temporal",
+            options=list(GR_YEAR_WINDOWS)
+        )
+        year_window = GR_YEAR_WINDOWS[window_label]
+    
+    with col3:
+        min_events = st.number_input(
+            "Mínimo de eventos sobre Mc",
+            min_value=5,
+            max_value=200,
+            value=MIN_EVENTS,
+            step=5
+        )
+    
+    fingerprint = get_data_fingerprint(df)
+    grid = get_gr_grid(df, fingerprint, cell_deg, year_window, int(min_events))
+    global_gr = get_gr_grid(df, fingerprint, GLOBAL_CELL_DEG, None, int(min_events)).iloc[0]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("b-value global", "—" if np.isnan(global_gr['b'])
+                  else f"{global_gr['b']:.2f} ± {global_gr['b_std']:.2f}")
+    with col2:
+        st.metric("Mc global", f"{global_gr['mc']:.1f}")
+    with col3:
+        st.metric("Celdas con estimación", f"{grid['b'].notna().sum()} / {len(grid)}")
+    
+    estimated = grid.dropna(subset=['b'])
+    if len(estimated) == 0:
+        st.info("ℹ️ Ninguna celda alcanza el mínimo de eventos: prueba celdas mayores "
+                "o un mínimo más bajo")
+        return
+    
+    periods = sorted(estimated['period'].unique())
+    if len(periods) > 1:
+        period = st.select_slider("Período", options=periods, value=periods[-1])
+        estimated = estimated[estimated['period'] == period]
+    
+    fig = px.scatter_geo(
+        estimated,
+        lat='lat',
+        lon='lon',
+        color='b',
+        size='n_complete',
+        hover_data={'mc': ':.1f', 'b_std': ':.2f', 'a': ':.2f', 'events': True, 'period': True},
+        color_continuous_scale='RdYlBu_r',
+        range_color=(0.5, 1.5),
+        projection='natural earth',
+        title='📈 b-value de Gutenberg-Richter por Celda',
+        labels={'b': 'b-value', 'n_complete': 'Eventos ≥ Mc', 'mc': 'Mc',
+                'b_std': 'σb', 'a': 'a-value', 'events': 'Eventos', 'period': 'Período'}
+    )
+    
+    fig.update_layout(
+        template='plotly_dark',
+        height=600,
+        geo=dict(
+            showland=True,
+            landcolor='rgb(50, 50, 50)',
+            showcountries=True,
+            countrycolor='rgb(100, 100, 100)',
+            showocean=True,
+            oceancolor='rgb(20, 20, 20)'
+        )
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.caption("b-value de máxima verosimilitud (Aki-Utsu) sobre la magnitud de completitud "
+               "(máxima curvatura + 0.2). El catálogo solo incluye eventos M ≥ 6.5, por lo "
+               "que Mc y b describen la cola de grandes terremotos. Valores bajos de b indican "
+               "mayor proporción relativa de eventos grandes.")
+
+
 def render_temporal(df: pd.DataFrame):
     """Renderiza análisis temporal."""
     
     st.markdown("### ⏱️ Análisis Temporal")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p>Evolución de patrones sísmicos a lo largo del tiempo (2001-2022).</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
+    
+    # La descomposición se lanza en segundo plano antes de pintar el resto
+    # de la pestaña y se rellena al final
+    decomposition_future = None
+    if len(df) > 0:
+        series = monthly_series(df)
+        decomposition_future = get_thread_pool().submit(
+            decompose_monthly, series['events'], series['tsunamis']
+        )
     
     # Evolución anual
     yearly_stats = df.groupby(['Year', 'tsunami']).size().reset_index(name='count')
@@ -522,6 +703,130 @@ def render_temporal(df: pd.DataFrame):
     )
     
     st.plotly_chart(fig_month, use_container_width=True)
+    
+    st.markdown("#### 🔍 Tendencia, Estacionalidad y Puntos de Cambio")
+    decomposition_placeholder = st.empty()
+    decomposition_placeholder.info("⏳ Calculando descomposición...")
+    
+    rerun_checkpoint()
+    render_rolling_windows(df)
+    
+    if decomposition_future is None:
+        decomposition_placeholder.info("ℹ️ No hay eventos en la vista filtrada")
+        return
+    
+    with decomposition_placeholder.container():
+        render_decomposition(decomposition_future.result(), series['start_year'])
+
+
+@timed_fragment("Descomposición temporal")
+def render_decomposition(decomposition: Dict[str, Any], start_year: int):
+    """Componentes de la descomposición mensual y puntos de cambio."""
+    
+    series_name = st.radio(
+        "Serie",
+        options=['events', 'tsunami_rate'],
+        format_func=lambda name: 'Eventos por mes' if name == 'events' else 'Tasa de tsunami mensual',
+        horizontal=True,
+        key="decomposition_series"
+    )
+    result = decomposition[series_name]
+    
+    n_months = len(result['observed'])
+    dates = pd.date_range(f"{start_year}-01-01", periods=n_months, freq='MS')
+    
+    fig = subplots.make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.06,
+                                 subplot_titles=('Serie observada y tendencia', 'Estacionalidad', 'Residuo'))
+    fig.add_trace(go.Scatter(x=dates, y=result['observed'], mode='lines', name='Observado',
+                             line=dict(color='#95A5A6', width=1)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=dates, y=result['trend'], mode='lines', name='Tendencia',
+                             line=dict(color='#4ECDC4', width=3)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=dates, y=result['seasonal'], mode='lines', name='Estacionalidad',
+                             line=dict(color='#FFA07A')), row=2, col=1)
+    fig.add_trace(go.Bar(x=dates, y=result['residual'], name='Residuo',
+                         marker_color='#FF6B6B'), row=3, col=1)
+    
+    for change_point in result['change_points']:
+        fig.add_vline(x=dates[change_point], line_dash='dash', line_color='yellow')
+    
+    fig.update_layout(template='plotly_dark', height=700, showlegend=False)
+    if series_name == 'tsunami_rate':
+        fig.update_yaxes(tickformat='.0%', row=1, col=1)
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        strength = result['seasonal_strength']
+        st.metric(
+            "Fuerza estacional",
+            f"{strength:.2f}",
+            help="1 - Var(residuo) / Var(estacionalidad + residuo). "
+                 "Valores cercanos a 0 indican que no hay estacionalidad apreciable."
+        )
+    
+    with col2:
+        labels = [dates[c].strftime('%Y-%m') for c in result['change_points']]
+        st.metric("Puntos de cambio", ', '.join(labels) if labels else "Ninguno")
+    
+    if result['seasonal_strength'] < 0.3:
+        st.caption("La componente estacional es débil frente al ruido: las diferencias "
+                   "entre meses del gráfico anterior no indican un patrón estacional robusto.")
+
+
+@timed_fragment("Ventanas móviles")
+def render_rolling_windows(df: pd.DataFrame):
+    """Tasas, fracción de tsunamis y magnitud máxima en ventanas móviles."""
+    
+    st.markdown("#### 📈 Ventanas Móviles")
+    
+    if len(df) == 0:
+        st.info("ℹ️ No hay eventos en la vista filtrada")
+        return
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        window = st.radio(
+            "Ventana",
+            options=ROLLING_WINDOWS,
+            index=len(ROLLING_WINDOWS) - 1,
+            format_func=lambda w: f"{w} días",
+            horizontal=True,
+            key="rolling_window"
+        )
+    
+    with col2:
+        by_region = st.checkbox("Separar por región", value=False, key="rolling_by_region")
+    
+    rolling = get_rolling_stats(df, get_data_fingerprint(df), window, by_region)
+    
+    metrics = {
+        'events': f'Eventos en {window} días',
+        'tsunami_fraction': f'Fracción de tsunamis ({window} días)',
+        'max_magnitude': f'Magnitud máxima ({window} días)'
+    }
+    
+    for tab, (column, title) in zip(st.tabs(list(metrics.values())), metrics.items()):
+        with tab:
+            fig = px.line(
+                rolling,
+                x='date',
+                y=column,
+                color='region',
+                title=title,
+                labels={'date': 'Fecha', column: title, 'region': 'Región'},
+                color_discrete_map={'Global': '#4ECDC4', 'Ring of Fire': '#FF6B6B',
+                                    'Fuera Ring of Fire': '#95A5A6'}
+            )
+            if column == 'tsunami_fraction':
+                fig.update_yaxes(tickformat='.0%')
+            fig.update_layout(template='plotly_dark', height=400)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    st.caption("El catálogo solo registra año y mes: cada evento se fecha a mitad de mes, "
+               "por lo que las ventanas de 30 días equivalen aproximadamente a conteos mensuales.")
 
 
 def render_multivariate(df: pd.DataFrame):
@@ -529,15 +834,15 @@ def render_multivariate(df: pd.DataFrame):
     
     st.markdown("### 🎯 Análisis Multivariable")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <p>Relaciones complejas entre múltiples variables simultáneamente.</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # Scatter 3D
     fig_3d = px.scatter_3d(
-        df.sample(min(1000, len(df))),
+        sample_rows(df, 1000),  # Muestra fija: la gráfica no cambia entre ejecuciones
         x='magnitude',
         y='depth',
         z='sig',
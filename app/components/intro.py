@@ -7,6 +7,8 @@ Renderiza la sección de introducción y contexto del proyecto.
 import streamlit as st
 import pandas as pd
 
+from utils.assets import render_static
+
 def render_intro(df: pd.DataFrame):
     """
     Renderiza la sección de introducción con contexto del proyecto.
@@ -21,7 +23,7 @@ def render_intro(df: pd.DataFrame):
     
     st.markdown("## 📋 Resumen Ejecutivo")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <h3>🎯 Objetivo del Análisis</h3>
         <p style="font-size: 1.1rem; line-height: 1.6;">
@@ -33,7 +35,7 @@ def render_intro(df: pd.DataFrame):
             sustentan decisiones de <strong>prevención, alerta y priorización de recursos</strong>.
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # ========================================================================
     # HALLAZGOS CLAVE
@@ -44,7 +46,7 @@ def render_intro(df: pd.DataFrame):
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
+        render_static("""
         <div class="success-card">
             <h4>✅ Factores Identificados</h4>
             <ul style="font-size: 1rem; line-height: 1.8;">
@@ -54,10 +56,10 @@ def render_intro(df: pd.DataFrame):
                 <li>Patrones geográficos consistentes</li>
             </ul>
         </div>
-        """, unsafe_allow_html=True)
+        """)
     
     with col2:
-        st.markdown("""
+        render_static("""
         <div class="warning-card">
             <h4>⚠️ Consideraciones Importantes</h4>
             <ul style="font-size: 1rem; line-height: 1.8;">
@@ -67,7 +69,7 @@ def render_intro(df: pd.DataFrame):
                 <li>Limitaciones de cobertura geográfica</li>
             </ul>
         </div>
-        """, unsafe_allow_html=True)
+        """)
     
     # ========================================================================
     # DATOS Y ALCANCE
@@ -78,7 +80,7 @@ def render_intro(df: pd.DataFrame):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
+        render_static("""
         <div class="info-card">
             <h4>📅 Período de Análisis</h4>
             <p style="font-size: 1.5rem; font-weight: bold; color: #667eea;">
@@ -88,7 +90,7 @@ def render_intro(df: pd.DataFrame):
                 22 años de datos continuos
             </p>
         </div>
-        """, unsafe_allow_html=True)
+        """)
     
     with col2:
         st.markdown(f"""
@@ -127,7 +129,7 @@ def render_intro(df: pd.DataFrame):
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
+            render_static("""
             **Variables Sísmicas:**
             
             - **Magnitude:** Energía liberada por el terremoto (escala de Richter/momento)
@@ -141,7 +143,7 @@ def render_intro(df: pd.DataFrame):
             """)
         
         with col2:
-            st.markdown("""
+            render_static("""
             **Variables de Monitoreo:**
             
             - **nst:** Número de estaciones sísmicas que registraron el evento
@@ -160,7 +162,7 @@ def render_intro(df: pd.DataFrame):
     
     st.markdown("## ❓ Preguntas de Investigación")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <ol style="font-size: 1.1rem; line-height: 2;">
             <li>¿Qué características sísmicas distinguen a los terremotos que generan tsunamis?</li>
@@ -170,7 +172,7 @@ def render_intro(df: pd.DataFrame):
             <li>¿Cómo han evolucionado los patrones tsunamigénicos a lo largo del tiempo?</li>
         </ol>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     # ========================================================================
     # METODOLOGÍA
@@ -181,7 +183,7 @@ def render_intro(df: pd.DataFrame):
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
+        render_static("""
         **Análisis Estadístico:**
         - Estadística descriptiva completa
         - Pruebas de normalidad (Shapiro-Wilk)
@@ -190,7 +192,7 @@ def render_intro(df: pd.DataFrame):
         """)
     
     with col2:
-        st.markdown("""
+        render_static("""
         **Análisis Geoespacial:**
         - Mapas interactivos globales
         - Identificación de hotspots
@@ -244,7 +246,7 @@ def render_intro(df: pd.DataFrame):
     
     st.markdown("## 📚 Fuente de Datos")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
         <h4>🌐 USGS Earthquake Catalog</h4>
         <p style="font-size: 1rem; line-height: 1.6;">
@@ -255,4 +257,4 @@ def render_intro(df: pd.DataFrame):
             🔗 <a href="https://earthquake.usgs.gov/" target="_blank">earthquake.usgs.gov</a>
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
@@ -1,11 +1,61 @@
 """
 Componente de Machine Learning
 ===============================
-Renderiza la sección de modelado predictivo (próximamente).
+Renderiza la sección de modelado predictivo.
 """
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+from typing import Dict, Any
+
+from utils.assets import render_static
+from utils.cache import shared_cache
+from utils.data_loader import get_data_fingerprint
+from utils.fragments import timed_fragment
+from utils.lazy import lazy_module
+from utils.model import DECISION_THRESHOLD, MIN_USEFUL_AUC, build_features, predict_proba
+from utils.registry import latest_version, load_registered_model
+
+# Librerías pesadas: se importan al renderizar la primera gráfica
+px = lazy_module('plotly.express')
+
+# ============================================================================
+# MODELO E INFERENCIA (CACHEADOS)
+# ============================================================================
+
+@st.cache_resource
+def get_model(version: str) -> Dict[str, Any]:
+    """
+    Carga (solo lectura) una versión del registro, una vez por proceso.
+    
+    El entrenamiento ocurre fuera del panel (`python train_model.py`); aquí
+    nunca se entrena.
+    
+    Args:
+        version: Versión registrada
+        
+    Returns:
+        Dict del modelo entrenado
+    """
+    return load_registered_model(version)
+
+
+@shared_cache(max_entries=64)
+def get_predictions(_df: pd.DataFrame, fingerprint: str, model_version: str) -> np.ndarray:
+    """
+    Puntúa toda la vista filtrada en una sola llamada vectorizada.
+    
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        model_version: Versión del modelo (parte de la clave de caché)
+        
+    Returns:
+        np.ndarray: Probabilidad de tsunami por evento
+    """
+    return predict_proba(get_model(model_version), build_features(_df))
+
 
 def render_ml_section(df: pd.DataFrame):
     """
@@ -15,18 +65,20 @@ def render_ml_section(df: pd.DataFrame):
         df: DataFrame con datos filtrados
     """
     
-    st.markdown("## 🤖 Machine Learning (Próximamente)")
+    st.markdown("## 🤖 Machine Learning")
     
-    st.markdown("""
+    render_static("""
     <div class="info-card">
-        <h3>🚧 Sección en Desarrollo</h3>
+        <h3>📈 Modelo Baseline Disponible</h3>
         <p style="font-size: 1.1rem; line-height: 1.6;">
-            Esta sección contendrá modelos predictivos para estimar la probabilidad 
-            de que un terremoto genere un tsunami, basándose en los patrones identificados 
-            en el análisis exploratorio.
+            Regresión logística que estima la probabilidad de que un terremoto genere 
+            un tsunami a partir de las variables disponibles en el momento del evento, 
+            validada con separación temporal por año.
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
+    
+    render_model_results(df)
     
     # ========================================================================
     # ROADMAP DE DESARROLLO
@@ -53,9 +105,9 @@ def render_ml_section(df: pd.DataFrame):
                 "Implementar Logistic Regression como baseline",
                 "Validación cruzada temporal",
                 "Evaluación de métricas (Precision, Recall, F1, AUC)",
-                "Análisis de feature importance"
+                "Mejorar la capacidad discriminante (AUC de validación ~0.6)"
             ],
-            "timeline": "Próximas 2-4 semanas"
+            "timeline": "En curso"
         },
         {
             "phase": "Fase 3: Modelos Avanzados",
@@ -97,7 +149,7 @@ def render_ml_section(df: pd.DataFrame):
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
+        render_static("""
         ### 📥 Input Features
         
         **Características Sísmicas:**
@@ -123,7 +175,7 @@ def render_ml_section(df: pd.DataFrame):
         """)
     
     with col2:
-        st.markdown("""
+        render_static("""
         ### 📤 Output & Métricas
         
         **Variable Target:**
@@ -151,14 +203,98 @@ def render_ml_section(df: pd.DataFrame):
     # ========================================================================
     
     st.markdown("---")
+    render_risk_simulation()
+    
+    # ========================================================================
+    # RECURSOS Y DOCUMENTACIÓN
+    # ========================================================================
+    
+    st.markdown("---")
+    st.markdown("## 📚 Recursos y Documentación")
+    
+    resources = [
+        {
+            "icon": "📖",
+            "title": "Documentación del EDA",
+            "desc": "Análisis completo que sustenta las decisiones de modelado",
+            "link": "docs/eda.md"
+        },
+        {
+            "icon": "📓",
+            "title": "Notebook de Análisis",
+            "desc": "Código fuente del análisis exploratorio",
+            "link": "notebooks/eda.ipynb"
+        },
+        {
+            "icon": "🗂️",
+            "title": "Dataset Original",
+            "desc": "Datos sísmicos USGS 2001-2022",
+            "link": "data/earthquake_data_tsunami.csv"
+        },
+        {
+            "icon": "🐙",
+            "title": "Repositorio GitHub",
+            "desc": "Código completo del proyecto",
+            "link": "https://github.com/yourusername/Global-Earthquake-Tsunami-Risk"
+        }
+    ]
+    
+    cols = st.columns(4)
+    for i, resource in enumerate(resources):
+        with cols[i]:
+            st.markdown(f"""
+            <div class="info-card" style="text-align: center; min-height: 200px;">
+                <div style="font-size: 3rem; margin-bottom: 1rem;">{resource['icon']}</div>
+                <h4>{resource['title']}</h4>
+                <p style="font-size: 0.9rem; color: #888; margin-bottom: 1rem;">{resource['desc']}</p>
+                <p style="font-size: 0.8rem;"><code>{resource['link']}</code></p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # ========================================================================
+    # CONTACTO Y CONTRIBUCIÓN
+    # ========================================================================
+    
+    st.markdown("---")
+    st.markdown("## 🤝 Contribuciones")
+    
+    render_static("""
+    <div class="info-card">
+        <h4>¿Quieres contribuir al proyecto?</h4>
+        <p style="font-size: 1rem; line-height: 1.6;">
+            Este es un proyecto de código abierto. Aceptamos contribuciones en:
+        </p>
+        <ul style="font-size: 1rem; line-height: 1.8;">
+            <li>🔬 Mejoras en el análisis de datos</li>
+            <li>🤖 Implementación de modelos ML</li>
+            <li>🎨 Mejoras en la interfaz</li>
+            <li>📚 Documentación y tutoriales</li>
+            <li>🐛 Reporte de bugs y sugerencias</li>
+        </ul>
+        <p style="margin-top: 1rem;">
+            📧 Contacto: <a href="mailto:your.email@example.com">your.email@example.com</a>
+        </p>
+    </div>
+    """)
+
+
+@timed_fragment("Demo interactiva")
+def render_risk_simulation():
+    """
+    Simulación de riesgo con reglas heurísticas del EDA.
+    
+    Es un fragmento: mover los controles o pulsar el botón solo reejecuta
+    esta región.
+    """
+    
     st.markdown("## 🎮 Demo Interactiva (Simulación)")
     
-    st.markdown("""
+    render_static("""
     <div class="warning-card">
         <p>⚠️ <strong>Nota:</strong> Esta es una simulación basada en reglas heurísticas 
-        del EDA. NO es un modelo ML entrenado. El modelo real estará disponible en Fase 2.</p>
+        del EDA. NO es el modelo ML entrenado: sus resultados están en la sección del modelo baseline.</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     col1, col2, col3 = st.columns(3)
     
@@ -272,75 +408,131 @@ def render_ml_section(df: pd.DataFrame):
         
         for factor, value in factors:
             st.markdown(f"- {factor}: **{value}**")
+
+
+def render_model_results(df: pd.DataFrame):
+    """Validación temporal del modelo y puntuación de la vista filtrada."""
     
-    # ========================================================================
-    # RECURSOS Y DOCUMENTACIÓN
-    # ========================================================================
+    st.markdown("## 📈 Modelo Baseline: Regresión Logística")
     
-    st.markdown("---")
-    st.markdown("## 📚 Recursos y Documentación")
+    version = latest_version()
     
-    resources = [
-        {
-            "icon": "📖",
-            "title": "Documentación del EDA",
-            "desc": "Análisis completo que sustenta las decisiones de modelado",
-            "link": "docs/eda.md"
-        },
-        {
-            "icon": "📓",
-            "title": "Notebook de Análisis",
-            "desc": "Código fuente del análisis exploratorio",
-            "link": "notebooks/eda.ipynb"
-        },
-        {
-            "icon": "🗂️",
-            "title": "Dataset Original",
-            "desc": "Datos sísmicos USGS 2001-2022",
-            "link": "data/earthquake_data_tsunami.csv"
-        },
-        {
-            "icon": "🐙",
-            "title": "Repositorio GitHub",
-            "desc": "Código completo del proyecto",
-            "link": "https://github.com/yourusername/Global-Earthquake-Tsunami-Risk"
-        }
-    ]
+    if version is None:
+        render_static("""
+        <div class="warning-card">
+            <p>⚠️ <strong>No hay modelos registrados.</strong> Entrena y publica uno con 
+            <code>python train_model.py</code> desde la carpeta <code>app/</code>; 
+            el panel lo cargará automáticamente en el siguiente rerun.</p>
+        </div>
+        """)
+        return
     
-    cols = st.columns(4)
-    for i, resource in enumerate(resources):
-        with cols[i]:
-            st.markdown(f"""
-            <div class="info-card" style="text-align: center; min-height: 200px;">
-                <div style="font-size: 3rem; margin-bottom: 1rem;">{resource['icon']}</div>
-                <h4>{resource['title']}</h4>
-                <p style="font-size: 0.9rem; color: #888; margin-bottom: 1rem;">{resource['desc']}</p>
-                <p style="font-size: 0.8rem;"><code>{resource['link']}</code></p>
-            </div>
-            """, unsafe_allow_html=True)
+    model = get_model(version)
     
-    # ========================================================================
-    # CONTACTO Y CONTRIBUCIÓN
-    # ========================================================================
+    col1, col2, col3 = st.columns(3)
     
-    st.markdown("---")
-    st.markdown("## 🤝 Contribuciones")
+    with col1:
+        st.metric("Versión del Modelo", model['version'])
     
-    st.markdown("""
-    <div class="info-card">
-        <h4>¿Quieres contribuir al proyecto?</h4>
-        <p style="font-size: 1rem; line-height: 1.6;">
-            Este es un proyecto de código abierto. Aceptamos contribuciones en:
-        </p>
-        <ul style="font-size: 1rem; line-height: 1.8;">
-            <li>🔬 Mejoras en el análisis de datos</li>
-            <li>🤖 Implementación de modelos ML</li>
-            <li>🎨 Mejoras en la interfaz</li>
-            <li>📚 Documentación y tutoriales</li>
-            <li>🐛 Reporte de bugs y sugerencias</li>
-        </ul>
-        <p style="margin-top: 1rem;">
-            📧 Contacto: <a href="mailto:your.email@example.com">your.email@example.com</a>
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    with col2:
+        st.metric("Eventos de Entrenamiento", f"{model['n_train']:,}")
+    
+    with col3:
+        params = f"L2={model['l2']:g}"
+        if model.get('class_weight'):
+            params += f", pesos {model['class_weight']}"
+        st.metric("Hiperparámetros", params)
+    
+    # Validación cruzada temporal
+    st.markdown("#### ⏱️ Validación Cruzada Temporal")
+    
+    cv_df = pd.DataFrame(model['cv_results']).rename(columns={
+        'test_year': 'Año de Prueba', 'auc': 'AUC', 'precision': 'Precisión',
+        'recall': 'Recall', 'f1': 'F1', 'n': 'Eventos'
+    })
+    st.dataframe(
+        cv_df.style.format({'AUC': '{:.3f}', 'Precisión': '{:.3f}',
+                            'Recall': '{:.3f}', 'F1': '{:.3f}'}),
+        hide_index=True,
+        use_container_width=True
+    )
+    labeled_from = model.get('labeled_from')
+    st.caption(
+        "Cada fold entrena con todos los años anteriores al año de prueba. "
+        + (f"Solo se usan los años con tsunamis registrados (desde {labeled_from}); "
+           "en los anteriores el catálogo no anota tsunamis y no hay negativos reales."
+           if labeled_from else
+           "⚠️ Este modelo se entrenó antes de excluir los años sin tsunamis registrados; "
+           "reentrénalo con `python train_model.py`.")
+    )
+    
+    mean_auc = cv_df['AUC'].mean()
+    if mean_auc < MIN_USEFUL_AUC:
+        st.warning(
+            f"⚠️ AUC medio de validación {mean_auc:.2f}: la capacidad discriminante del "
+            "modelo es limitada y sus probabilidades son orientativas, no una alerta."
+        )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        coef_df = pd.DataFrame({
+            'Característica': model['features'],
+            'Coeficiente': model['coef']
+        }).sort_values('Coeficiente')
+        
+        fig_coef = px.bar(
+            coef_df,
+            x='Coeficiente',
+            y='Característica',
+            orientation='h',
+            title='Coeficientes (características estandarizadas)',
+            color='Coeficiente',
+            color_continuous_scale='RdBu_r'
+        )
+        fig_coef.update_layout(template='plotly_dark', height=450)
+        st.plotly_chart(fig_coef, use_container_width=True)
+    
+    # Puntuación vectorizada de la vista filtrada
+    if len(df) == 0:
+        with col2:
+            st.info("ℹ️ No hay eventos en la vista filtrada para puntuar")
+        return
+    
+    proba = get_predictions(df, get_data_fingerprint(df), model['version'])
+    scored = df.assign(probabilidad=proba)
+    
+    with col2:
+        fig_proba = px.histogram(
+            scored,
+            x='probabilidad',
+            color='tsunami',
+            nbins=40,
+            barmode='overlay',
+            title='Probabilidad Predicha en la Vista Filtrada',
+            labels={'probabilidad': 'Probabilidad de Tsunami', 'tsunami': 'Tsunami'},
+            color_discrete_map={0: 'lightblue', 1: 'red'}
+        )
+        fig_proba.update_layout(template='plotly_dark', height=450)
+        st.plotly_chart(fig_proba, use_container_width=True)
+    
+    st.markdown("#### 🎯 Eventos con Mayor Probabilidad de Tsunami")
+    
+    # Fuera de los años etiquetados la columna tsunami no permite contrastar
+    if labeled_from:
+        scored = scored[scored['Year'] >= labeled_from]
+    top_events = scored.nlargest(10, 'probabilidad')[
+        ['Year', 'Month', 'magnitude', 'depth', 'latitude', 'longitude',
+         'tsunami', 'probabilidad']
+    ]
+    st.dataframe(
+        top_events.style.format({'probabilidad': '{:.1%}'}),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    flagged = int((proba >= DECISION_THRESHOLD).sum())
+    st.caption(
+        f"{flagged:,} de {len(df):,} eventos superan el umbral de decisión "
+        f"({DECISION_THRESHOLD:.0%})."
+    )
@@ -6,7 +6,15 @@ Renderiza el menú lateral con filtros interactivos.
 
 import streamlit as st
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from utils.assets import render_static
+from utils.export import available_formats, get_export, start_export, EXPORT_FORMATS
+from utils.fragments import timed_fragment
+from utils.jobs import Job, get_job
+
+# Mayor fichero que se ofrece como descarga (Streamlit lo sirve desde memoria)
+DOWNLOAD_MAX_BYTES = 200 * 1024 * 1024
 
 def render_sidebar(df: pd.DataFrame) -> Dict[str, Any]:
     """
@@ -21,84 +29,109 @@ def render_sidebar(df: pd.DataFrame) -> Dict[str, Any]:
     
     with st.sidebar:
         # Logo y título del sidebar
-        st.markdown("""
+        render_static("""
             <div style="text-align: center; padding: 1rem 0;">
                 <h2>🎛️ Panel de Control</h2>
                 <p style="color: #888; font-size: 0.9rem;">
                     Ajusta los filtros para explorar los datos
                 </p>
             </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # ====================================================================
-        # SECCIÓN: FILTROS TEMPORALES
-        # ====================================================================
-        
-        st.markdown("### 📅 Filtros Temporales")
-        
-        # Filtro de rango de años
-        year_min = int(df['Year'].min())
-        year_max = int(df['Year'].max())
-        
-        year_range = st.slider(
-            "Rango de Años",
-            min_value=year_min,
-            max_value=year_max,
-            value=(year_min, year_max),
-            help="Selecciona el período de análisis"
-        )
-        
-        # Filtro de meses
-        all_months = list(range(1, 13))
-        month_names = {
-            1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
-            5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
-            9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-        }
-        
-        selected_months_display = st.multiselect(
-            "Meses del Año",
-            options=all_months,
-            default=all_months,
-            format_func=lambda x: month_names[x],
-            help="Selecciona uno o más meses"
-        )
+        """)
         
         st.markdown("---")
         
-        # ====================================================================
-        # SECCIÓN: FILTROS SÍSMICOS
-        # ====================================================================
-        
-        st.markdown("### 🌍 Filtros Sísmicos")
-        
-        # Filtro de magnitud
-        mag_min = float(df['magnitude'].min())
-        mag_max = float(df['magnitude'].max())
-        
-        magnitude_range = st.slider(
-            "Magnitud",
-            min_value=mag_min,
-            max_value=mag_max,
-            value=(mag_min, mag_max),
-            step=0.1,
-            help="Filtra por rango de magnitud del terremoto"
-        )
-        
-        # Filtro de profundidad
-        depth_min = float(df['depth'].min())
-        depth_max = float(df['depth'].max())
-        
-        depth_range = st.slider(
-            "Profundidad (km)",
-            min_value=depth_min,
-            max_value=min(depth_max, 700.0),  # Limitar para mejor UX
-            value=(depth_min, min(depth_max, 700.0)),
-            step=10.0,
-            help="Filtra por profundidad del epicentro"
-        )
+        # Los filtros de rango se agrupan en un formulario: arrastrar un
+        # deslizador no relanza el panel hasta pulsar «Aplicar filtros»
+        with st.form("range_filters", border=False):
+            # ====================================================================
+            # SECCIÓN: FILTROS TEMPORALES
+            # ====================================================================
+            
+            st.markdown("### 📅 Filtros Temporales")
+            
+            # Filtro de rango de años
+            year_min = int(df['Year'].min())
+            year_max = int(df['Year'].max())
+            
+            year_range = st.slider(
+                "Rango de Años",
+                min_value=year_min,
+                max_value=year_max,
+                value=(year_min, year_max),
+                help="Selecciona el período de análisis"
+            )
+            
+            # Filtro de meses
+            all_months = list(range(1, 13))
+            month_names = {
+                1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
+                5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
+                9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
+            }
+            
+            selected_months_display = st.multiselect(
+                "Meses del Año",
+                options=all_months,
+                default=all_months,
+                format_func=lambda x: month_names[x],
+                help="Selecciona uno o más meses"
+            )
+            
+            st.markdown("---")
+            
+            # ====================================================================
+            # SECCIÓN: FILTROS SÍSMICOS
+            # ====================================================================
+            
+            st.markdown("### 🌍 Filtros Sísmicos")
+            
+            # Filtro de magnitud
+            mag_min = float(df['magnitude'].min())
+            mag_max = float(df['magnitude'].max())
+            
+            magnitude_range = st.slider(
+                "Magnitud",
+                min_value=mag_min,
+                max_value=mag_max,
+                value=(mag_min, mag_max),
+                step=0.1,
+                help="Filtra por rango de magnitud del terremoto"
+            )
+            
+            # Filtro de profundidad
+            depth_min = float(df['depth'].min())
+            depth_max = float(df['depth'].max())
+            
+            depth_range = st.slider(
+                "Profundidad (km)",
+                min_value=depth_min,
+                max_value=min(depth_max, 700.0),  # Limitar para mejor UX
+                value=(depth_min, min(depth_max, 700.0)),
+                step=10.0,
+                help="Filtra por profundidad del epicentro"
+            )
+            
+            # Declustering (Gardner-Knopoff)
+            mainshocks_only = st.checkbox(
+                "Solo eventos principales",
+                value=False,
+                help="Elimina réplicas con ventanas espacio-temporales de Gardner-Knopoff"
+            )
+            
+            decluster_scale = st.select_slider(
+                "Escala de ventanas",
+                options=[0.5, 0.75, 1.0, 1.5, 2.0],
+                value=1.0,
+                format_func=lambda x: f"×{x:g}",
+                help="Multiplica las ventanas de distancia y tiempo de Gardner-Knopoff "
+                     "(solo con «Solo eventos principales»)"
+            )
+            
+            st.form_submit_button(
+                "✅ Aplicar filtros",
+                type="primary",
+                use_container_width=True
+            )
         
         st.markdown("---")
         
@@ -169,15 +202,15 @@ def render_sidebar(df: pd.DataFrame) -> Dict[str, Any]:
             """)
         
         with st.expander("❓ Ayuda"):
-            st.markdown("""
+            render_static("""
             **Cómo usar este panel:**
             
             1. **Filtros Temporales:** Ajusta el período de análisis
-            2. **Filtros Sísmicos:** Define rangos de magnitud y profundidad
+            2. **Filtros Sísmicos:** Define rangos de magnitud y profundidad; opcionalmente, elimina réplicas
             3. **Filtros de Tsunami:** Enfoca en eventos específicos
             4. **Filtros Geográficos:** Analiza regiones específicas
             
-            💡 **Tip:** Los filtros se aplican automáticamente
+            💡 **Tip:** Los filtros temporales y sísmicos se aplican al pulsar **Aplicar filtros**; el resto, automáticamente
             """)
         
         # ====================================================================
@@ -198,8 +231,137 @@ def render_sidebar(df: pd.DataFrame) -> Dict[str, Any]:
         'months': selected_months_display,
         'magnitude_range': magnitude_range,
         'depth_range': depth_range,
+        'mainshocks_only': mainshocks_only,
+        'decluster_scale': decluster_scale,
         'tsunami_filter': tsunami_filter,
         'region_filter': region_filter,
         'show_advanced': show_advanced,
         'chart_theme': chart_theme
     }
+
+
+def render_job_progress(jobs: List[Optional[Job]]):
+    """
+    Muestra el progreso de los trabajos de precálculo en segundo plano.
+    
+    Args:
+        jobs: Trabajos a mostrar (se ignoran los None)
+    """
+    jobs = [job for job in jobs if job is not None]
+    if not jobs:
+        return
+    
+    with st.expander("⚙️ Precálculo en segundo plano"):
+        for job in jobs:
+            if job.status == 'en curso':
+                text = f"{job.label}: {job.done}/{job.total} · {job.current or ''}"
+            else:
+                text = f"{job.label}: {job.status} ({job.done}/{job.total})"
+            st.progress(job.progress, text=text)
+            if job.errors:
+                st.caption(f"⚠️ {len(job.errors)} tareas fallidas")
+        st.caption("Los análisis precalculados aparecen al instante; el progreso "
+                   "se actualiza con cada interacción.")
+
+
+def render_fragment_timings(timings: Dict[str, Dict[str, Any]]):
+    """
+    Muestra los tiempos de las regiones que se reejecutan por separado.
+    
+    Args:
+        timings: Tiempos por región (ver `utils.fragments.get_fragment_timings`)
+    """
+    if not timings:
+        return
+    
+    with st.expander("⏱️ Tiempos por región"):
+        timings_df = pd.DataFrame([
+            {
+                'Región': name,
+                'Ejecuciones': entry['runs'],
+                'Última (ms)': round(entry['last_ms'], 1),
+                'Media (ms)': round(entry['total_ms'] / entry['runs'], 1),
+                'Máx. (ms)': round(entry['max_ms'], 1)
+            }
+            for name, entry in timings.items()
+        ])
+        st.dataframe(timings_df, hide_index=True, use_container_width=True)
+        st.caption("Cambiar un control de una región solo reejecuta esa región; "
+                   "la tabla se actualiza en la siguiente ejecución completa.")
+
+
+def render_export_panel(df: pd.DataFrame, df_filtered: pd.DataFrame, session_key: str):
+    """
+    Exportación de la vista filtrada en segundo plano.
+    
+    Se exportan las filas del catálogo por posición, en bloques: la sesión
+    sigue respondiendo mientras se escribe el fichero.
+    
+    Args:
+        df: Catálogo completo
+        df_filtered: Vista filtrada actual
+        session_key: Identificador de la sesión (clave del trabajo)
+    """
+    key = f"export:{session_key}"
+    
+    with st.expander("📥 Exportar vista filtrada"):
+        fmt = st.selectbox("Formato", options=available_formats(), key="export_format")
+        
+        if st.button(f"Exportar {len(df_filtered):,} eventos", use_container_width=True,
+                     disabled=df_filtered.empty):
+            positions = df.index.get_indexer(df_filtered.index)
+            start_export(key, df, positions, fmt)
+        
+        job = get_job(key)
+        if job is not None and not job.finished:
+            render_export_progress(key)
+        else:
+            render_export_result(key)
+
+
+@timed_fragment("Exportación", run_every=1.0)
+def render_export_progress(key: str):
+    """Progreso de la exportación en curso (se actualiza cada segundo)."""
+    job = get_job(key)
+    export = get_export(key)
+    if job is None or export is None or job.finished:
+        st.rerun()  # Ejecución completa: muestra la descarga
+    
+    st.progress(job.progress, text=f"{export.rows_written:,}/{export.rows_total:,} filas · "
+                                   f"{job.current or 'en cola'}")
+    st.caption("Puedes seguir usando el panel mientras se exporta.")
+
+
+def render_export_result(key: str):
+    """Resultado de la última exportación de la sesión."""
+    job = get_job(key)
+    export = get_export(key)
+    if job is None or export is None:
+        return
+    
+    if export.error is not None:
+        st.error(f"❌ Exportación fallida: {export.error}")
+    elif not export.completed:
+        st.caption("Exportación cancelada")
+    elif not export.path.exists():
+        st.caption("La exportación ha caducado; vuelve a exportar")
+    else:
+        size = export.path.stat().st_size
+        st.caption(f"✅ {export.rows_written:,} filas · {size / 1e6:.1f} MB · "
+                   f"{job.finished_at - job.started_at:.1f} s")
+        if size <= DOWNLOAD_MAX_BYTES:
+            # Streamlit lee el fichero entero en memoria al crear el botón de
+            # descarga: solo se crea tras pedirlo, y solo en esa ejecución
+            if st.button(f"📦 Preparar descarga {export.format}", key="export_prepare",
+                         use_container_width=True):
+                with open(export.path, 'rb') as f:
+                    st.download_button(
+                        f"⬇️ Descargar {export.format}",
+                        data=f,
+                        file_name=export.path.name,
+                        mime=EXPORT_FORMATS[export.format][1],
+                        use_container_width=True
+                    )
+        else:
+            st.caption(f"Fichero demasiado grande para descargarlo desde el navegador: "
+                       f"`{export.path}`")
@@ -0,0 +1,170 @@
+"""
+Componente de Consulta Avanzada
+================================
+Consola SQL de solo lectura sobre el catálogo completo, para preguntas que
+los filtros de la barra lateral no pueden expresar.
+"""
+
+import os
+
+import streamlit as st
+import pandas as pd
+
+from utils.assets import render_static
+from utils.data_loader import get_data_version
+from utils.fragments import timed_fragment
+from utils.sql import (
+    SQLEngine, QueryRejected, QueryTimeout, DEFAULT_MAX_ROWS, DEFAULT_TIMEOUT_S, TABLE_NAME
+)
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+# TSUNAMI_SQL_CONSOLE=0 desactiva la consola (p. ej. en despliegues públicos)
+SQL_CONSOLE_ENABLED = os.environ.get('TSUNAMI_SQL_CONSOLE', '1') != '0'
+MAX_ROWS_LIMIT = 50_000
+MAX_TIMEOUT_S = 30
+RESULT_KEY = 'sql_result'
+
+EXAMPLE_QUERIES = {
+    "Tasa de tsunami por década y región": f"""SELECT (Year / 10) * 10 AS decada,
+       ring_of_fire,
+       COUNT(*) AS eventos,
+       ROUND(AVG(tsunami) * 100, 1) AS tasa_tsunami_pct
+FROM {TABLE_NAME}
+GROUP BY 1, 2
+ORDER BY 1, 2""",
+    "Eventos someros de gran magnitud sin tsunami": f"""SELECT Year, Month, magnitude, depth, latitude, longitude, sig
+FROM {TABLE_NAME}
+WHERE magnitude >= 7.5 AND depth < 70 AND tsunami = 0
+ORDER BY magnitude DESC""",
+    "Profundidad media por categoría de magnitud": f"""SELECT mag_category,
+       COUNT(*) AS eventos,
+       ROUND(AVG(depth), 1) AS profundidad_media,
+       MAX(sig) AS significancia_max
+FROM {TABLE_NAME}
+GROUP BY mag_category
+ORDER BY eventos DESC""",
+}
+
+# ============================================================================
+# MOTOR (CACHEADO)
+# ============================================================================
+
+@st.cache_resource(max_entries=1)
+def get_sql_engine(_df: pd.DataFrame, version: str, fingerprint: str) -> SQLEngine:
+    """
+    Base de datos embebida del catálogo, una por proceso y versión.
+    
+    Args:
+        _df: Catálogo completo
+        version: Versión del dataset (un CSV nuevo con las mismas filas
+            tiene la misma huella)
+        fingerprint: Huella del catálogo
+    
+    Returns:
+        SQLEngine
+    """
+    return SQLEngine(_df)
+
+# ============================================================================
+# CONSOLA
+# ============================================================================
+
+def render_sql_console(df: pd.DataFrame, fingerprint: str):
+    """
+    Renderiza la sección de consulta avanzada.
+    
+    Args:
+        df: Catálogo completo (no la vista filtrada)
+        fingerprint: Huella del catálogo
+    """
+    
+    st.markdown("## 🧮 Consulta Avanzada")
+    
+    if not SQL_CONSOLE_ENABLED:
+        st.info("ℹ️ La consulta avanzada está desactivada en este despliegue")
+        return
+    
+    render_static(f"""
+    <div class="info-card">
+        <p>Consultas SQL de solo lectura sobre el catálogo completo (tabla <code>{TABLE_NAME}</code>;
+        los filtros de la barra lateral no se aplican). Solo se admite una sentencia
+        <code>SELECT</code> o <code>WITH</code>; cada consulta tiene un límite de filas y un
+        tiempo máximo.</p>
+    </div>
+    """)
+    
+    engine = get_sql_engine(df, get_data_version(df), fingerprint)
+    
+    with st.expander(f"📋 Columnas de `{TABLE_NAME}`"):
+        st.dataframe(
+            pd.DataFrame({'columna': df.columns, 'tipo': df.dtypes.astype(str).to_numpy()}),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    render_query_runner(engine)
+
+
+@timed_fragment("Consulta avanzada")
+def render_query_runner(engine: SQLEngine):
+    """Formulario de consulta y resultado (se reejecuta solo esta región)."""
+    
+    example = st.selectbox("Ejemplo", options=list(EXAMPLE_QUERIES))
+    
+    with st.form("sql_console"):
+        sql = st.text_area("Consulta SQL", value=EXAMPLE_QUERIES[example], height=180)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            max_rows = st.number_input(
+                "Máximo de filas",
+                min_value=10,
+                max_value=MAX_ROWS_LIMIT,
+                value=DEFAULT_MAX_ROWS,
+                step=1000
+            )
+        with col2:
+            timeout_s = st.slider(
+                "Tiempo máximo (s)",
+                min_value=1,
+                max_value=MAX_TIMEOUT_S,
+                value=int(DEFAULT_TIMEOUT_S)
+            )
+        
+        submitted = st.form_submit_button("▶️ Ejecutar", type="primary")
+    
+    placeholder = st.empty()
+    
+    if submitted:
+        st.session_state.pop(RESULT_KEY, None)
+        try:
+            # El resultado se muestra a medida que llegan los lotes
+            result = engine.execute(
+                sql, max_rows=int(max_rows), timeout_s=float(timeout_s),
+                on_batch=lambda partial: placeholder.dataframe(partial, use_container_width=True)
+            )
+        except QueryRejected as e:
+            st.error(f"❌ Consulta no admitida: {e}")
+            return
+        except QueryTimeout:
+            st.warning(f"⏱️ La consulta superó {timeout_s} s y se interrumpió")
+            return
+        except Exception as e:
+            st.error(f"❌ Error en la consulta: {e}")
+            return
+        st.session_state[RESULT_KEY] = result
+    
+    result = st.session_state.get(RESULT_KEY)
+    if result is None:
+        return
+    
+    placeholder.dataframe(result['data'], use_container_width=True)
+    st.caption(
+        f"{len(result['data']):,} filas · {result['elapsed_ms']:.0f} ms · "
+        f"{result['batches']} lotes · motor {result['backend']}"
+    )
+    if result['truncated']:
+        st.warning(f"⚠️ Resultado truncado a {len(result['data']):,} filas")
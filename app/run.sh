@@ -108,7 +108,28 @@ fi
 echo ""
 
 # ============================================================================
-# 6. LANZAR APLICACIÓN
+# 6. VERIFICAR MODELO PREDICTIVO
+# ============================================================================
+
+echo "🔍 Verificando registro de modelos..."
+
+if [ ! -f "../models/registry/LATEST" ]; then
+    echo -e "${YELLOW}⚠️  No hay modelos registrados. Entrenando modelo baseline...${NC}"
+    python train_model.py
+    
+    if [ $? -eq 0 ]; then
+        echo -e "${GREEN}✅ Modelo entrenado y registrado${NC}"
+    else
+        echo -e "${YELLOW}⚠️  No se pudo entrenar el modelo; la sección ML quedará sin modelo${NC}"
+    fi
+else
+    echo -e "${GREEN}✅ Modelo registrado encontrado${NC}"
+fi
+
+echo ""
+
+# ============================================================================
+# 7. LANZAR APLICACIÓN
 # ============================================================================
 
 echo "🚀 Lanzando Panel de Inteligencia Sísmico..."
@@ -121,10 +142,16 @@ echo ""
 
 sleep 2
 
-streamlit run app.py
+# Modo multiproceso opcional: WORKERS=4 ./run.sh
+if [ -n "$WORKERS" ] && [ "$WORKERS" -gt 1 ]; then
+    echo -e "${YELLOW}⚙️  Modo multiproceso: $WORKERS workers detrás del proxy local${NC}"
+    python cluster.py --workers "$WORKERS"
+else
+    streamlit run app.py
+fi
 
 # ============================================================================
-# 7. CLEANUP AL SALIR
+# 8. CLEANUP AL SALIR
 # ============================================================================
 
 echo ""
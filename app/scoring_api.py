@@ -0,0 +1,163 @@
+"""
+API Local de Puntuación de Riesgo de Tsunami
+=============================================
+Servidor HTTP ligero para integraciones de alerta temprana. Carga el modelo
+registrado una sola vez al arrancar y responde con el nivel de alerta y la
+probabilidad de tsunami de uno o varios eventos.
+
+Uso:
+    python scoring_api.py                     # http://127.0.0.1:8600
+    python scoring_api.py --port 9000
+    python scoring_api.py --benchmark         # Latencia en proceso (p50/p99)
+
+Endpoints:
+    GET  /health   → {"status": "ok", "model_version": ...}
+    POST /score    → cuerpo: un evento, una lista de eventos o {"events": [...]}
+
+Evento: {"magnitude": 7.8, "depth": 25, "latitude": -20.5, "longitude": -70.1,
+         "nst": 120, "dmin": 0.8, "gap": 20}
+
+Autor: Sistema de Análisis Sísmico
+Fecha: 2025
+"""
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.model import INPUT_COLUMNS
+from utils.scoring import RiskScorer
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH_SIZE = 100_000
+
+# ============================================================================
+# SERVIDOR HTTP
+# ============================================================================
+
+def make_handler(scorer: RiskScorer):
+    """Crea la clase manejadora con el puntuador ya precargado."""
+
+    class ScoringHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Conexiones persistentes
+
+        def _send_json(self, status: int, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok', 'model_version': scorer.version})
+            else:
+                self._send_json(404, {'error': 'Ruta no encontrada'})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send_json(404, {'error': 'Ruta no encontrada'})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                self._send_json(400, {'error': 'Cabecera Content-Length inválida'})
+                return
+            if length <= 0 or length > MAX_BODY_BYTES:
+                self._send_json(413 if length > 0 else 400,
+                                {'error': 'Cuerpo vacío o demasiado grande'})
+                return
+
+            try:
+                payload = json.loads(self.rfile.read(length))
+                if isinstance(payload, dict) and 'events' in payload:
+                    payload = payload['events']
+
+                if isinstance(payload, dict):
+                    self._send_json(200, scorer.score_event(payload))
+                elif isinstance(payload, list) and len(payload) <= MAX_BATCH_SIZE:
+                    self._send_json(200, {'results': scorer.score_batch(payload)})
+                else:
+                    self._send_json(400, {'error': f'Se espera un evento o una lista '
+                                                   f'de hasta {MAX_BATCH_SIZE} eventos'})
+            except KeyError as e:
+                self._send_json(400, {'error': f'Falta el campo {e}',
+                                      'required': INPUT_COLUMNS})
+            except (ValueError, TypeError) as e:
+                self._send_json(400, {'error': f'Evento inválido: {e}'})
+
+        def log_message(self, format, *args):
+            # Sin log por petición en la ruta caliente
+            pass
+
+    return ScoringHandler
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run_benchmark(scorer: RiskScorer, n_calls: int = 100_000):
+    """Mide la latencia de `score_event` en proceso."""
+    event = {'magnitude': 7.8, 'depth': 25.0, 'latitude': -20.5, 'longitude': -70.1,
+             'nst': 120, 'dmin': 0.8, 'gap': 20.0}
+
+    for _ in range(1000):  # Calentamiento
+        scorer.score_event(event)
+
+    latencies = []
+    for _ in range(n_calls):
+        start = time.perf_counter_ns()
+        scorer.score_event(event)
+        latencies.append(time.perf_counter_ns() - start)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] / 1000
+    p99 = latencies[int(len(latencies) * 0.99)] / 1000
+    print(f"score_event × {n_calls:,}: p50 = {p50:.1f} µs | p99 = {p99:.1f} µs")
+
+    batch = [event] * 10_000
+    start = time.perf_counter()
+    scorer.score_batch(batch)
+    print(f"score_batch × 10.000 eventos: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API local de puntuación de riesgo de tsunami")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--benchmark', action='store_true', help="Medir latencia y salir")
+    args = parser.parse_args(argv)
+
+    try:
+        scorer = RiskScorer()
+    except FileNotFoundError as e:
+        print(f"❌ {e}. Ejecuta primero: python train_model.py")
+        return 1
+
+    if args.benchmark:
+        run_benchmark(scorer)
+        return 0
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(scorer))
+    print(f"🌊 API de puntuación (modelo {scorer.version}) en http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
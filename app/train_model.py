@@ -0,0 +1,234 @@
+"""
+Pipeline de Entrenamiento Offline
+==================================
+Búsqueda de hiperparámetros con validación temporal en paralelo y
+publicación del mejor modelo en el registro que consume el panel.
+
+Uso:
+    python train_model.py                 # Búsqueda completa (reanuda si se interrumpió)
+    python train_model.py --workers 4     # Limitar procesos
+    python train_model.py --fresh         # Ignorar resultados previos de la misma búsqueda
+
+Autor: Sistema de Análisis Sísmico
+Fecha: 2025
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from utils.dataset import read_events, DATA_PATH
+from utils.model import (
+    MODEL_DIR, CV_TEST_YEARS,
+    build_features, evaluate_fold, labeled_years_mask, temporal_cv_splits, train_model
+)
+from utils.registry import REGISTRY_DIR, register_model
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+RUNS_DIR = MODEL_DIR / "runs"
+FOLDS_FILE = "folds.jsonl"
+SUMMARY_FILE = "summary.json"
+
+PARAM_GRID = {
+    'l2': [0.01, 0.1, 1.0, 10.0, 100.0],
+    'class_weight': [None, 'balanced']
+}
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+_worker_data = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, years: np.ndarray):
+    """Recibe los datos una sola vez por proceso en lugar de por tarea."""
+    _worker_data.update(X=X, y=y, years=years)
+
+
+def _run_task(param_key: str, params: dict, test_year: int) -> dict:
+    """Evalúa una combinación (hiperparámetros × fold) en un worker."""
+    metrics = evaluate_fold(_worker_data['X'], _worker_data['y'], _worker_data['years'],
+                            test_year, **params)
+    return {'param_key': param_key, 'params': params, **metrics}
+
+# ============================================================================
+# BÚSQUEDA
+# ============================================================================
+
+def param_combinations(grid: dict) -> list:
+    """Producto cartesiano de la rejilla como lista de dicts."""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def param_key(params: dict) -> str:
+    """Clave estable de una combinación de hiperparámetros."""
+    return json.dumps(params, sort_keys=True)
+
+
+def file_sha256(path: Path) -> str:
+    """Hash del fichero de datos leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_id_for(data_hash: str, grid: dict, n_test_years: int, labeled_from: int) -> str:
+    """
+    Identificador determinista de la búsqueda: mismos datos, rejilla y
+    primer año etiquetado producen el mismo directorio, lo que permite
+    reanudarla.
+    """
+    spec = json.dumps({'data': data_hash, 'grid': grid, 'folds': n_test_years,
+                       'labeled_from': labeled_from}, sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+
+def load_completed(folds_path: Path) -> dict:
+    """
+    Lee las métricas ya escritas. Una línea final truncada (interrupción
+    durante la escritura) se descarta.
+    """
+    completed = {}
+    if not folds_path.exists():
+        return completed
+    with open(folds_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            completed[(record['param_key'], record['test_year'])] = record
+    return completed
+
+
+def summarize(records: list) -> list:
+    """Métricas medias por combinación, ordenadas por AUC y recall."""
+    by_params = {}
+    for record in records:
+        by_params.setdefault(record['param_key'], []).append(record)
+
+    summary = []
+    for key, folds in by_params.items():
+        aucs = [f['auc'] for f in folds if f['auc'] == f['auc']]  # Excluye NaN
+        summary.append({
+            'param_key': key,
+            'params': folds[0]['params'],
+            'mean_auc': float(np.mean(aucs)) if aucs else float('nan'),
+            'mean_recall': float(np.mean([f['recall'] for f in folds])),
+            'mean_f1': float(np.mean([f['f1'] for f in folds])),
+            'n_folds': len(folds)
+        })
+
+    return sorted(summary,
+                  key=lambda s: (np.nan_to_num(s['mean_auc'], nan=-1), s['mean_recall']),
+                  reverse=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Entrena y registra el clasificador de tsunamis")
+    parser.add_argument('--data', type=Path, default=DATA_PATH, help="CSV de eventos")
+    parser.add_argument('--registry', type=Path, default=REGISTRY_DIR, help="Directorio del registro")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Procesos en paralelo")
+    parser.add_argument('--folds', type=int, default=CV_TEST_YEARS, help="Años finales usados como folds")
+    parser.add_argument('--fresh', action='store_true', help="Descartar resultados previos de esta búsqueda")
+    parser.add_argument('--no-register', action='store_true', help="Solo buscar, sin publicar el modelo")
+    args = parser.parse_args(argv)
+
+    df = read_events(args.data)
+    # Solo los años con tsunamis registrados: antes no hay negativos reales
+    labeled = labeled_years_mask(df['tsunami'].to_numpy(), df['Year'].to_numpy())
+    if not labeled.any():
+        print("❌ El catálogo no registra ningún tsunami; no hay nada que entrenar")
+        return 1
+    df = df[labeled]
+    X = build_features(df)
+    y = df['tsunami'].to_numpy(dtype=float)
+    years = df['Year'].to_numpy()
+    print(f"📅 Entrenamiento con los años {years.min()}-{years.max()} "
+          f"({len(df):,} eventos con tsunamis registrados)")
+
+    data_hash = file_sha256(args.data)
+    run_dir = RUNS_DIR / run_id_for(data_hash, PARAM_GRID, args.folds, int(years.min()))
+    run_dir.mkdir(parents=True, exist_ok=True)
+    folds_path = run_dir / FOLDS_FILE
+
+    if args.fresh and folds_path.exists():
+        folds_path.unlink()
+
+    completed = load_completed(folds_path)
+    test_years = [split['test_year'] for split in temporal_cv_splits(years, args.folds)]
+    tasks = [(param_key(params), params, year)
+             for params in param_combinations(PARAM_GRID)
+             for year in test_years
+             if (param_key(params), year) not in completed]
+
+    total = len(completed) + len(tasks)
+    print(f"🔍 Búsqueda {run_dir.name}: {total} evaluaciones "
+          f"({len(completed)} reanudadas, {len(tasks)} pendientes)")
+
+    start = time.perf_counter()
+    if tasks:
+        with ProcessPoolExecutor(max_workers=args.workers,
+                                 initializer=_init_worker,
+                                 initargs=(X, y, years)) as pool, \
+                open(folds_path, 'a', encoding='utf-8') as out:
+            futures = [pool.submit(_run_task, *task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), start=1):
+                record = future.result()
+                completed[(record['param_key'], record['test_year'])] = record
+                # Se escribe cada fold al terminar para poder reanudar
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                print(f"  [{len(completed)}/{total}] {record['param_key']} "
+                      f"año {record['test_year']}: AUC={record['auc']:.3f}")
+
+    summary = summarize(list(completed.values()))
+    (run_dir / SUMMARY_FILE).write_text(json.dumps(summary, indent=2), encoding='utf-8')
+
+    if not summary:
+        print("❌ Ninguna evaluación produjo resultados; no se registra ningún modelo")
+        return 1
+
+    best = summary[0]
+    print(f"✅ Búsqueda completada en {time.perf_counter() - start:.1f}s. "
+          f"Mejor combinación: {best['params']} (AUC medio {best['mean_auc']:.3f})")
+
+    if args.no_register:
+        return 0
+
+    cv_results = sorted(
+        (record for record in completed.values() if record['param_key'] == best['param_key']),
+        key=lambda r: r['test_year']
+    )
+    cv_results = [{key: value for key, value in record.items()
+                   if key not in ('param_key', 'params')} for record in cv_results]
+
+    model = train_model(df, cv_results=cv_results, **best['params'])
+    model.update({
+        'data_sha256': data_hash,
+        'search_run': run_dir.name,
+        'search_summary': summary
+    })
+
+    version_dir = register_model(model, args.registry)
+    print(f"📦 Modelo {model['version']} publicado en {version_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
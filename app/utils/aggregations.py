@@ -0,0 +1,150 @@
+"""
+Módulo de Agregaciones
+=======================
+Resúmenes estadísticos precalculados en el servidor para las visualizaciones.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+from utils.cache import shared_cache
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MAX_BOX_OUTLIERS = 500  # Máximo de outliers enviados al navegador por grupo
+IQR_FACTOR = 1.5        # Factor de Tukey para los bigotes
+HISTOGRAM_BINS = 50
+
+# Variables que ofrece la pestaña de distribuciones y columnas de la matriz
+# de correlación
+DISTRIBUTION_VARIABLES = ['magnitude', 'depth', 'sig', 'nst', 'dmin', 'gap', 'cdi', 'mmi']
+CORRELATION_COLUMNS = ['magnitude', 'depth', 'sig', 'nst', 'dmin', 'gap',
+                       'cdi', 'mmi', 'Year', 'Month', 'tsunami']
+
+# ============================================================================
+# RESUMEN DE CINCO NÚMEROS (BOX PLOT)
+# ============================================================================
+
+def summarize_box(values: np.ndarray, max_outliers: int = MAX_BOX_OUTLIERS) -> Dict[str, Any]:
+    """
+    Calcula el resumen de cinco números y los outliers de un grupo.
+
+    Los bigotes siguen la convención de Tukey (la misma que usa Plotly):
+    se extienden hasta el dato más extremo dentro de 1.5 × IQR.
+
+    Args:
+        values: Valores numéricos del grupo
+        max_outliers: Máximo de outliers a conservar
+
+    Returns:
+        Dict con q1, median, q3, lowerfence, upperfence, outliers y conteos
+    """
+    values = np.sort(values[~np.isnan(values)])
+    n = len(values)
+
+    if n == 0:
+        return {'n': 0, 'q1': np.nan, 'median': np.nan, 'q3': np.nan,
+                'lowerfence': np.nan, 'upperfence': np.nan,
+                'outliers': np.empty(0), 'n_outliers': 0}
+
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    low_limit = q1 - IQR_FACTOR * iqr
+    high_limit = q3 + IQR_FACTOR * iqr
+
+    # Al estar ordenado, los límites se localizan con búsqueda binaria
+    low_idx = np.searchsorted(values, low_limit, side='left')
+    high_idx = np.searchsorted(values, high_limit, side='right')
+
+    outliers = np.concatenate([values[:low_idx], values[high_idx:]])
+    n_outliers = len(outliers)
+
+    # Muestreo determinista y equiespaciado sobre los outliers ordenados
+    if n_outliers > max_outliers:
+        keep = np.linspace(0, n_outliers - 1, max_outliers).round().astype(int)
+        outliers = outliers[keep]
+
+    return {
+        'n': n,
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'lowerfence': float(values[low_idx]),
+        'upperfence': float(values[high_idx - 1]),
+        'outliers': outliers,
+        'n_outliers': n_outliers
+    }
+
+
+@shared_cache(max_entries=256)
+def get_box_summary(_df: pd.DataFrame, fingerprint: str, variable: str,
+                    group_col: str = 'tsunami',
+                    max_outliers: int = MAX_BOX_OUTLIERS) -> Dict[Any, Dict[str, Any]]:
+    """
+    Resume una variable por grupo para dibujar un box plot precalculado.
+
+    El resultado se cachea por (huella del filtro, variable); el DataFrame
+    no se hashea (prefijo `_`).
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        variable: Columna numérica a resumir
+        group_col: Columna de agrupación
+        max_outliers: Máximo de outliers por grupo
+
+    Returns:
+        Dict {grupo: resumen} ordenado por grupo
+    """
+    values = _df[variable].to_numpy(dtype=float)
+    groups = _df[group_col].to_numpy()
+
+    return {
+        group.item(): summarize_box(values[groups == group], max_outliers)
+        for group in np.unique(groups)
+    }
+
+# ============================================================================
+# HISTOGRAMAS Y CORRELACIONES
+# ============================================================================
+
+@shared_cache(max_entries=256)
+def get_histogram(_df: pd.DataFrame, fingerprint: str, variable: str,
+                  nbins: int = HISTOGRAM_BINS) -> Dict[str, np.ndarray]:
+    """
+    Histograma precalculado de una variable de la vista filtrada.
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        variable: Columna numérica
+        nbins: Número de bins
+
+    Returns:
+        Dict con 'counts', 'edges' y 'centers'
+    """
+    values = _df[variable].to_numpy(dtype=float)
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=nbins)
+    return {'counts': counts, 'edges': edges, 'centers': (edges[:-1] + edges[1:]) / 2}
+
+
+@shared_cache(max_entries=64)
+def get_correlation_matrix(_df: pd.DataFrame, fingerprint: str, columns: Tuple[str, ...],
+                           method: str = 'spearman') -> pd.DataFrame:
+    """
+    Matriz de correlación de la vista filtrada.
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        columns: Columnas a correlacionar (tupla, para que sea hashable)
+        method: Método de `DataFrame.corr`
+
+    Returns:
+        pd.DataFrame con la matriz de correlación
+    """
+    return _df[list(columns)].corr(method=method)
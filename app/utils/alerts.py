@@ -0,0 +1,304 @@
+"""
+Módulo de Niveles de Alerta
+============================
+Definición declarativa de los niveles de alerta de tsunami y su evaluación,
+tanto evento a evento como vectorizada sobre el catálogo completo.
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence
+
+# ============================================================================
+# REGLAS DE ALERTA
+# ============================================================================
+
+# Los niveles se evalúan en orden: cada evento recibe el primero cuyas
+# condiciones cumple. La magnitud es una banda [min_magnitude, max_magnitude)
+# como en la tabla publicada (`max_magnitude=None`: sin límite superior);
+# `ring_of_fire=None` significa "cualquier región".
+ALERT_RULES: List[Dict[str, Any]] = [
+    {
+        'level': 'ROJA',
+        'icon': '🔴',
+        'min_magnitude': 7.5,
+        'max_magnitude': None,
+        'max_depth': 50.0,
+        'ring_of_fire': True,
+        'action': 'Evacuación inmediata de zonas costeras'
+    },
+    {
+        'level': 'NARANJA',
+        'icon': '🟠',
+        'min_magnitude': 7.0,
+        'max_magnitude': 7.5,
+        'max_depth': 70.0,
+        'ring_of_fire': True,
+        'action': 'Alerta y preparación para evacuación'
+    },
+    {
+        'level': 'AMARILLA',
+        'icon': '🟡',
+        'min_magnitude': 6.5,
+        'max_magnitude': 7.0,
+        'max_depth': 70.0,
+        'ring_of_fire': None,
+        'action': 'Monitoreo intensificado'
+    }
+]
+
+DEFAULT_ALERT = {
+    'level': 'VERDE',
+    'icon': '🟢',
+    'action': 'Monitoreo estándar'
+}
+
+ALERT_LEVELS = [rule['level'] for rule in ALERT_RULES] + [DEFAULT_ALERT['level']]
+
+# ============================================================================
+# EVALUACIÓN
+# ============================================================================
+
+def rule_matches(rule: Dict[str, Any], magnitude: float, depth: float,
+                 ring_of_fire: bool) -> bool:
+    """
+    Indica si un evento cumple las condiciones de una regla.
+
+    Args:
+        rule: Regla de `ALERT_RULES`
+        magnitude: Magnitud del evento
+        depth: Profundidad (km)
+        ring_of_fire: Pertenencia al Ring of Fire
+
+    Returns:
+        bool
+    """
+    return (magnitude >= rule['min_magnitude'] and
+            (rule['max_magnitude'] is None or magnitude < rule['max_magnitude']) and
+            depth < rule['max_depth'] and
+            (rule['ring_of_fire'] is None or bool(ring_of_fire) == rule['ring_of_fire']))
+
+
+def classify_alert(magnitude: float, depth: float, ring_of_fire: bool) -> str:
+    """
+    Nivel de alerta de un evento individual.
+
+    Args:
+        magnitude: Magnitud del evento
+        depth: Profundidad (km)
+        ring_of_fire: Pertenencia al Ring of Fire
+
+    Returns:
+        str con el nivel ('ROJA', 'NARANJA', 'AMARILLA' o 'VERDE')
+    """
+    for rule in ALERT_RULES:
+        if rule_matches(rule, magnitude, depth, ring_of_fire):
+            return rule['level']
+    return DEFAULT_ALERT['level']
+
+
+def describe_rule(rule: Dict[str, Any]) -> str:
+    """Condiciones de una regla en texto legible."""
+    if rule['max_magnitude'] is None:
+        magnitude = f"Mag ≥ {rule['min_magnitude']:.1f}"
+    else:
+        magnitude = f"Mag {rule['min_magnitude']:.1f}-{rule['max_magnitude']:.1f}"
+    conditions = [magnitude, f"Depth < {rule['max_depth']:.0f} km"]
+    if rule['ring_of_fire'] is True:
+        conditions.append("Ring of Fire")
+    elif rule['ring_of_fire'] is False:
+        conditions.append("Fuera Ring of Fire")
+    return ', '.join(conditions)
+
+# ============================================================================
+# MOTOR VECTORIZADO
+# ============================================================================
+
+def compile_rules(rules: Sequence[Dict[str, Any]] = ALERT_RULES) -> Dict[str, np.ndarray]:
+    """
+    Compila las reglas a arrays de umbrales para evaluarlas por difusión.
+
+    Args:
+        rules: Reglas en el formato de `ALERT_RULES`
+
+    Returns:
+        Dict con niveles, banda de magnitud (límite superior `inf` si no
+        tiene), umbral de profundidad y requisito de región (-1 = cualquiera,
+        0 = fuera, 1 = dentro del Ring of Fire)
+    """
+    return {
+        'levels': np.array([rule['level'] for rule in rules] + [DEFAULT_ALERT['level']]),
+        'min_magnitude': np.array([rule['min_magnitude'] for rule in rules], dtype=float),
+        'max_magnitude': np.array([np.inf if rule['max_magnitude'] is None else rule['max_magnitude']
+                                   for rule in rules], dtype=float),
+        'max_depth': np.array([rule['max_depth'] for rule in rules], dtype=float),
+        'ring_of_fire': np.array([-1 if rule['ring_of_fire'] is None else int(rule['ring_of_fire'])
+                                  for rule in rules], dtype=np.int8)
+    }
+
+
+COMPILED_RULES = compile_rules()
+
+
+def evaluate_alerts(magnitude: np.ndarray, depth: np.ndarray, ring_of_fire: np.ndarray,
+                    compiled: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    Código de nivel de alerta de cada evento en una sola pasada.
+
+    Todas las reglas se evalúan a la vez como una matriz (eventos × reglas);
+    cada evento toma la primera regla que cumple, o el nivel por defecto.
+
+    Args:
+        magnitude: Magnitudes
+        depth: Profundidades (km)
+        ring_of_fire: Pertenencia al Ring of Fire (0/1 o booleano)
+        compiled: Reglas compiladas (por defecto `ALERT_RULES`)
+
+    Returns:
+        np.ndarray de enteros: índice en `compiled['levels']`
+    """
+    compiled = COMPILED_RULES if compiled is None else compiled
+    magnitude = np.asarray(magnitude, dtype=float)[:, None]
+    depth = np.asarray(depth, dtype=float)[:, None]
+    ring_of_fire = np.asarray(ring_of_fire).astype(np.int8)[:, None]
+
+    matches = ((magnitude >= compiled['min_magnitude']) &
+               (magnitude < compiled['max_magnitude']) &
+               (depth < compiled['max_depth']) &
+               ((compiled['ring_of_fire'] < 0) | (ring_of_fire == compiled['ring_of_fire'])))
+
+    default_code = len(compiled['min_magnitude'])
+    return np.where(matches.any(axis=1), matches.argmax(axis=1), default_code)
+
+
+def alert_confusion(codes: np.ndarray, labels: np.ndarray, n_levels: int) -> Dict[str, np.ndarray]:
+    """
+    Tablas de confusión de los niveles frente a la etiqueta de tsunami.
+
+    Args:
+        codes: Códigos de nivel (ver `evaluate_alerts`)
+        labels: Etiqueta binaria de tsunami
+        n_levels: Número total de niveles (incluido el nivel por defecto)
+
+    Returns:
+        Dict con:
+            'by_level': matriz (n_levels, 2) de eventos por nivel y etiqueta
+            'tp', 'fp', 'fn', 'tn': arrays (n_levels - 1,) para la regla
+            binaria "alerta de este nivel o superior"
+    """
+    labels = np.asarray(labels).astype(np.int64)
+    by_level = np.bincount(codes * 2 + labels, minlength=n_levels * 2).reshape(n_levels, 2)
+
+    tp = np.cumsum(by_level[:-1, 1])
+    fp = np.cumsum(by_level[:-1, 0])
+    total_pos, total_neg = by_level[:, 1].sum(), by_level[:, 0].sum()
+
+    return {
+        'by_level': by_level,
+        'tp': tp,
+        'fp': fp,
+        'fn': total_pos - tp,
+        'tn': total_neg - fp
+    }
+
+# ============================================================================
+# BARRIDO DE UMBRALES
+# ============================================================================
+
+def build_sweep_index(values: np.ndarray, labels: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Ordena una vez los valores y acumula las etiquetas para barrer umbrales.
+
+    Args:
+        values: Variable a barrer (p. ej. magnitud) de los eventos elegibles
+        labels: Etiqueta binaria de tsunami de esos eventos
+
+    Returns:
+        Dict con valores ordenados y suma acumulada de positivos
+    """
+    order = np.argsort(values, kind='mergesort')
+    sorted_labels = np.asarray(labels, dtype=np.int64)[order]
+    return {
+        'values': np.asarray(values, dtype=float)[order],
+        'cum_pos': np.concatenate([[0], np.cumsum(sorted_labels)])
+    }
+
+
+def sweep_threshold(index: Dict[str, np.ndarray], grid: np.ndarray,
+                    direction: str = 'min') -> Dict[str, np.ndarray]:
+    """
+    Eventos disparados y tsunamis capturados para cada umbral de la rejilla.
+
+    Cada umbral cuesta una búsqueda binaria: no se vuelve a recorrer el
+    catálogo.
+
+    Args:
+        index: Índice de `build_sweep_index`
+        grid: Umbrales candidatos
+        direction: 'min' (valor ≥ umbral, p. ej. magnitud) o 'max'
+            (valor < umbral, p. ej. profundidad)
+
+    Returns:
+        Dict con arrays 'triggered' y 'tp' alineados con `grid`
+    """
+    values, cum_pos = index['values'], index['cum_pos']
+    positions = np.searchsorted(values, grid, side='left')
+
+    if direction == 'min':
+        triggered = len(values) - positions
+        tp = cum_pos[-1] - cum_pos[positions]
+    elif direction == 'max':
+        triggered = positions
+        tp = cum_pos[positions]
+    else:
+        raise ValueError(f"Dirección de barrido desconocida: {direction}")
+
+    return {'triggered': triggered, 'tp': tp}
+
+
+def rule_sweep(magnitude: np.ndarray, depth: np.ndarray, ring_of_fire: np.ndarray,
+               labels: np.ndarray, rule_index: int, field: str,
+               grid: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Barre el umbral de magnitud o profundidad de una regla manteniendo fijas
+    sus demás condiciones (incluido el límite superior de su banda de
+    magnitud, si lo tiene).
+
+    Args:
+        magnitude, depth, ring_of_fire: Columnas del catálogo
+        labels: Etiqueta de tsunami
+        rule_index: Índice de la regla en `ALERT_RULES`
+        field: 'min_magnitude' o 'max_depth'
+        grid: Umbrales candidatos
+
+    Returns:
+        Dict con 'triggered', 'tp', 'fp', 'precision' y 'recall' por umbral
+    """
+    rule = ALERT_RULES[rule_index]
+    magnitude = np.asarray(magnitude, dtype=float)
+    depth = np.asarray(depth, dtype=float)
+    labels = np.asarray(labels, dtype=np.int64)
+
+    eligible = np.ones(len(magnitude), dtype=bool)
+    if rule['max_magnitude'] is not None:
+        eligible &= magnitude < rule['max_magnitude']
+    if rule['ring_of_fire'] is not None:
+        eligible &= np.asarray(ring_of_fire).astype(bool) == rule['ring_of_fire']
+
+    if field == 'min_magnitude':
+        eligible &= depth < rule['max_depth']
+        index = build_sweep_index(magnitude[eligible], labels[eligible])
+        result = sweep_threshold(index, grid, 'min')
+    elif field == 'max_depth':
+        eligible &= magnitude >= rule['min_magnitude']
+        index = build_sweep_index(depth[eligible], labels[eligible])
+        result = sweep_threshold(index, grid, 'max')
+    else:
+        raise ValueError(f"Campo de regla desconocido: {field}")
+
+    total_pos = labels.sum()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result['fp'] = result['triggered'] - result['tp']
+        result['precision'] = result['tp'] / result['triggered']
+        result['recall'] = result['tp'] / total_pos if total_pos > 0 else np.zeros(len(grid))
+
+    return result
@@ -0,0 +1,90 @@
+"""
+Módulo de Recursos Estáticos
+=============================
+CSS y bloques HTML/markdown que no dependen de los datos.
+
+Cada bloque se minimiza una sola vez por proceso (memoizado por su texto) y
+se emite siempre idéntico. Streamlit envía los mensajes repetidos de una
+sesión como referencias a su hash en lugar de reenviar el contenido (ver
+`global.minCachedMessageSize` en `.streamlit/config.toml`), así que en cada
+reejecución solo viajan completos los fragmentos que dependen de los datos.
+"""
+
+import re
+import textwrap
+from functools import lru_cache
+
+import streamlit as st
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MAX_STATIC_BLOCKS = 256
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACES = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r':\s+')  # El espacio previo a ":" se conserva (".card :hover")
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+# ============================================================================
+# MINIMIZACIÓN
+# ============================================================================
+
+@lru_cache(maxsize=MAX_STATIC_BLOCKS)
+def minify_css(css: str) -> str:
+    """
+    Minimiza un bloque `<style>`: quita comentarios, espacios sobrantes y el
+    último `;` de cada regla.
+
+    Args:
+        css: CSS (puede incluir las etiquetas <style>)
+
+    Returns:
+        str: CSS minimizado
+    """
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_SPACES.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    css = _CSS_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+@lru_cache(maxsize=MAX_STATIC_BLOCKS)
+def prerender(block: str) -> str:
+    """
+    Prepara un bloque estático HTML/markdown para emitirlo.
+
+    En bloques HTML (empiezan por `<`) se quita la sangría de cada línea; en
+    markdown solo la sangría común, para no romper listas anidadas. En ambos
+    se eliminan espacios finales y líneas en blanco repetidas.
+
+    Args:
+        block: Texto literal del bloque (nunca un f-string con datos)
+
+    Returns:
+        str: Bloque listo para `st.markdown`
+    """
+    block = textwrap.dedent(block).strip()
+    if block.startswith('<'):
+        lines = (line.strip() for line in block.splitlines())
+    else:
+        lines = (line.rstrip() for line in block.splitlines())
+    return _BLANK_LINES.sub('\n\n', '\n'.join(lines))
+
+# ============================================================================
+# RENDERIZADO
+# ============================================================================
+
+def render_static(block: str):
+    """
+    Emite un bloque estático ya preprocesado (ver `prerender`).
+
+    Solo para contenido que no depende de los datos; los fragmentos con datos
+    se siguen emitiendo con `st.markdown`.
+
+    Args:
+        block: Texto literal del bloque
+    """
+    st.markdown(prerender(block), unsafe_allow_html=True)
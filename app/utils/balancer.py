@@ -0,0 +1,209 @@
+"""
+Módulo de Balanceo de Carga
+============================
+Proxy inverso local con sesiones persistentes para el modo multiproceso
+(ver `cluster.py`).
+
+Cada sesión de Streamlit vive en el proceso que mantiene su websocket, así
+que todas las peticiones de un navegador (página, recursos estáticos y
+`/_stcore/stream`) deben llegar siempre al mismo worker, también al
+reconectar. El proxy lee solo la cabecera de cada conexión, elige el worker
+por la cookie de afinidad (o el menos cargado si no hay cookie válida) y a
+partir de ahí copia bytes en ambos sentidos: el upgrade a websocket pasa sin
+interpretarse.
+"""
+
+import asyncio
+import logging
+from http.cookies import SimpleCookie
+from typing import List, Optional, Tuple
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+AFFINITY_COOKIE = 'tsunami_worker'
+HEALTH_PATH = '/_stcore/health'
+HEALTH_INTERVAL_S = 2.0
+HEALTH_TIMEOUT_S = 2.0
+MAX_HEADER_BYTES = 64 * 1024
+PIPE_CHUNK_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+class Worker:
+    """Proceso del panel detrás del proxy."""
+
+    def __init__(self, index: int, host: str, port: int):
+        self.index = index
+        self.host = host
+        self.port = port
+        self.healthy = False
+        self.connections = 0
+
+    def __repr__(self) -> str:
+        state = 'sano' if self.healthy else 'caído'
+        return f"Worker({self.index}, {self.host}:{self.port}, {state}, {self.connections} conexiones)"
+
+
+async def check_health(worker: Worker) -> bool:
+    """Consulta el endpoint de salud de Streamlit del worker."""
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(worker.host, worker.port), HEALTH_TIMEOUT_S)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        writer.write(f"GET {HEALTH_PATH} HTTP/1.0\r\nHost: {worker.host}\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), HEALTH_TIMEOUT_S)
+        return b' 200 ' in status_line
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+
+# ============================================================================
+# PROXY
+# ============================================================================
+
+def _header_value(head: bytes, name: str) -> Optional[str]:
+    """Valor de una cabecera HTTP (sin distinguir mayúsculas) o None."""
+    prefix = name.lower().encode() + b':'
+    for line in head.split(b'\r\n')[1:]:
+        if line.lower().startswith(prefix):
+            return line[len(prefix):].strip().decode('latin-1')
+    return None
+
+
+async def _read_head(reader: asyncio.StreamReader) -> bytes:
+    """Lee una cabecera HTTP completa (hasta la línea en blanco)."""
+    return await reader.readuntil(b'\r\n\r\n')
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Copia bytes de `reader` a `writer` hasta el fin de la conexión."""
+    try:
+        while True:
+            data = await reader.read(PIPE_CHUNK_BYTES)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            writer.close()
+        except RuntimeError:
+            pass
+
+
+class StickyBalancer:
+    """
+    Proxy inverso HTTP/websocket con afinidad por cookie.
+
+    Args:
+        workers: Workers disponibles
+    """
+
+    def __init__(self, workers: List[Worker]):
+        self.workers = workers
+
+    def pick(self, cookie_header: Optional[str]) -> Tuple[Optional[Worker], bool]:
+        """
+        Elige el worker de una conexión.
+
+        Args:
+            cookie_header: Cabecera Cookie de la petición
+
+        Returns:
+            (worker, asignado): `asignado` es True si hay que fijar la cookie
+            (cliente nuevo o su worker está caído). Worker None si no hay
+            ninguno sano.
+        """
+        if cookie_header:
+            cookie = SimpleCookie()
+            try:
+                cookie.load(cookie_header)
+            except Exception:
+                cookie = SimpleCookie()
+            morsel = cookie.get(AFFINITY_COOKIE)
+            if morsel is not None and morsel.value.isdigit():
+                index = int(morsel.value)
+                if index < len(self.workers) and self.workers[index].healthy:
+                    return self.workers[index], False
+
+        healthy = [worker for worker in self.workers if worker.healthy]
+        if not healthy:
+            return None, False
+        return min(healthy, key=lambda worker: worker.connections), True
+
+    async def handle(self, client_reader: asyncio.StreamReader,
+                     client_writer: asyncio.StreamWriter):
+        """Atiende una conexión de cliente."""
+        try:
+            head = await _read_head(client_reader)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            return
+
+        worker, assign = self.pick(_header_value(head, 'Cookie'))
+        if worker is None:
+            client_writer.write(b"HTTP/1.1 503 Service Unavailable\r\n"
+                                b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+            await client_writer.drain()
+            client_writer.close()
+            return
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(worker.host, worker.port)
+        except OSError:
+            worker.healthy = False
+            client_writer.write(b"HTTP/1.1 502 Bad Gateway\r\n"
+                                b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+            await client_writer.drain()
+            client_writer.close()
+            return
+
+        worker.connections += 1
+        try:
+            upstream_writer.write(head)
+            await upstream_writer.drain()
+
+            if assign:
+                # Se fija la afinidad en la primera respuesta de la conexión
+                response_head = await _read_head(upstream_reader)
+                cookie = (f"Set-Cookie: {AFFINITY_COOKIE}={worker.index}; Path=/; "
+                          "HttpOnly; SameSite=Lax\r\n").encode()
+                client_writer.write(response_head[:-2] + cookie + b"\r\n")
+                await client_writer.drain()
+
+            await asyncio.gather(_pipe(client_reader, upstream_writer),
+                                 _pipe(upstream_reader, client_writer))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            upstream_writer.close()
+        finally:
+            worker.connections -= 1
+
+    async def monitor_health(self, interval: float = HEALTH_INTERVAL_S):
+        """Actualiza periódicamente el estado de salud de los workers."""
+        while True:
+            results = await asyncio.gather(*(check_health(worker) for worker in self.workers))
+            for worker, healthy in zip(self.workers, results):
+                if healthy != worker.healthy:
+                    logger.info("Worker %d (%d): %s", worker.index, worker.port,
+                                'disponible' if healthy else 'sin respuesta')
+                worker.healthy = healthy
+            await asyncio.sleep(interval)
+
+    async def serve(self, host: str, port: int):
+        """Arranca el proxy y la comprobación de salud; no retorna."""
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.monitor_health())
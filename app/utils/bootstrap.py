@@ -0,0 +1,98 @@
+"""
+Módulo de Bootstrap
+====================
+Remuestreo bootstrap vectorizado y paralelo para intervalos de confianza.
+"""
+
+import numpy as np
+from typing import Tuple
+
+from utils.parallel import parallel_map
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+DEFAULT_RESAMPLES = 2000
+DEFAULT_SEED = 42
+CHUNK_CELLS = 2_000_000            # Remuestras × filas por bloque (~16 MB)
+PROCESS_POOL_THRESHOLD = 5_000_000  # A partir de aquí se reparte entre procesos
+
+# ============================================================================
+# REMUESTREO
+# ============================================================================
+
+def _bootstrap_means_chunk(values: np.ndarray, mask: np.ndarray, n_resamples: int,
+                           seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Calcula las medias de un bloque de remuestras en una sola operación.
+
+    Cada remuestra se representa como un vector de conteos multinomiales
+    sobre las filas, de modo que todas las medias del bloque salen de un
+    único producto matricial (B × n) · (n × p).
+    """
+    rng = np.random.default_rng(seed)
+    n = values.shape[0]
+    counts = rng.multinomial(n, np.full(n, 1.0 / n), size=n_resamples).astype(float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (counts @ values) / (counts @ mask)
+
+
+def bootstrap_means(values: np.ndarray, n_resamples: int = DEFAULT_RESAMPLES,
+                    seed: int = DEFAULT_SEED) -> np.ndarray:
+    """
+    Distribución bootstrap de la media de cada columna.
+
+    Las remuestras se agrupan en bloques de tamaño acotado; los bloques se
+    reparten entre procesos cuando el trabajo total lo justifica. Los NaN se
+    ignoran columna a columna.
+
+    Args:
+        values: Matriz (n, p) de observaciones
+        n_resamples: Número de remuestras bootstrap
+        seed: Semilla raíz (los bloques usan semillas hijas independientes)
+
+    Returns:
+        np.ndarray: Matriz (n_resamples, p) con las medias remuestreadas
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    n, p = values.shape
+    if n == 0:
+        return np.full((n_resamples, p), np.nan)
+
+    mask = (~np.isnan(values)).astype(float)
+    filled = np.where(mask > 0, values, 0.0)
+
+    chunk_size = max(1, CHUNK_CELLS // n)
+    sizes = [min(chunk_size, n_resamples - start)
+             for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    results = parallel_map(
+        _bootstrap_means_chunk,
+        [(filled, mask, size, child) for size, child in zip(sizes, seeds)],
+        use_processes=n * n_resamples >= PROCESS_POOL_THRESHOLD
+    )
+
+    return np.vstack(results)
+
+
+def percentile_interval(samples: np.ndarray,
+                        confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intervalo percentil a partir de una distribución bootstrap.
+
+    Args:
+        samples: Matriz (B, p) de estadísticos remuestreados
+        confidence: Nivel de confianza
+
+    Returns:
+        Tuple (límite inferior, límite superior), cada uno de longitud p
+    """
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(samples, [alpha, 1 - alpha], axis=0)
+    return low, high
@@ -0,0 +1,291 @@
+"""
+Módulo de Caché Compartida
+===========================
+Caché de resultados en dos niveles para los cálculos del panel:
+
+1. LRU en memoria del proceso (acierto en microsegundos).
+2. Disco local direccionado por contenido: la clave es el hash de la
+   versión del dataset, la función y sus argumentos. Todos los procesos del
+   host comparten el directorio, de modo que un worker recién arrancado
+   sirve resultados ya calculados por otro.
+
+Sigue las convenciones de `st.cache_data`: los parámetros cuyo nombre
+empieza por `_` no forman parte de la clave, y cada acierto devuelve una
+copia nueva (los valores se guardan serializados).
+
+La versión de la clave es la de los datos que recibe la función: el
+cargador la anota en el DataFrame (`attrs[VERSION_ATTR]`) y pandas la
+conserva en las vistas filtradas, así que un cálculo sobre datos ya
+sustituidos nunca se guarda con la versión nueva.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+CACHE_DIR = Path(os.environ.get(
+    'TSUNAMI_CACHE_DIR',
+    Path(__file__).parent.parent.parent / '.cache' / 'results'
+))
+DISK_MAX_BYTES = int(os.environ.get('TSUNAMI_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+DEFAULT_MAX_ENTRIES = 128
+EVICTION_CHECK_BYTES = 16 * 1024 * 1024  # Escrituras acumuladas entre comprobaciones
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+VERSION_ATTR = 'dataset_version'         # Clave de `DataFrame.attrs` con la versión
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# VERSIÓN DEL DATASET
+# ============================================================================
+
+_version_provider: Callable[[], str] = lambda: 'sin-version'
+
+
+def register_version_provider(provider: Callable[[], str]):
+    """
+    Registra la función que devuelve la versión actual del dataset.
+
+    Las entradas de disco se agrupan por versión (un directorio cada una):
+    cuando los datos cambian, los resultados anteriores dejan de encontrarse
+    y `prune_versions` los borra sin tocar los de la versión vigente.
+    """
+    global _version_provider
+    _version_provider = provider
+
+
+def _arguments_version(arguments: Dict[str, Any]) -> Optional[str]:
+    """Versión anotada en el primer argumento que la lleve (ver `VERSION_ATTR`)."""
+    for value in arguments.values():
+        attrs = getattr(value, 'attrs', None)
+        if isinstance(attrs, dict) and attrs.get(VERSION_ATTR):
+            return attrs[VERSION_ATTR]
+    return None
+
+# ============================================================================
+# NIVEL DE DISCO
+# ============================================================================
+
+_written_since_check = 0
+_disk_lock = threading.Lock()
+
+
+def _disk_path(version: str, key: str) -> Path:
+    return CACHE_DIR / version / key[:2] / f"{key}.pkl"
+
+
+def disk_get(version: str, key: str) -> Optional[bytes]:
+    """Lee una entrada del disco; None si no existe o está dañada."""
+    path = _disk_path(version, key)
+    try:
+        payload = path.read_bytes()
+    except (FileNotFoundError, OSError):
+        return None
+    try:
+        os.utime(path)  # Marca de uso reciente para el desalojo
+    except OSError:
+        pass
+    return payload
+
+
+def disk_put(version: str, key: str, payload: bytes):
+    """
+    Escribe una entrada de forma atómica: fichero temporal en el mismo
+    directorio y `os.replace`. Un lector nunca ve un fichero a medias.
+    """
+    global _written_since_check
+    path = _disk_path(version, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.warning("No se pudo escribir en la caché de disco: %s", e)
+        return
+
+    with _disk_lock:
+        _written_since_check += len(payload)
+        should_check = _written_since_check >= EVICTION_CHECK_BYTES
+        if should_check:
+            _written_since_check = 0
+    if should_check:
+        evict_disk()
+
+
+def evict_disk(max_bytes: int = DISK_MAX_BYTES) -> int:
+    """
+    Desaloja las entradas usadas hace más tiempo hasta quedar por debajo
+    del límite de tamaño.
+
+    Otros procesos pueden desalojar a la vez: los ficheros que ya no
+    existen se ignoran.
+
+    Returns:
+        int: Bytes liberados
+    """
+    entries = []
+    total = 0
+    for path in CACHE_DIR.glob('*/*/*.pkl'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    freed = 0
+    if total <= max_bytes:
+        return freed
+
+    for _, size, path in sorted(entries):
+        path.unlink(missing_ok=True)
+        freed += size
+        if total - freed <= max_bytes:
+            break
+    return freed
+
+
+def prune_versions(keep: str) -> int:
+    """
+    Borra del disco los resultados de todas las versiones salvo `keep`.
+
+    Un proceso que siga usando una versión anterior simplemente verá fallos
+    de caché y recalculará.
+
+    Args:
+        keep: Versión vigente del dataset
+
+    Returns:
+        int: Versiones borradas
+    """
+    if not CACHE_DIR.is_dir():
+        return 0
+    pruned = 0
+    for version_dir in CACHE_DIR.iterdir():
+        if version_dir.is_dir() and version_dir.name != keep:
+            shutil.rmtree(version_dir, ignore_errors=True)
+            pruned += 1
+    return pruned
+
+# ============================================================================
+# DECORADOR
+# ============================================================================
+
+def _make_key(version: str, qualname: str, arguments: Dict[str, Any]) -> str:
+    """Clave de contenido: hash de versión, función y argumentos."""
+    hashed = {name: value for name, value in arguments.items() if not name.startswith('_')}
+    try:
+        encoded = pickle.dumps(sorted(hashed.items()), protocol=PICKLE_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        encoded = repr(sorted(hashed.items())).encode('utf-8')
+    return hashlib.sha256(version.encode('utf-8') + b'\0' +
+                          qualname.encode('utf-8') + b'\0' + encoded).hexdigest()
+
+
+def shared_cache(max_entries: int = DEFAULT_MAX_ENTRIES, persist: bool = True):
+    """
+    Decorador de caché en dos niveles (memoria + disco compartido).
+
+    Args:
+        max_entries: Entradas del LRU en memoria de esta función
+        persist: Guardar también en disco
+
+    Returns:
+        Decorador; la función decorada expone `clear()` y `stats`
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+        qualname = f"{fn.__module__}.{fn.__qualname__}"
+        memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        memory_lock = threading.Lock()
+        key_locks: Dict[str, threading.Lock] = {}
+        stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        def _remember(key: str, payload: bytes):
+            with memory_lock:
+                memory[key] = payload
+                memory.move_to_end(key)
+                while len(memory) > max_entries:
+                    memory.popitem(last=False)
+
+        def _load_or_compute(version: str, key: str, args: tuple, kwargs: dict):
+            with memory_lock:
+                payload = memory.get(key)
+            if payload is not None:
+                stats['memory_hits'] += 1
+                return pickle.loads(payload)
+
+            if persist:
+                payload = disk_get(version, key)
+                if payload is not None:
+                    try:
+                        value = pickle.loads(payload)
+                    except Exception:
+                        pass  # Entrada dañada: se recalcula y se sobrescribe
+                    else:
+                        stats['disk_hits'] += 1
+                        _remember(key, payload)
+                        return value
+
+            stats['misses'] += 1
+            value = fn(*args, **kwargs)
+            payload = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+            _remember(key, payload)
+            # Los resultados de una versión ya sustituida (trabajos o sesiones
+            # que siguen con los datos anteriores) no se escriben en disco
+            if persist and version == _version_provider():
+                disk_put(version, key, payload)
+            return value
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            version = _arguments_version(bound.arguments) or _version_provider()
+            key = _make_key(version, qualname, bound.arguments)
+
+            with memory_lock:
+                payload = memory.get(key)
+                if payload is not None:
+                    memory.move_to_end(key)
+                    stats['memory_hits'] += 1
+                    return pickle.loads(payload)
+                key_lock = key_locks.setdefault(key, threading.Lock())
+
+            # Un solo cálculo por clave y proceso: el resto espera el resultado
+            try:
+                with key_lock:
+                    return _load_or_compute(version, key, args, kwargs)
+            finally:
+                with memory_lock:
+                    key_locks.pop(key, None)
+
+        def clear():
+            """Vacía el nivel en memoria de esta función."""
+            with memory_lock:
+                memory.clear()
+
+        wrapper.clear = clear
+        wrapper.stats = stats
+        return wrapper
+
+    return decorator
@@ -0,0 +1,43 @@
+"""
+Módulo de Cancelación Cooperativa
+==================================
+Puntos de control para que una ejecución del script que ya ha quedado
+obsoleta (el usuario ha vuelto a interactuar) se detenga cuanto antes en
+lugar de terminar todos sus cálculos.
+
+Streamlit solo comprueba si hay una nueva ejecución pendiente cuando el
+script emite un elemento; entre cálculos largos sin elementos la ejecución
+obsoleta seguiría hasta el final. `rerun_checkpoint` hace esa comprobación
+explícitamente.
+"""
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# ============================================================================
+# PUNTOS DE CONTROL
+# ============================================================================
+
+def rerun_checkpoint():
+    """
+    Detiene la ejecución actual si hay otra pendiente para la sesión.
+
+    Fuera de una ejecución del script (hilos de trabajo, procesos offline)
+    no hace nada. Con Streamlit reciente delega en la comprobación nativa
+    del ejecutor, que relanza el script con los nuevos valores; en versiones
+    anteriores detiene la ejecución y el ejecutor atiende a continuación la
+    petición pendiente.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+
+    yield_check = getattr(ctx, 'yield_check', None)
+    if yield_check is not None:
+        yield_check()
+        return
+
+    requests = getattr(ctx, 'script_requests', None)
+    state = getattr(requests, '_state', None)
+    if state is not None and state.name in ('RERUN', 'STOP'):
+        st.stop()
@@ -1,29 +1,101 @@
 """
 Módulo de Carga y Filtrado de Datos
 ====================================
-Funciones para cargar, validar y filtrar datos sísmicos.
+Funciones para cargar, validar y filtrar datos sísmicos en el panel (cachés
+de Streamlit sobre `utils/dataset.py` y `utils/query.py`).
 """
 
+import os
 import pandas as pd
 import streamlit as st
-from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
+
+from utils.cache import VERSION_ATTR, prune_versions, register_version_provider, shared_cache
+# Lectura, versión y huella viven en `utils/dataset.py` (sin Streamlit); se
+# reexportan aquí para el resto del panel
+from utils.dataset import (
+    DATA_PATH, SCHEMA_VERSION, HIGH_MAGNITUDE_THRESHOLD, SHALLOW_DEPTH_KM,
+    read_events, get_dataset_version, get_data_fingerprint
+)
+from utils.query import QueryEngine, freeze_filters
+from utils.store import build_store, open_store, prune_stores
 
 # ============================================================================
 # CONSTANTES
 # ============================================================================
 
-DATA_PATH = Path(__file__).parent.parent.parent / "data" / "earthquake_data_tsunami.csv"
+# Modo multiproceso (ver `cluster.py`): el dataset se abre desde el almacén
+# columnar compartido en lugar de leer el CSV en cada proceso
+SHARED_STORE = os.environ.get('TSUNAMI_SHARED_STORE') == '1'
+
+_cache_version: Optional[str] = None
 
 # ============================================================================
 # CARGA DE DATOS
 # ============================================================================
 
-@st.cache_data(ttl=3600)  # Cache por 1 hora
+def _current_cache_version() -> str:
+    """
+    Versión que usan las claves de la caché compartida. Al detectar una
+    versión nueva se borran del disco los resultados de las anteriores.
+    """
+    global _cache_version
+    version = get_dataset_version()
+    if version != _cache_version:
+        _cache_version = version
+        prune_versions(keep=version)
+        if SHARED_STORE:
+            prune_stores(keep=version)
+    return version
+
+
+register_version_provider(_current_cache_version)
+
+
+def _stamp_version(df: pd.DataFrame, version: str) -> pd.DataFrame:
+    """Anota la versión en el DataFrame; las claves de la caché la toman de ahí."""
+    df.attrs[VERSION_ATTR] = version
+    return df
+
+
+@st.cache_data(max_entries=2)
+def _load_version(version: str) -> pd.DataFrame:
+    """Lectura cacheada por versión del dataset (ver `load_data`)."""
+    df = read_events(DATA_PATH)
+    if get_dataset_version() != version:
+        return df  # El CSV cambió durante la lectura: sin versión anotada
+    return _stamp_version(df, version)
+
+
+@st.cache_resource(max_entries=2)
+def _open_shared_version(version: str) -> pd.DataFrame:
+    """
+    Dataset de una versión desde el almacén compartido (solo lectura).
+    
+    Se cachea como recurso: todas las sesiones del proceso usan el mismo
+    DataFrame respaldado por `mmap`, sin copias por sesión.
+    """
+    try:
+        return _stamp_version(open_store(version), version)
+    except FileNotFoundError:
+        df = read_events(DATA_PATH)
+        if get_dataset_version() != version:
+            return df  # El CSV cambió durante la lectura: no se publica
+        build_store(df, version)
+        return _stamp_version(open_store(version), version)
+
+
 def load_data() -> pd.DataFrame:
     """
     Carga y prepara el dataset de terremotos.
     
+    La caché se indexa por versión del dataset en lugar de por tiempo: un
+    CSV actualizado se usa en la siguiente ejecución y, mientras no cambie,
+    nunca se vuelve a leer. La versión queda anotada en el DataFrame
+    (`attrs[VERSION_ATTR]`) y viaja con sus vistas filtradas hasta las
+    claves de la caché compartida. En modo multiproceso (`SHARED_STORE`) los workers
+    comparten el almacén columnar en lugar de tener cada uno su copia.
+    
     Returns:
         pd.DataFrame: DataFrame con datos sísmicos procesados
         
@@ -31,114 +103,83 @@ def load_data() -> pd.DataFrame:
         FileNotFoundError: Si el archivo de datos no existe
         ValueError: Si los datos no tienen el formato esperado
     """
-    try:
-        # Cargar datos
-        df = pd.read_csv(DATA_PATH)
-        
-        # Validar columnas requeridas
-        required_cols = ['magnitude', 'depth', 'latitude', 'longitude', 
-                        'tsunami', 'Year', 'Month', 'sig']
-        
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            raise ValueError(f"Faltan columnas requeridas: {missing_cols}")
-        
-        # Crear columnas derivadas útiles
-        df['shallow'] = (df['depth'] < 70).astype(int)
-        df['high_magnitude'] = (df['magnitude'] >= 7.0).astype(int)
-        df['ring_of_fire'] = ((df['latitude'].abs() > 10) & 
-                              ((df['longitude'].between(120, -60)) | 
-                               (df['longitude'].between(-180, -60)))).astype(int)
-        
-        # Crear categorías de magnitud
-        df['mag_category'] = pd.cut(
-            df['magnitude'],
-            bins=[0, 6.5, 7.0, 7.5, 10],
-            labels=['Moderado', 'Alto', 'Muy Alto', 'Extremo']
-        )
-        
-        # Crear categorías de profundidad
-        df['depth_category'] = pd.cut(
-            df['depth'],
-            bins=[-1, 70, 300, 700],
-            labels=['Superficial (<70km)', 'Intermedio (70-300km)', 'Profundo (>300km)']
-        )
-        
-        # Limpiar valores nulos en columnas críticas
-        df['cdi'] = df['cdi'].fillna(0)
-        df['mmi'] = df['mmi'].fillna(0)
-        
-        return df
-        
-    except FileNotFoundError:
-        raise FileNotFoundError(
-            f"No se encontró el archivo de datos en: {DATA_PATH}\n"
-            "Verifica que el archivo earthquake_data_tsunami.csv esté en la carpeta data/"
-        )
-    except Exception as e:
-        raise Exception(f"Error al cargar los datos: {str(e)}")
+    version = _current_cache_version()
+    if SHARED_STORE:
+        return _open_shared_version(version)
+    return _load_version(version)
 
 # ============================================================================
 # FILTRADO DE DATOS
 # ============================================================================
 
-def get_filtered_data(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
+def get_data_version(df: pd.DataFrame) -> str:
     """
-    Aplica filtros al DataFrame según las selecciones del usuario.
+    Versión del dataset de la que proceden los datos.
     
     Args:
-        df: DataFrame original
-        filters: Diccionario con configuraciones de filtros
+        df: Catálogo o vista filtrada
         
     Returns:
-        pd.DataFrame: DataFrame filtrado
+        str: Versión anotada por el cargador o, si no la lleva, la vigente
     """
-    df_filtered = df.copy()
-    
-    # Filtro por rango de años
-    if 'year_range' in filters:
-        year_min, year_max = filters['year_range']
-        df_filtered = df_filtered[
-            (df_filtered['Year'] >= year_min) & 
-            (df_filtered['Year'] <= year_max)
-        ]
-    
-    # Filtro por rango de magnitud
-    if 'magnitude_range' in filters:
-        mag_min, mag_max = filters['magnitude_range']
-        df_filtered = df_filtered[
-            (df_filtered['magnitude'] >= mag_min) & 
-            (df_filtered['magnitude'] <= mag_max)
-        ]
-    
-    # Filtro por rango de profundidad
-    if 'depth_range' in filters:
-        depth_min, depth_max = filters['depth_range']
-        df_filtered = df_filtered[
-            (df_filtered['depth'] >= depth_min) & 
-            (df_filtered['depth'] <= depth_max)
-        ]
+    return df.attrs.get(VERSION_ATTR) or get_dataset_version()
+
+
+@st.cache_resource(max_entries=4)
+def _get_engine(_df: pd.DataFrame, version: str, fingerprint: str) -> QueryEngine:
+    """
+    Motor de consultas del catálogo, compartido por las sesiones del proceso.
     
-    # Filtro por tsunami
-    if 'tsunami_filter' in filters:
-        if filters['tsunami_filter'] == 'Solo con Tsunami':
-            df_filtered = df_filtered[df_filtered['tsunami'] == 1]
-        elif filters['tsunami_filter'] == 'Solo sin Tsunami':
-            df_filtered = df_filtered[df_filtered['tsunami'] == 0]
-        # Si es 'Todos', no se filtra
+    La clave incluye la versión del dataset: un CSV nuevo con las mismas
+    filas tiene la misma huella, pero no los mismos índices ni selecciones.
+    """
+    return QueryEngine(_df, fingerprint)
+
+
+@shared_cache(max_entries=256)
+def get_filtered_index(_df: pd.DataFrame, fingerprint: str, filters_key: tuple,
+                       _filters: Optional[Dict[str, Any]] = None,
+                       _checkpoint: Optional[Callable[[], None]] = None) -> pd.Index:
+    """
+    Índice de las filas que cumplen los filtros.
     
-    # Filtro por región (Ring of Fire)
-    if 'region_filter' in filters:
-        if filters['region_filter'] == 'Solo Ring of Fire':
-            df_filtered = df_filtered[df_filtered['ring_of_fire'] == 1]
-        elif filters['region_filter'] == 'Fuera Ring of Fire':
-            df_filtered = df_filtered[df_filtered['ring_of_fire'] == 0]
+    Args:
+        _df: DataFrame original
+        fingerprint: Huella del DataFrame original
+        filters_key: Filtros congelados (ver `freeze_filters`)
+        _filters: Filtros originales (no forman parte de la clave)
+        _checkpoint: Punto de control entre filtros (no forma parte de la clave)
+        
+    Returns:
+        pd.Index: Índice de las filas filtradas
+    """
+    filters = _filters if _filters is not None else dict(filters_key)
+    return _get_engine(_df, get_data_version(_df), fingerprint).select_index(filters, _checkpoint)
+
+
+def get_filtered_data(df: pd.DataFrame, filters: Dict[str, Any],
+                      checkpoint: Optional[Callable[[], None]] = None) -> pd.DataFrame:
+    """
+    Aplica filtros al DataFrame según las selecciones del usuario.
     
-    # Filtro por meses
-    if 'months' in filters and filters['months']:
-        df_filtered = df_filtered[df_filtered['Month'].isin(filters['months'])]
+    El filtrado lo resuelve el motor de consultas (`utils/query.py`), el
+    mismo que usan los notebooks y procesos por lotes. El índice resultante
+    se guarda en la caché compartida: una combinación de filtros ya vista
+    por cualquier sesión o proceso no se recalcula.
     
-    return df_filtered
+    Args:
+        df: DataFrame original
+        filters: Diccionario con configuraciones de filtros
+        checkpoint: Punto de control que se invoca entre filtros; puede
+            lanzar una excepción para abandonar un filtrado obsoleto (ver
+            `utils.cancellation.rerun_checkpoint`)
+        
+    Returns:
+        pd.DataFrame: DataFrame filtrado
+    """
+    fingerprint = get_data_fingerprint(df)
+    index = get_filtered_index(df, fingerprint, freeze_filters(filters), filters, checkpoint)
+    return df.loc[index]
 
 # ============================================================================
 # ESTADÍSTICAS DE DATOS
@@ -0,0 +1,152 @@
+"""
+Módulo del Dataset
+===================
+Lectura, versión y huella del catálogo de terremotos, sin dependencias de
+Streamlit: lo comparten el panel (`utils/data_loader.py`), la capa de
+consultas (`utils/query.py`) y los procesos offline.
+"""
+
+import hashlib
+import pandas as pd
+from pathlib import Path
+from typing import Dict
+
+from utils.regions import in_ring_of_fire
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+DATA_PATH = Path(__file__).parent.parent.parent / "data" / "earthquake_data_tsunami.csv"
+
+# Incrementar al cambiar columnas derivadas o tipos en `read_events`: forma
+# parte de la versión del dataset e invalida los resultados cacheados
+SCHEMA_VERSION = 1
+
+_version_memo: Dict[Path, tuple] = {}  # Ruta -> ((mtime, tamaño), versión)
+
+# Umbrales recomendados de alerta (ver el explorador de umbrales)
+HIGH_MAGNITUDE_THRESHOLD = 7.0
+SHALLOW_DEPTH_KM = 70.0
+
+# ============================================================================
+# LECTURA Y VERSIÓN
+# ============================================================================
+
+def read_events(path: Path = DATA_PATH) -> pd.DataFrame:
+    """
+    Lee y prepara el dataset de terremotos sin depender de Streamlit.
+    
+    Lo usan tanto `load_data` (cacheado en el panel) como los procesos
+    offline, p. ej. el pipeline de entrenamiento.
+    
+    Args:
+        path: Ruta del CSV
+        
+    Returns:
+        pd.DataFrame: DataFrame con datos sísmicos procesados
+        
+    Raises:
+        FileNotFoundError: Si el archivo de datos no existe
+        ValueError: Si los datos no tienen el formato esperado
+    """
+    try:
+        # Cargar datos
+        df = pd.read_csv(path)
+        
+        # Validar columnas requeridas
+        required_cols = ['magnitude', 'depth', 'latitude', 'longitude', 
+                        'tsunami', 'Year', 'Month', 'sig']
+        
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Faltan columnas requeridas: {missing_cols}")
+        
+        # Crear columnas derivadas útiles
+        # El catálogo solo tiene año y mes: cada evento se fecha a mitad de mes
+        df['event_time'] = pd.to_datetime(
+            pd.DataFrame({'year': df['Year'], 'month': df['Month'], 'day': 15})
+        )
+        df['shallow'] = (df['depth'] < SHALLOW_DEPTH_KM).astype(int)
+        df['high_magnitude'] = (df['magnitude'] >= HIGH_MAGNITUDE_THRESHOLD).astype(int)
+        df['ring_of_fire'] = in_ring_of_fire(df['latitude'], df['longitude']).astype(int)
+        
+        # Crear categorías de magnitud
+        df['mag_category'] = pd.cut(
+            df['magnitude'],
+            bins=[0, 6.5, 7.0, 7.5, 10],
+            labels=['Moderado', 'Alto', 'Muy Alto', 'Extremo']
+        )
+        
+        # Crear categorías de profundidad
+        df['depth_category'] = pd.cut(
+            df['depth'],
+            bins=[-1, 70, 300, 700],
+            labels=['Superficial (<70km)', 'Intermedio (70-300km)', 'Profundo (>300km)']
+        )
+        
+        # Limpiar valores nulos en columnas críticas
+        df['cdi'] = df['cdi'].fillna(0)
+        df['mmi'] = df['mmi'].fillna(0)
+        
+        return df
+        
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"No se encontró el archivo de datos en: {path}\n"
+            "Verifica que el archivo earthquake_data_tsunami.csv esté en la carpeta data/"
+        )
+    except Exception as e:
+        raise Exception(f"Error al cargar los datos: {str(e)}")
+
+
+def get_dataset_version(path: Path = DATA_PATH) -> str:
+    """
+    Versión del dataset: hash del contenido del CSV más `SCHEMA_VERSION`.
+    
+    El hash solo se recalcula cuando cambian la fecha de modificación o el
+    tamaño del fichero; el resto de llamadas cuestan un `stat`.
+    
+    Args:
+        path: Ruta del CSV
+        
+    Returns:
+        str: Versión, p. ej. 'v1-3f2a9c01d4e5b6a7'
+        
+    Raises:
+        FileNotFoundError: Si el archivo de datos no existe
+    """
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    memo = _version_memo.get(path)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    version = f"v{SCHEMA_VERSION}-{digest.hexdigest()[:16]}"
+    _version_memo[path] = (stamp, version)
+    return version
+
+# ============================================================================
+# HUELLA
+# ============================================================================
+
+def get_data_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Calcula una huella del subconjunto filtrado a partir de su índice.
+    
+    Los filtros conservan el índice original del dataset, por lo que dos
+    vistas con las mismas filas comparten huella. Se usa como clave de caché
+    barata en lugar de hashear el DataFrame completo.
+    
+    Args:
+        df: DataFrame (normalmente filtrado)
+        
+    Returns:
+        str: Huella hexadecimal del subconjunto
+    """
+    index_values = df.index.to_numpy(dtype='int64', copy=False)
+    return hashlib.sha1(index_values.tobytes()).hexdigest()
@@ -0,0 +1,250 @@
+"""
+Módulo de Declustering
+=======================
+Separación de eventos principales y réplicas con ventanas espacio-temporales
+de Gardner-Knopoff (1974).
+
+En lugar de comparar todos los pares de eventos, los eventos se indexan en
+una rejilla espacial de celdas de 1° ordenadas por tiempo: cada evento solo
+examina las celdas vecinas que cubre su ventana y, dentro de ellas, el tramo
+temporal que localiza una búsqueda binaria.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+from utils.cache import shared_cache
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.195
+CELL_SIZE_DEG = 1.0
+DAYS_PER_MONTH = 365.25 / 12
+CHUNK_EVENTS = 50_000
+
+# El catálogo solo tiene año y mes: cada evento se sitúa a mitad de mes
+MID_MONTH_DAY = 14.0
+
+# ============================================================================
+# VENTANAS DE GARDNER-KNOPOFF
+# ============================================================================
+
+def gk_distance_window(magnitude: np.ndarray) -> np.ndarray:
+    """Radio de la ventana espacial (km): 10^(0.1238·M + 0.983)."""
+    return 10 ** (0.1238 * np.asarray(magnitude, dtype=float) + 0.983)
+
+
+def gk_time_window(magnitude: np.ndarray) -> np.ndarray:
+    """
+    Duración de la ventana temporal (días).
+
+    10^(0.032·M + 2.7389) para M ≥ 6.5 y 10^(0.5409·M - 0.547) por debajo.
+    """
+    magnitude = np.asarray(magnitude, dtype=float)
+    return np.where(magnitude >= 6.5,
+                    10 ** (0.032 * magnitude + 2.7389),
+                    10 ** (0.5409 * magnitude - 0.547))
+
+
+def event_days(year: np.ndarray, month: np.ndarray) -> np.ndarray:
+    """Tiempo de cada evento en días desde el año 0, a mitad de mes."""
+    months = np.asarray(year, dtype=float) * 12 + (np.asarray(month, dtype=float) - 1)
+    return months * DAYS_PER_MONTH + MID_MONTH_DAY
+
+
+def haversine_km(lat1: np.ndarray, lon1: np.ndarray,
+                 lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Distancia de círculo máximo (km) entre pares de puntos (con difusión)."""
+    lat1, lon1 = np.radians(lat1), np.radians(lon1)
+    lat2, lon2 = np.radians(lat2), np.radians(lon2)
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+# ============================================================================
+# DECLUSTERING
+# ============================================================================
+
+def _candidate_pairs(chunk: np.ndarray, latitude: np.ndarray, longitude: np.ndarray,
+                     rank: np.ndarray, distance_window: np.ndarray, t_min: np.ndarray,
+                     t_max: np.ndarray, index: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Pares (i, j) de un bloque de eventos i: j cae en la ventana de i y va
+    después de i en el orden de magnitud descendente.
+
+    Cada evento se expande a las celdas vecinas que cubre su radio; en cada
+    celda, dos búsquedas binarias sobre la clave (celda, tiempo) delimitan
+    el tramo temporal de candidatos.
+    """
+    lat_reach, lon_reach = index['lat_reach'][chunk], index['lon_reach'][chunk]
+    n_lat_cells, n_lon_cells = index['n_lat_cells'], index['n_lon_cells']
+
+    # Expansión evento → celdas vecinas
+    lon_span = 2 * lon_reach + 1
+    n_cells = (2 * lat_reach + 1) * lon_span
+    owner = np.repeat(chunk, n_cells)
+    local = np.arange(n_cells.sum()) - np.repeat(np.cumsum(n_cells) - n_cells, n_cells)
+    span = np.repeat(lon_span, n_cells)
+
+    target_lat = index['lat_cell'][owner] + local // span - np.repeat(lat_reach, n_cells)
+    target_lon = (index['lon_cell'][owner] + local % span - np.repeat(lon_reach, n_cells)) % n_lon_cells
+    inside = (target_lat >= 0) & (target_lat < n_lat_cells)
+    owner = owner[inside]
+    target = (target_lat[inside] * n_lon_cells + target_lon[inside]) * index['stride']
+
+    # Tramo temporal de cada celda vecina
+    lo = np.searchsorted(index['keys'], target + t_min[owner], side='left')
+    hi = np.searchsorted(index['keys'], target + t_max[owner], side='right')
+    counts = hi - lo
+
+    # Expansión celda → eventos candidatos
+    first = np.repeat(owner, counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = index['order'][np.repeat(lo, counts) + position]
+
+    later = rank[second] > rank[first]
+    first, second = first[later], second[later]
+    near = haversine_km(latitude[first], longitude[first],
+                        latitude[second], longitude[second]) <= distance_window[first]
+    return np.stack([first[near], second[near]])
+
+
+def decluster_gardner_knopoff(magnitude: np.ndarray, latitude: np.ndarray,
+                              longitude: np.ndarray, days: np.ndarray,
+                              window_scale: float = 1.0,
+                              foreshock_ratio: float = 0.0,
+                              chunk_size: int = CHUNK_EVENTS) -> Dict[str, np.ndarray]:
+    """
+    Declustering de Gardner-Knopoff con índice espacial y barrido temporal.
+
+    Equivale al algoritmo secuencial clásico: los eventos se recorren por
+    magnitud descendente y cada evento aún sin asignar se declara principal
+    y reclama como réplicas los eventos sin asignar posteriores en ese orden
+    que caen en su ventana (distancia ≤ L(M) y tiempo en
+    [t - foreshock_ratio·T(M), t + T(M)]).
+
+    Se resuelve en dos fases vectorizadas: primero se generan los pares
+    (reclamante, candidato) con la rejilla espacial y, después, se decide el
+    estado de los eventos por rondas: un evento es réplica si le reclama un
+    principal y es principal si todos sus reclamantes son réplicas.
+
+    Args:
+        magnitude: Magnitudes
+        latitude: Latitudes (grados)
+        longitude: Longitudes (grados)
+        days: Tiempo de cada evento en días (ver `event_days`)
+        window_scale: Factor aplicado a ambas ventanas
+        foreshock_ratio: Fracción de la ventana temporal aplicada hacia atrás
+        chunk_size: Eventos por bloque al generar pares (acota la memoria)
+
+    Returns:
+        Dict con:
+            'mainshock': array booleano (True = evento principal)
+            'cluster': índice del evento principal de cada evento
+    """
+    magnitude = np.asarray(magnitude, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+    days = np.asarray(days, dtype=float)
+    n = len(magnitude)
+
+    if n == 0:
+        return {'mainshock': np.zeros(0, dtype=bool), 'cluster': np.zeros(0, dtype=np.int64)}
+
+    distance_window = gk_distance_window(magnitude) * window_scale
+    time_window = gk_time_window(magnitude) * window_scale
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(-magnitude, kind='mergesort')] = np.arange(n)
+
+    # Rejilla espacial con clave (celda, tiempo) ordenada
+    n_lon_cells = int(round(360 / CELL_SIZE_DEG))
+    n_lat_cells = int(round(180 / CELL_SIZE_DEG))
+    lat_cell = np.clip(((latitude + 90) // CELL_SIZE_DEG).astype(np.int64), 0, n_lat_cells - 1)
+    lon_cell = ((longitude + 180) // CELL_SIZE_DEG).astype(np.int64) % n_lon_cells
+
+    relative_days = days - days.min()
+    stride = float(relative_days.max()) + 1.0
+    keys = (lat_cell * n_lon_cells + lon_cell) * stride + relative_days
+    order = np.argsort(keys, kind='mergesort')
+
+    radius_deg = distance_window / KM_PER_DEGREE
+    cos_lat = np.maximum(np.cos(np.radians(np.minimum(np.abs(latitude) + radius_deg, 90.0))), 1e-6)
+    index = {
+        'keys': keys[order],
+        'order': order,
+        'stride': stride,
+        'lat_cell': lat_cell,
+        'lon_cell': lon_cell,
+        'n_lat_cells': n_lat_cells,
+        'n_lon_cells': n_lon_cells,
+        'lat_reach': np.ceil(radius_deg / CELL_SIZE_DEG).astype(np.int64),
+        'lon_reach': np.minimum(np.ceil(radius_deg / cos_lat / CELL_SIZE_DEG),
+                                n_lon_cells // 2).astype(np.int64)
+    }
+
+    # La ventana se recorta al rango de la clave para no invadir otra celda
+    t_min = np.clip(relative_days - foreshock_ratio * time_window, 0, stride - 1)
+    t_max = np.clip(relative_days + time_window, 0, stride - 1)
+
+    pairs = np.concatenate([
+        _candidate_pairs(np.arange(start, min(start + chunk_size, n)), latitude, longitude,
+                         rank, distance_window, t_min, t_max, index)
+        for start in range(0, n, chunk_size)
+    ], axis=1)
+    claimer, claimed = pairs
+
+    # Resolución por rondas: 0 = sin decidir, 1 = principal, 2 = réplica.
+    # Cada ronda decide al menos el evento sin decidir de menor rango.
+    state = np.zeros(n, dtype=np.int8)
+    while True:
+        undecided = state == 0
+        if not undecided.any():
+            break
+
+        claimed_by_main = np.zeros(n, dtype=bool)
+        claimed_by_main[claimed[state[claimer] == 1]] = True
+        open_claims = np.bincount(claimed[state[claimer] != 2], minlength=n)
+
+        state[undecided & claimed_by_main] = 2
+        state[undecided & ~claimed_by_main & (open_claims == 0)] = 1
+
+    # Cada réplica pertenece al principal de menor rango que la reclama
+    cluster = np.arange(n, dtype=np.int64)
+    from_main = state[claimer] == 1
+    main_claimer, main_claimed = claimer[from_main], claimed[from_main]
+    first_claim = np.lexsort((rank[main_claimer], main_claimed))
+    main_claimed, main_claimer = main_claimed[first_claim], main_claimer[first_claim]
+    is_first = np.ones(len(main_claimed), dtype=bool)
+    is_first[1:] = main_claimed[1:] != main_claimed[:-1]
+    cluster[main_claimed[is_first]] = main_claimer[is_first]
+
+    return {'mainshock': state == 1, 'cluster': cluster}
+
+
+@shared_cache(max_entries=16)
+def get_mainshock_mask(_df: pd.DataFrame, fingerprint: str,
+                       window_scale: float = 1.0) -> pd.Series:
+    """
+    Máscara de eventos principales del catálogo, cacheada por parámetros.
+
+    Args:
+        _df: Catálogo completo (el declustering no depende de los filtros)
+        fingerprint: Huella del catálogo (ver `get_data_fingerprint`)
+        window_scale: Factor aplicado a las ventanas de Gardner-Knopoff
+
+    Returns:
+        pd.Series booleana alineada con el índice del catálogo
+    """
+    result = decluster_gardner_knopoff(
+        _df['magnitude'].to_numpy(),
+        _df['latitude'].to_numpy(),
+        _df['longitude'].to_numpy(),
+        event_days(_df['Year'].to_numpy(), _df['Month'].to_numpy()),
+        window_scale=window_scale
+    )
+    return pd.Series(result['mainshock'], index=_df.index, name='mainshock')
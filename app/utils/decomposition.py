@@ -0,0 +1,220 @@
+"""
+Módulo de Descomposición Temporal
+==================================
+Descomposición tendencia/estacionalidad/residuo y detección de puntos de
+cambio sobre series mensuales.
+
+Trabaja sobre los conteos agregados Año × Mes (a lo sumo unos cientos de
+puntos), de modo que su coste no depende del tamaño del catálogo. Los
+resultados se memorizan por serie de entrada.
+"""
+
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+PERIOD = 12
+DECOMPOSITION_ITERATIONS = 2
+MIN_SEGMENT_MONTHS = 12
+MAX_CHANGE_POINTS = 5
+
+# ============================================================================
+# AGREGACIÓN
+# ============================================================================
+
+def monthly_series(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Eventos y tsunamis por mes en todo el período de la vista, incluidos
+    los meses sin eventos.
+
+    Args:
+        df: DataFrame filtrado
+
+    Returns:
+        Dict con 'start_year' y tuplas 'events' y 'tsunamis' (hashables,
+        para memorizar la descomposición)
+    """
+    year = df['Year'].to_numpy(dtype=np.int64)
+    start_year = int(year.min())
+    month_idx = (year - start_year) * 12 + df['Month'].to_numpy(dtype=np.int64) - 1
+    n_months = (int(year.max()) - start_year + 1) * 12
+
+    events = np.bincount(month_idx, minlength=n_months)
+    tsunamis = np.bincount(month_idx, weights=df['tsunami'].to_numpy(dtype=float),
+                           minlength=n_months)
+    return {
+        'start_year': start_year,
+        'events': tuple(events.tolist()),
+        'tsunamis': tuple(tsunamis.astype(np.int64).tolist())
+    }
+
+# ============================================================================
+# DESCOMPOSICIÓN
+# ============================================================================
+
+def centered_moving_average(values: np.ndarray, period: int = PERIOD) -> np.ndarray:
+    """
+    Media móvil centrada 2×period, ignorando NaN.
+
+    En los extremos y alrededor de huecos promedia los valores disponibles
+    de la ventana, en lugar de dejar la tendencia sin definir.
+    """
+    weights = np.ones(period + 1)
+    if period % 2 == 0:
+        weights[[0, -1]] = 0.5
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    numerator = np.convolve(filled, weights, mode='same')
+    denominator = np.convolve(valid.astype(float), weights, mode='same')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def decompose(values: np.ndarray, period: int = PERIOD,
+              iterations: int = DECOMPOSITION_ITERATIONS) -> Dict[str, np.ndarray]:
+    """
+    Descomposición aditiva estilo STL: tendencia y estacionalidad se
+    reestiman alternativamente sobre la serie sin la otra componente.
+
+    Args:
+        values: Serie mensual (puede contener NaN)
+        period: Longitud del ciclo estacional
+        iterations: Pasadas tendencia ↔ estacionalidad
+
+    Returns:
+        Dict con 'trend', 'seasonal', 'residual' y 'seasonal_strength'
+        (0 = sin estacionalidad, 1 = dominada por la estacionalidad)
+    """
+    values = np.asarray(values, dtype=float)
+    phase = np.arange(len(values)) % period
+    seasonal = np.zeros(len(values))
+
+    for _ in range(iterations):
+        trend = centered_moving_average(values - seasonal, period)
+        detrended = values - trend
+        valid = ~np.isnan(detrended)
+        sums = np.bincount(phase[valid], weights=detrended[valid], minlength=period)
+        counts = np.bincount(phase[valid], minlength=period)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            profile = np.where(counts > 0, sums / counts, 0.0)
+        seasonal = (profile - profile.mean())[phase]
+
+    trend = centered_moving_average(values - seasonal, period)
+    residual = values - trend - seasonal
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        strength = 1 - np.nanvar(residual) / np.nanvar(seasonal + residual)
+
+    return {
+        'trend': trend,
+        'seasonal': seasonal,
+        'residual': residual,
+        'seasonal_strength': float(np.clip(strength, 0, 1)) if np.isfinite(strength) else 0.0
+    }
+
+# ============================================================================
+# PUNTOS DE CAMBIO
+# ============================================================================
+
+def _segment_sse(cum: np.ndarray, cum_sq: np.ndarray, start, end) -> np.ndarray:
+    """Suma de cuadrados respecto a la media de los segmentos [start, end)."""
+    total = cum[end] - cum[start]
+    return (cum_sq[end] - cum_sq[start]) - total ** 2 / (end - start)
+
+
+def binary_segmentation(values: np.ndarray, min_size: int = MIN_SEGMENT_MONTHS,
+                        max_change_points: int = MAX_CHANGE_POINTS) -> List[int]:
+    """
+    Puntos de cambio en la media por segmentación binaria.
+
+    Cada segmento se divide en el punto que más reduce la suma de cuadrados
+    (calculada con sumas acumuladas, O(n) por segmento) si la reducción
+    supera una penalización tipo BIC: 2·σ²·log(n), con σ² estimada de las
+    diferencias sucesivas.
+
+    Args:
+        values: Serie (sin NaN)
+        min_size: Longitud mínima de cada segmento
+        max_change_points: Máximo de puntos de cambio
+
+    Returns:
+        List ordenada de índices donde empieza cada nuevo segmento
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * min_size:
+        return []
+
+    sigma2 = np.var(np.diff(values)) / 2
+    penalty = 2 * max(sigma2, 1e-12) * np.log(n)
+
+    cum = np.concatenate([[0.0], np.cumsum(values)])
+    cum_sq = np.concatenate([[0.0], np.cumsum(values ** 2)])
+
+    segments = [(0, n)]
+    change_points: List[int] = []
+
+    while len(change_points) < max_change_points:
+        best = None
+        for start, end in segments:
+            splits = np.arange(start + min_size, end - min_size + 1)
+            if len(splits) == 0:
+                continue
+            gain = (_segment_sse(cum, cum_sq, start, end) -
+                    _segment_sse(cum, cum_sq, start, splits) -
+                    _segment_sse(cum, cum_sq, splits, end))
+            k = int(np.argmax(gain))
+            if best is None or gain[k] > best[0]:
+                best = (gain[k], int(splits[k]), (start, end))
+
+        if best is None or best[0] <= penalty:
+            break
+
+        _, split, segment = best
+        segments.remove(segment)
+        segments.extend([(segment[0], split), (split, segment[1])])
+        change_points.append(split)
+
+    return sorted(change_points)
+
+# ============================================================================
+# SERVICIO MEMORIZADO
+# ============================================================================
+
+@lru_cache(maxsize=128)
+def decompose_monthly(events: Tuple[int, ...], tsunamis: Tuple[int, ...]) -> Dict[str, Dict[str, Any]]:
+    """
+    Descomposición y puntos de cambio de los eventos mensuales y de la tasa
+    mensual de tsunamis.
+
+    Memorizada por serie: cualquier filtro con los mismos agregados
+    mensuales reutiliza el resultado.
+
+    Args:
+        events: Eventos por mes (ver `monthly_series`)
+        tsunamis: Tsunamis por mes
+
+    Returns:
+        Dict {'events': ..., 'tsunami_rate': ...}; cada uno con 'observed',
+        las componentes de `decompose` y 'change_points'
+    """
+    events_arr = np.asarray(events, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = np.where(events_arr > 0, np.asarray(tsunamis, dtype=float) / events_arr, np.nan)
+
+    results = {}
+    for name, series in (('events', events_arr), ('tsunami_rate', rate)):
+        components = decompose(series)
+        deseasonalized = components['trend'] + components['residual']
+        valid = ~np.isnan(deseasonalized)
+        valid_idx = np.flatnonzero(valid)
+        change_points = [int(valid_idx[i]) for i in binary_segmentation(deseasonalized[valid])]
+        results[name] = {'observed': series, **components, 'change_points': change_points}
+
+    return results
@@ -0,0 +1,344 @@
+"""
+Módulo de Exportación
+======================
+Exportación por bloques de una selección del catálogo a CSV, GeoJSON,
+Parquet o Arrow (estos dos con pyarrow, opcional).
+
+La selección llega como posiciones de filas del catálogo: cada bloque se
+extrae, se escribe y se descarta, así que ni la vista filtrada completa ni
+el fichero de salida llegan a estar en memoria. Se escribe en un fichero
+temporal que se publica con un renombrado atómico al terminar.
+
+En el panel la exportación es un trabajo en segundo plano (`utils/jobs.py`)
+con una tarea por bloque; fuera del panel, `export_rows` la ejecuta en línea.
+"""
+
+import importlib.util
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.jobs import Job, submit_job
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+EXPORT_DIR = Path(os.environ.get(
+    'TSUNAMI_EXPORT_DIR',
+    Path(__file__).parent.parent.parent / '.cache' / 'exports'
+))
+CHUNK_ROWS = 50_000
+EXPORT_MAX_AGE_S = 3600           # Exportaciones terminadas que se conservan
+PARTIAL_SUFFIX = '.part'
+
+# Formato -> (extensión, tipo MIME, paquete opcional necesario)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    'CSV': ('csv', 'text/csv', None),
+    'GeoJSON': ('geojson', 'application/geo+json', None),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', 'pyarrow'),
+    'Arrow': ('arrow', 'application/vnd.apache.arrow.file', 'pyarrow'),
+}
+
+
+def available_formats() -> List[str]:
+    """Formatos cuyas dependencias están instaladas."""
+    return [name for name, (_, _, requires) in EXPORT_FORMATS.items()
+            if requires is None or importlib.util.find_spec(requires) is not None]
+
+# ============================================================================
+# ESCRITORES
+# ============================================================================
+
+class _CSVWriter:
+    def __init__(self, path: Path):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._header = True
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+class _GeoJSONWriter:
+    """FeatureCollection de puntos; el resto de columnas van en `properties`."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write('{"type": "FeatureCollection", "features": [\n')
+        self._first = True
+
+    def write(self, chunk: pd.DataFrame):
+        coordinates = chunk[['longitude', 'latitude']].to_numpy().tolist()
+        properties = json.loads(chunk.drop(columns=['longitude', 'latitude'])
+                                .to_json(orient='records', date_format='iso'))
+        for point, props in zip(coordinates, properties):
+            feature = {'type': 'Feature',
+                       'geometry': {'type': 'Point', 'coordinates': point},
+                       'properties': props}
+            self._file.write(('' if self._first else ',\n') + json.dumps(feature, ensure_ascii=False))
+            self._first = False
+
+    def close(self):
+        self._file.write('\n]}\n')
+        self._file.close()
+
+
+class _ArrowWriter:
+    """Parquet o Arrow IPC (formato fichero) por lotes con pyarrow."""
+
+    def __init__(self, path: Path, parquet: bool):
+        self._path = path
+        self._parquet = parquet
+        self._writer = None
+
+    def write(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._schema = table.schema
+            if self._parquet:
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self._path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(str(self._path), self._schema)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _open_writer(fmt: str, path: Path):
+    if fmt == 'CSV':
+        return _CSVWriter(path)
+    if fmt == 'GeoJSON':
+        return _GeoJSONWriter(path)
+    return _ArrowWriter(path, parquet=(fmt == 'Parquet'))
+
+# ============================================================================
+# EXPORTACIÓN
+# ============================================================================
+
+class ChunkedExport:
+    """
+    Exportación de una selección del catálogo, bloque a bloque.
+
+    Args:
+        df: Catálogo (o cualquier DataFrame base)
+        positions: Posiciones de las filas a exportar, en orden
+        fmt: Formato (ver `EXPORT_FORMATS`)
+        path: Fichero de salida
+        chunk_rows: Filas por bloque
+
+    Raises:
+        ValueError: Si el formato no existe o le falta su dependencia
+    """
+
+    def __init__(self, df: pd.DataFrame, positions: np.ndarray, fmt: str, path: Path,
+                 chunk_rows: int = CHUNK_ROWS):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato desconocido: {fmt} ({list(EXPORT_FORMATS)})")
+        if fmt not in available_formats():
+            raise ValueError(f"El formato {fmt} necesita el paquete '{EXPORT_FORMATS[fmt][2]}'")
+        self.df = df
+        self.positions = np.asarray(positions)
+        self.format = fmt
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self.rows_total = len(self.positions)
+        self.rows_written = 0
+        self.error: Optional[str] = None
+        self.completed = False
+        self.aborted = False
+        self._lock = threading.Lock()  # Bloques, cierre y cancelación no se solapan
+        self._partial = self.path.with_name(f".{self.path.name}{PARTIAL_SUFFIX}")
+        self._writer = None
+
+    @property
+    def chunk_starts(self) -> range:
+        """Primera posición (dentro de la selección) de cada bloque."""
+        return range(0, max(self.rows_total, 1), self.chunk_rows)
+
+    def write_chunk(self, start: int):
+        """Extrae y escribe el bloque que empieza en `start`."""
+        with self._lock:
+            if self.error is not None or self.aborted:
+                return
+            try:
+                if self._writer is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._writer = _open_writer(self.format, self._partial)
+                chunk = self.df.iloc[self.positions[start:start + self.chunk_rows]]
+                if len(chunk) or self.rows_written == 0:  # Selección vacía: solo cabecera/esquema
+                    self._writer.write(chunk)
+                self.rows_written += len(chunk)
+            except Exception as e:
+                self.error = str(e)
+                raise
+
+    def finish(self):
+        """
+        Cierra el fichero y lo publica.
+
+        Raises:
+            RuntimeError: Si algún bloque falló (el fichero parcial se descarta)
+        """
+        with self._lock:
+            if self.aborted:
+                return
+            self._release()
+            if self._writer is not None:
+                self._writer.close()
+            if self.error is not None:
+                self._partial.unlink(missing_ok=True)
+                raise RuntimeError(f"Exportación fallida: {self.error}")
+            os.replace(self._partial, self.path)
+            self.completed = True
+
+    def abort(self):
+        """Cancela la exportación: cierra y borra el fichero parcial."""
+        with self._lock:
+            if self.completed or self.aborted:
+                return
+            self.aborted = True
+            self._release()
+            try:
+                if self._writer is not None:
+                    self._writer.close()
+            finally:
+                self._partial.unlink(missing_ok=True)
+
+    def _release(self):
+        """Suelta el catálogo y las posiciones: ya no se escriben más bloques."""
+        self.df = None
+        self.positions = np.empty(0, dtype=self.positions.dtype)
+
+
+def export_rows(df: pd.DataFrame, positions: np.ndarray, fmt: str, path: Path,
+                chunk_rows: int = CHUNK_ROWS,
+                progress: Optional[Callable[[int, int], None]] = None) -> Path:
+    """
+    Exporta en línea una selección (notebooks y procesos por lotes).
+
+    Args:
+        df: Catálogo
+        positions: Posiciones de las filas a exportar
+        fmt: Formato (ver `EXPORT_FORMATS`)
+        path: Fichero de salida
+        chunk_rows: Filas por bloque
+        progress: Se invoca con (filas escritas, filas totales) tras cada bloque
+
+    Returns:
+        Path del fichero escrito
+    """
+    export = ChunkedExport(df, positions, fmt, path, chunk_rows)
+    try:
+        for start in export.chunk_starts:
+            export.write_chunk(start)
+            if progress is not None:
+                progress(export.rows_written, export.rows_total)
+    except BaseException:
+        export.abort()
+        raise
+    export.finish()
+    return export.path
+
+# ============================================================================
+# EXPORTACIÓN EN SEGUNDO PLANO
+# ============================================================================
+
+_exports: Dict[str, ChunkedExport] = {}
+_exports_lock = threading.Lock()
+
+
+def cleanup_exports(max_age_s: float = EXPORT_MAX_AGE_S) -> int:
+    """
+    Borra exportaciones antiguas y ficheros parciales abandonados.
+
+    Olvida también las exportaciones terminadas, fallidas o canceladas cuyo
+    fichero ya no existe (la interfaz las da por caducadas).
+
+    Args:
+        max_age_s: Antigüedad máxima (segundos)
+
+    Returns:
+        int: Ficheros borrados
+    """
+    removed = 0
+    if EXPORT_DIR.is_dir():
+        with _exports_lock:
+            in_progress = {export._partial for export in _exports.values()
+                           if not export.completed and not export.aborted}
+        cutoff = time.time() - max_age_s
+        for path in EXPORT_DIR.iterdir():
+            if path in in_progress or not path.is_file():
+                continue
+            if path.stat().st_mtime < cutoff or (path.name.endswith(PARTIAL_SUFFIX) and
+                                                 path.stat().st_mtime < time.time() - 60):
+                path.unlink(missing_ok=True)
+                removed += 1
+
+    # Las terminadas o canceladas ya soltaron sus datos (`df` es None)
+    with _exports_lock:
+        stale = [key for key, export in _exports.items()
+                 if export.df is None and not export.path.exists()]
+        for key in stale:
+            del _exports[key]
+    return removed
+
+
+def start_export(key: str, df: pd.DataFrame, positions: np.ndarray, fmt: str,
+                 chunk_rows: int = CHUNK_ROWS) -> Job:
+    """
+    Lanza la exportación en segundo plano (una tarea por bloque).
+
+    Un nuevo encargo con la misma clave cancela el anterior.
+
+    Args:
+        key: Clave del trabajo (p. ej. 'export:<sesión>')
+        df: Catálogo
+        positions: Posiciones de las filas a exportar
+        fmt: Formato (ver `EXPORT_FORMATS`)
+        chunk_rows: Filas por bloque
+
+    Returns:
+        Job de la exportación (ver `get_export` para el fichero)
+    """
+    cleanup_exports()
+    extension = EXPORT_FORMATS[fmt][0]
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    safe_key = key.replace(':', '-')
+    export = ChunkedExport(df, positions, fmt,
+                           EXPORT_DIR / f"sismos-{stamp}-{safe_key}.{extension}", chunk_rows)
+
+    with _exports_lock:
+        previous = _exports.get(key)
+        _exports[key] = export
+    if previous is not None:
+        previous.abort()
+
+    tasks = [(f"Filas {start + 1:,}-{min(start + chunk_rows, export.rows_total):,}",
+              export.write_chunk, (start,))
+             for start in export.chunk_starts]
+    tasks.append(("Publicando fichero", export.finish, ()))
+    # Carril propio: no hace cola detrás del precálculo de vistas
+    return submit_job(key, f"Exportación {fmt}", tasks, lane='export')
+
+
+def get_export(key: str) -> Optional[ChunkedExport]:
+    """Última exportación encargada con esa clave, si existe."""
+    with _exports_lock:
+        return _exports.get(key)
@@ -0,0 +1,90 @@
+"""
+Módulo de Fragmentos
+=====================
+Regiones del panel que se reejecutan de forma independiente: al cambiar un
+widget de una región solo se vuelve a ejecutar esa región, no la carga de
+datos, los filtros, los KPIs ni el resto de pestañas.
+
+Cada fragmento conserva los argumentos de la última ejecución completa (la
+vista filtrada) y obtiene sus cálculos de la caché compartida, así que una
+reejecución parcial solo paga su propio renderizado. Los tiempos de cada
+fragmento se registran por sesión.
+"""
+
+import functools
+import logging
+import time
+from typing import Callable, Dict, Optional, Any
+
+import streamlit as st
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# `st.fragment` desde Streamlit 1.37; `st.experimental_fragment` en 1.33-1.36.
+# En versiones anteriores las regiones se ejecutan con el script completo.
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+FRAGMENTS_AVAILABLE = _fragment is not None
+
+TIMINGS_KEY = 'fragment_timings'
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# TIEMPOS
+# ============================================================================
+
+def record_timing(name: str, elapsed: float):
+    """
+    Acumula el tiempo de una ejecución de un fragmento en la sesión.
+
+    Args:
+        name: Nombre de la región
+        elapsed: Duración (segundos)
+    """
+    timings = st.session_state.setdefault(TIMINGS_KEY, {})
+    entry = timings.setdefault(name, {'runs': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0})
+    elapsed_ms = elapsed * 1000
+    entry['runs'] += 1
+    entry['total_ms'] += elapsed_ms
+    entry['last_ms'] = elapsed_ms
+    entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+    logger.debug("Fragmento %s: %.1f ms", name, elapsed_ms)
+
+
+def get_fragment_timings() -> Dict[str, Dict[str, Any]]:
+    """Tiempos acumulados de los fragmentos de la sesión actual."""
+    return st.session_state.get(TIMINGS_KEY, {})
+
+# ============================================================================
+# DECORADOR
+# ============================================================================
+
+def timed_fragment(name: str, run_every: Optional[float] = None) -> Callable:
+    """
+    Convierte una función de renderizado en un fragmento con medición.
+
+    Args:
+        name: Nombre de la región (para los tiempos)
+        run_every: Si se indica, la región se reejecuta sola cada
+            `run_every` segundos mientras se muestre (p. ej. progreso de un
+            trabajo en segundo plano)
+
+    Returns:
+        Decorador
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_timing(name, time.perf_counter() - start)
+
+        if not FRAGMENTS_AVAILABLE:
+            return timed
+        return _fragment(timed, run_every=run_every) if run_every else _fragment(timed)
+
+    return decorator
@@ -0,0 +1,231 @@
+"""
+Módulo de Trabajos en Segundo Plano
+====================================
+Planificador de trabajos de precálculo: cada trabajo es una lista de tareas
+que se ejecutan en un pool de hilos propio, con progreso consultable desde
+la interfaz y cancelación cooperativa entre tareas. Las exportaciones usan
+un carril (pool) aparte para no esperar detrás del precálculo.
+
+Un trabajo suelta sus tareas (y los DataFrames de sus argumentos) al
+terminar o cancelarse, y los trabajos terminados se olvidan pasado
+`JOB_RETENTION_S`.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.parallel import THREAD_NAME_PREFIX
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MAX_JOB_WORKERS = 2
+EXPORT_JOB_WORKERS = 1    # Carril propio: una exportación no espera al precálculo
+JOB_RETENTION_S = 3600    # Tiempo que un trabajo terminado sigue consultable
+# Con el prefijo del pool del panel, `parallel_map` ejecuta en línea dentro
+# de los trabajos y el precálculo no compite con las peticiones interactivas
+JOB_THREAD_PREFIX = f"{THREAD_NAME_PREFIX}-jobs"
+
+logger = logging.getLogger(__name__)
+
+# Streamlit avisa de la falta de contexto de sesión en cada llamada cacheada
+# desde un hilo propio; en los trabajos es lo esperado (no pintan nada)
+STREAMLIT_CONTEXT_LOGGERS = (
+    'streamlit.runtime.scriptrunner.script_run_context',
+    'streamlit.runtime.scriptrunner_utils.script_run_context'
+)
+
+# Carriles del planificador: cada uno con su pool y número de hilos
+JOB_LANES = {'precalc': MAX_JOB_WORKERS, 'export': EXPORT_JOB_WORKERS}
+DEFAULT_LANE = 'precalc'
+
+# Tarea: (etiqueta, función, argumentos posicionales). Si la función devuelve
+# una lista de tareas, se ejecutan a continuación (planes que dependen de un
+# cálculo previo, p. ej. filtrar antes de calentar la vista)
+Task = Tuple[str, Callable, tuple]
+
+# ============================================================================
+# REGISTRO
+# ============================================================================
+
+class _JobThreadContextFilter(logging.Filter):
+    """Descarta el aviso de contexto ausente emitido desde hilos de trabajos."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not (record.threadName.startswith(JOB_THREAD_PREFIX) and
+                    'missing ScriptRunContext' in record.getMessage())
+
+
+for _logger_name in STREAMLIT_CONTEXT_LOGGERS:
+    logging.getLogger(_logger_name).addFilter(_JobThreadContextFilter())
+
+# ============================================================================
+# TRABAJOS
+# ============================================================================
+
+class JobCancelled(Exception):
+    """Se lanza en un punto de control cuando el trabajo se ha cancelado."""
+
+
+class Job:
+    """
+    Trabajo de precálculo con progreso y token de cancelación.
+
+    Los errores de una tarea se registran y no detienen el resto: el
+    precálculo es best-effort, la interfaz recalcula lo que falte. Las
+    tareas que una tarea añade amplían `total`, así que el progreso puede
+    retroceder al expandirse el plan.
+    """
+
+    def __init__(self, key: str, label: str, tasks: List[Task]):
+        self.key = key
+        self.label = label
+        self.tasks = tasks
+        self.total = len(tasks)
+        self.done = 0
+        self.current: Optional[str] = None
+        self.status = 'pendiente'
+        self.errors: List[str] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def progress(self) -> float:
+        """Fracción de tareas completadas (0-1)."""
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('completado', 'cancelado')
+
+    def cancel(self):
+        """Solicita la cancelación; surte efecto en el siguiente punto de control."""
+        self._cancel_event.set()
+        # Un trabajo todavía en cola no retiene sus argumentos hasta ejecutarse
+        self.tasks = []
+
+    def checkpoint(self):
+        """
+        Punto de control cooperativo.
+
+        Raises:
+            JobCancelled: Si se ha solicitado la cancelación
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.key)
+
+    def run(self):
+        """Ejecuta las tareas en orden, comprobando la cancelación entre ellas."""
+        self.status = 'en curso'
+        self.started_at = time.time()
+        pending = deque(self.tasks)
+        try:
+            self.checkpoint()
+            while pending:
+                label, fn, args = pending.popleft()
+                self.checkpoint()
+                self.current = label
+                try:
+                    more = fn(*args)
+                except JobCancelled:
+                    raise
+                except Exception as e:
+                    logger.warning("Tarea de precálculo fallida (%s): %s", label, e)
+                    self.errors.append(f"{label}: {e}")
+                    more = None
+                if isinstance(more, list):
+                    pending.extendleft(reversed(more))
+                    self.total += len(more)
+                self.done += 1
+            self.status = 'completado'
+        except JobCancelled:
+            self.status = 'cancelado'
+        finally:
+            pending.clear()
+            self.tasks = []
+            self.current = None
+            self.finished_at = time.time()
+
+# ============================================================================
+# PLANIFICADOR
+# ============================================================================
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_jobs: Dict[str, Job] = {}
+_jobs_lock = threading.Lock()
+
+
+def _get_executor(lane: str) -> ThreadPoolExecutor:
+    with _jobs_lock:
+        if lane not in _executors:
+            _executors[lane] = ThreadPoolExecutor(
+                max_workers=JOB_LANES[lane],
+                thread_name_prefix=f"{JOB_THREAD_PREFIX}-{lane}"
+            )
+        return _executors[lane]
+
+
+def _evict_finished(now: float):
+    """Olvida los trabajos terminados hace más de `JOB_RETENTION_S` (con el lock tomado)."""
+    expired = [key for key, job in _jobs.items()
+               if job.finished_at is not None and now - job.finished_at > JOB_RETENTION_S]
+    for key in expired:
+        del _jobs[key]
+
+
+def submit_job(key: str, label: str, tasks: List[Task], lane: str = DEFAULT_LANE) -> Job:
+    """
+    Encola un trabajo en su carril, cancelando el anterior con la misma clave.
+
+    De paso olvida los trabajos terminados hace más de `JOB_RETENTION_S`
+    (p. ej. los de sesiones cerradas).
+
+    Args:
+        key: Identificador del trabajo (p. ej. 'warmup' o 'view:<sesión>')
+        label: Descripción para la interfaz
+        tasks: Lista de tareas (etiqueta, función, argumentos)
+        lane: Carril de `JOB_LANES` ('precalc' o 'export')
+
+    Returns:
+        Job encolado
+
+    Raises:
+        ValueError: Si el carril no existe
+    """
+    if lane not in JOB_LANES:
+        raise ValueError(f"Carril de trabajos desconocido: {lane}")
+    job = Job(key, label, tasks)
+    executor = _get_executor(lane)
+
+    with _jobs_lock:
+        _evict_finished(time.time())
+        previous = _jobs.get(key)
+        if previous is not None:
+            previous.cancel()
+        _jobs[key] = job
+
+    executor.submit(job.run)
+    return job
+
+
+def get_job(key: str) -> Optional[Job]:
+    """Último trabajo encolado con esa clave, si existe."""
+    with _jobs_lock:
+        return _jobs.get(key)
+
+
+def cancel_job(key: str):
+    """Cancela el trabajo con esa clave, si sigue en curso."""
+    job = get_job(key)
+    if job is not None:
+        job.cancel()
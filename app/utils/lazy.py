@@ -0,0 +1,65 @@
+"""
+Módulo de Importación Diferida
+===============================
+Las librerías pesadas (scipy.stats, submódulos de plotly) tardan cientos de
+milisegundos en importarse. Con `lazy_module` el import real se hace en el
+primer acceso a un atributo, es decir, cuando se renderiza por primera vez
+una sección que las usa, y no al arrancar el panel.
+
+Uso:
+    px = lazy_module('plotly.express')   # No importa nada todavía
+    px.bar(...)                          # Importa plotly.express aquí
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+# ============================================================================
+# MÓDULOS DIFERIDOS
+# ============================================================================
+
+_import_lock = threading.Lock()
+
+
+class _LazyModule(types.ModuleType):
+    """Sustituto de un módulo que lo importa en el primer acceso."""
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__.get('_module')
+        if module is None:
+            with _import_lock:
+                module = self.__dict__.get('_module')
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'cargado' if '_module' in self.__dict__ else 'diferido'
+        return f"<módulo {state} '{self.__name__}'>"
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """
+    Devuelve el módulo `name` sin importarlo hasta que se use.
+
+    Si ya está importado se devuelve directamente.
+
+    Args:
+        name: Nombre completo del módulo (p. ej. 'scipy.stats')
+
+    Returns:
+        Módulo o sustituto diferido con la misma interfaz
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return _LazyModule(name)
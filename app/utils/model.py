@@ -0,0 +1,394 @@
+"""
+Módulo del Modelo Predictivo
+=============================
+Pipeline de características, entrenamiento con validación temporal e
+inferencia vectorizada del clasificador de tsunamis (regresión logística).
+"""
+
+import json
+import numpy as np
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Mapping, Optional
+
+from utils.regions import in_ring_of_fire
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MODEL_DIR = Path(__file__).parent.parent.parent / "models"
+
+# Variables disponibles en el momento del evento (sin sig/cdi/mmi, que se
+# conocen a posteriori)
+INPUT_COLUMNS = ['magnitude', 'depth', 'latitude', 'longitude', 'nst', 'dmin', 'gap']
+
+FEATURE_NAMES = [
+    'magnitude',
+    'log_depth',
+    'shallow',
+    'ring_of_fire',
+    'abs_latitude',
+    'nst',
+    'dmin',
+    'gap',
+    'magnitude_x_shallow',
+    'magnitude_x_ring_of_fire'
+]
+
+DEFAULT_L2 = 1.0
+CV_TEST_YEARS = 5        # Años finales usados como folds de validación
+DECISION_THRESHOLD = 0.5
+MIN_USEFUL_AUC = 0.7     # Por debajo, las probabilidades son solo orientativas
+
+# ============================================================================
+# PIPELINE DE CARACTERÍSTICAS
+# ============================================================================
+
+def build_features(columns: Mapping[str, Any]) -> np.ndarray:
+    """
+    Construye la matriz de características a partir de columnas crudas.
+
+    Acepta un DataFrame o cualquier mapeo columna → array, de modo que el
+    mismo pipeline sirve al panel y a la puntuación de eventos sueltos.
+
+    Args:
+        columns: Mapeo con las columnas de `INPUT_COLUMNS`
+
+    Returns:
+        np.ndarray: Matriz (n, len(FEATURE_NAMES)) en float64
+    """
+    magnitude = np.asarray(columns['magnitude'], dtype=float)
+    depth = np.asarray(columns['depth'], dtype=float)
+    latitude = np.asarray(columns['latitude'], dtype=float)
+    longitude = np.asarray(columns['longitude'], dtype=float)
+
+    shallow = (depth < 70).astype(float)
+    ring_of_fire = in_ring_of_fire(latitude, longitude).astype(float)
+
+    return np.column_stack([
+        magnitude,
+        np.log1p(np.clip(depth, 0, None)),
+        shallow,
+        ring_of_fire,
+        np.abs(latitude),
+        np.asarray(columns['nst'], dtype=float),
+        np.asarray(columns['dmin'], dtype=float),
+        np.asarray(columns['gap'], dtype=float),
+        magnitude * shallow,
+        magnitude * ring_of_fire
+    ])
+
+# ============================================================================
+# ENTRENAMIENTO
+# ============================================================================
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    """Función logística numéricamente estable."""
+    return np.exp(-np.logaddexp(0, -z))
+
+
+def fit_logistic(X: np.ndarray, y: np.ndarray, l2: float = DEFAULT_L2,
+                 class_weight: Optional[str] = None,
+                 max_iter: int = 50, tol: float = 1e-8) -> Dict[str, Any]:
+    """
+    Ajusta una regresión logística con penalización L2 por Newton-Raphson.
+
+    Las características se estandarizan con la media y desviación del
+    conjunto de entrenamiento; el intercepto no se penaliza.
+
+    Args:
+        X: Matriz de características (n, p)
+        y: Etiquetas binarias (n,)
+        l2: Intensidad de la regularización
+        class_weight: None o 'balanced' (pesos inversos a la frecuencia de clase)
+        max_iter: Iteraciones máximas de Newton
+        tol: Tolerancia de convergencia sobre el paso
+
+    Returns:
+        Dict con coeficientes, intercepto y parámetros de estandarización
+    """
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+
+    Z = np.column_stack([np.ones(len(X)), (X - mean) / std])
+    y = np.asarray(y, dtype=float)
+
+    sample_weight = np.ones(len(y))
+    if class_weight == 'balanced':
+        n_pos = y.sum()
+        n_neg = len(y) - n_pos
+        if n_pos > 0 and n_neg > 0:
+            sample_weight = np.where(y == 1, len(y) / (2 * n_pos), len(y) / (2 * n_neg))
+
+    penalty = np.full(Z.shape[1], l2)
+    penalty[0] = 0.0
+    weights = np.zeros(Z.shape[1])
+
+    for _ in range(max_iter):
+        p = _sigmoid(Z @ weights)
+        gradient = Z.T @ (sample_weight * (p - y)) + penalty * weights
+        hessian = (Z * (sample_weight * p * (1 - p))[:, None]).T @ Z + np.diag(penalty)
+        step = np.linalg.solve(hessian + 1e-9 * np.eye(len(weights)), gradient)
+        weights -= step
+        if np.max(np.abs(step)) < tol:
+            break
+
+    return {
+        'intercept': float(weights[0]),
+        'coef': weights[1:],
+        'mean': mean,
+        'std': std,
+        'l2': l2,
+        'class_weight': class_weight
+    }
+
+
+def classification_metrics(y_true: np.ndarray, proba: np.ndarray,
+                           threshold: float = DECISION_THRESHOLD) -> Dict[str, float]:
+    """
+    Métricas de clasificación binaria (AUC por rangos, precisión, recall, F1).
+
+    Args:
+        y_true: Etiquetas reales
+        proba: Probabilidades predichas
+        threshold: Umbral de decisión
+
+    Returns:
+        Dict con auc, precision, recall, f1 y n
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    predicted = proba >= threshold
+
+    tp = np.sum(predicted & y_true)
+    fp = np.sum(predicted & ~y_true)
+    fn = np.sum(~predicted & y_true)
+
+    precision = tp / (tp + fp) if tp + fp > 0 else 0.0
+    recall = tp / (tp + fn) if tp + fn > 0 else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+
+    n_pos, n_neg = y_true.sum(), (~y_true).sum()
+    if n_pos > 0 and n_neg > 0:
+        # AUC = probabilidad de que un positivo puntúe por encima de un
+        # negativo (estadístico U con rangos promedio para empates)
+        _, inverse, counts = np.unique(proba, return_inverse=True, return_counts=True)
+        ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+        auc = (ranks[y_true].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    else:
+        auc = float('nan')
+
+    return {
+        'auc': float(auc),
+        'precision': float(precision),
+        'recall': float(recall),
+        'f1': float(f1),
+        'n': int(len(y_true))
+    }
+
+
+def labeled_years_mask(y: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Filas de los años en los que el catálogo registra tsunamis.
+
+    Antes del primer año con algún positivo la columna `tsunami` no es un
+    negativo real sino un dato no registrado (el catálogo empieza a anotar
+    tsunamis en 2013); usar esas filas como negativos hunde el AUC.
+
+    Args:
+        y: Etiquetas
+        years: Año de cada evento
+
+    Returns:
+        np.ndarray booleano; todo False si no hay ningún positivo
+    """
+    y = np.asarray(y)
+    years = np.asarray(years)
+    if not np.any(y == 1):
+        return np.zeros(len(years), dtype=bool)
+    return years >= years[y == 1].min()
+
+
+def temporal_cv_splits(years: np.ndarray, n_test_years: int = CV_TEST_YEARS) -> List[Dict[str, Any]]:
+    """
+    Folds de validación temporal con ventana de entrenamiento expansiva.
+
+    Cada fold entrena con todos los años anteriores al año de prueba, de
+    modo que el modelo nunca ve datos del futuro.
+
+    Args:
+        years: Año de cada evento
+        n_test_years: Número de años finales usados como prueba
+
+    Returns:
+        List de dicts con 'test_year', 'train' y 'test' (máscaras booleanas)
+    """
+    unique_years = np.unique(years)
+    return [
+        {'test_year': int(year), 'train': years < year, 'test': years == year}
+        for year in unique_years[-n_test_years:]
+        if np.any(years < year)
+    ]
+
+
+def evaluate_fold(X: np.ndarray, y: np.ndarray, years: np.ndarray, test_year: int,
+                  l2: float = DEFAULT_L2,
+                  class_weight: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Entrena con los años anteriores a `test_year` y evalúa sobre ese año.
+
+    Args:
+        X: Matriz de características
+        y: Etiquetas
+        years: Año de cada evento
+        test_year: Año de prueba del fold
+        l2: Regularización
+        class_weight: None o 'balanced'
+
+    Returns:
+        Dict con el año de prueba y las métricas del fold
+    """
+    train, test = years < test_year, years == test_year
+    params = fit_logistic(X[train], y[train], l2, class_weight)
+    proba = predict_proba(params, X[test])
+    return {'test_year': int(test_year), **classification_metrics(y[test], proba)}
+
+
+def evaluate_temporal_cv(X: np.ndarray, y: np.ndarray, years: np.ndarray,
+                         l2: float = DEFAULT_L2,
+                         class_weight: Optional[str] = None,
+                         n_test_years: int = CV_TEST_YEARS) -> List[Dict[str, Any]]:
+    """
+    Evalúa el modelo con validación cruzada temporal por año.
+
+    Args:
+        X: Matriz de características
+        y: Etiquetas
+        years: Año de cada evento
+        l2: Regularización
+        class_weight: None o 'balanced'
+        n_test_years: Número de folds
+
+    Returns:
+        List con las métricas de cada fold
+    """
+    return [
+        evaluate_fold(X, y, years, split['test_year'], l2, class_weight)
+        for split in temporal_cv_splits(years, n_test_years)
+    ]
+
+
+def train_model(columns: Mapping[str, Any], l2: float = DEFAULT_L2,
+                class_weight: Optional[str] = None,
+                cv_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Entrena el modelo final y adjunta las métricas de validación temporal.
+
+    Solo se usan los años con tsunamis registrados (ver `labeled_years_mask`),
+    tanto para entrenar como para validar.
+
+    Args:
+        columns: DataFrame o mapeo con `INPUT_COLUMNS`, 'tsunami' y 'Year'
+        l2: Regularización
+        class_weight: None o 'balanced'
+        cv_results: Métricas ya calculadas (p. ej. por la búsqueda de
+            hiperparámetros); si se omiten se recalculan
+
+    Returns:
+        Dict del modelo listo para `predict_proba` y `save_model`
+
+    Raises:
+        ValueError: Si no hay ningún tsunami registrado
+    """
+    y = np.asarray(columns['tsunami'], dtype=float)
+    years = np.asarray(columns['Year'])
+    labeled = labeled_years_mask(y, years)
+    if not labeled.any():
+        raise ValueError("No hay tsunamis registrados con los que entrenar")
+    X = build_features(columns)[labeled]
+    y, years = y[labeled], years[labeled]
+
+    if cv_results is None:
+        cv_results = evaluate_temporal_cv(X, y, years, l2, class_weight)
+    model = fit_logistic(X, y, l2, class_weight)
+
+    trained_at = datetime.now(timezone.utc)
+    model.update({
+        'version': trained_at.strftime('%Y%m%d%H%M%S'),
+        'trained_at': trained_at.isoformat(),
+        'features': list(FEATURE_NAMES),
+        'n_train': int(len(y)),
+        'labeled_from': int(years.min()),
+        'cv_results': cv_results
+    })
+    return model
+
+# ============================================================================
+# INFERENCIA
+# ============================================================================
+
+def predict_proba(model: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+    """
+    Probabilidad de tsunami para un lote de eventos en una sola operación.
+
+    Args:
+        model: Modelo entrenado (ver `fit_logistic` / `train_model`)
+        X: Matriz de características (n, p)
+
+    Returns:
+        np.ndarray: Probabilidades (n,)
+    """
+    return _sigmoid(((X - model['mean']) / model['std']) @ model['coef'] + model['intercept'])
+
+# ============================================================================
+# SERIALIZACIÓN
+# ============================================================================
+
+def save_model(model: Dict[str, Any], path: Path) -> Path:
+    """
+    Guarda el modelo como .npz (parámetros) con los metadatos en JSON.
+
+    Args:
+        model: Modelo entrenado
+        path: Ruta del artefacto
+
+    Returns:
+        Path: Ruta escrita
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    metadata = {key: value for key, value in model.items()
+                if key not in ('coef', 'mean', 'std')}
+
+    with open(path, 'wb') as f:
+        np.savez(f,
+                 coef=model['coef'],
+                 mean=model['mean'],
+                 std=model['std'],
+                 metadata=np.array(json.dumps(metadata)))
+    return path
+
+
+def load_model(path: Path) -> Dict[str, Any]:
+    """
+    Carga un modelo guardado con `save_model`.
+
+    Args:
+        path: Ruta del artefacto
+
+    Returns:
+        Dict del modelo
+
+    Raises:
+        FileNotFoundError: Si el artefacto no existe
+    """
+    with np.load(path, allow_pickle=False) as data:
+        model = json.loads(str(data['metadata']))
+        model.update({
+            'coef': data['coef'],
+            'mean': data['mean'],
+            'std': data['std']
+        })
+    return model
@@ -0,0 +1,118 @@
+"""
+Módulo de Ejecución Paralela
+=============================
+Pools de ejecución compartidos por los servicios de cálculo del panel.
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Sequence, Any
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MAX_THREAD_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+MAX_PROCESS_WORKERS = os.cpu_count() or 1
+THREAD_NAME_PREFIX = 'panel-worker'
+
+# ============================================================================
+# POOL DE HILOS
+# ============================================================================
+
+_thread_pool = None
+_process_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Devuelve el pool de hilos compartido por todas las sesiones.
+
+    Se crea de forma perezosa la primera vez que se necesita y vive tanto
+    como el proceso de Streamlit.
+
+    Returns:
+        ThreadPoolExecutor: Pool de hilos del proceso
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        with _pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(
+                    max_workers=MAX_THREAD_WORKERS,
+                    thread_name_prefix=THREAD_NAME_PREFIX
+                )
+    return _thread_pool
+
+# ============================================================================
+# POOL DE PROCESOS
+# ============================================================================
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Devuelve el pool de procesos compartido para cálculos intensivos en CPU.
+
+    Usa el contexto `spawn`: hacer `fork` de un servidor Streamlit con hilos
+    activos no es seguro.
+
+    Returns:
+        ProcessPoolExecutor: Pool de procesos del servidor
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=MAX_PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _process_pool
+
+
+def _reset_process_pool():
+    """Descarta un pool de procesos roto para que se recree en el próximo uso."""
+    global _process_pool
+    with _pool_lock:
+        _process_pool = None
+
+
+def parallel_map(fn: Callable, tasks: Sequence[tuple],
+                 use_processes: bool = False) -> List[Any]:
+    """
+    Ejecuta `fn(*task)` para cada tarea y devuelve los resultados en orden.
+
+    Con una sola tarea, o si ya se está dentro de un hilo del pool (evita
+    bloqueos por esperas anidadas), se ejecuta en el hilo actual. Si el pool
+    de procesos se rompe (p. ej. un worker muere), se reintenta en hilos.
+
+    Args:
+        fn: Función a nivel de módulo (debe ser serializable con pickle)
+        tasks: Lista de tuplas de argumentos
+        use_processes: Usar el pool de procesos en lugar del de hilos
+
+    Returns:
+        List con los resultados en el orden de `tasks`
+    """
+    if len(tasks) <= 1:
+        return [fn(*task) for task in tasks]
+
+    in_pool_thread = threading.current_thread().name.startswith(THREAD_NAME_PREFIX)
+
+    if use_processes:
+        try:
+            pool = get_process_pool()
+            futures = [pool.submit(fn, *task) for task in tasks]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            _reset_process_pool()
+
+    if in_pool_thread:
+        return [fn(*task) for task in tasks]
+
+    pool = get_thread_pool()
+    futures = [pool.submit(fn, *task) for task in tasks]
+    return [future.result() for future in futures]
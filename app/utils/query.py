@@ -0,0 +1,365 @@
+"""
+Módulo de Consultas
+====================
+Capa de consultas sobre el catálogo, independiente de Streamlit: la usan el
+panel (`get_filtered_data`), los notebooks y los procesos por lotes.
+
+    from utils.query import open_engine
+
+    engine = open_engine()
+    view = engine.select({'magnitude_range': (7.0, 9.5), 'tsunami_filter': 'Solo con Tsunami'})
+    rates = engine.aggregate('Year', {'events': ('tsunami', 'size'), 'rate': ('tsunami', 'mean')})
+    points = engine.sample(500, strategy='stratified', by='tsunami')
+
+Los filtros usan las mismas claves que la barra lateral; además, cualquier
+columna del catálogo admite una tupla `(mín, máx)` (rango cerrado), una
+lista de valores o un valor exacto.
+
+Los rangos se resuelven con índices ordenados (`searchsorted` sobre las
+posiciones ordenadas de cada columna) y las igualdades con mapas de bits por
+valor, construidos la primera vez que se usan. El motor no modifica el
+DataFrame base y protege sus índices y su memo de resultados con un cerrojo:
+se puede compartir entre hilos.
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union, Any
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import VERSION_ATTR, register_version_provider
+from utils.dataset import DATA_PATH, get_data_fingerprint, get_dataset_version, read_events
+from utils.declustering import get_mainshock_mask
+from utils.store import build_store, open_store
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Filtros de la barra lateral que son rangos o listas sobre una columna
+RANGE_FILTERS = {'year_range': 'Year', 'magnitude_range': 'magnitude', 'depth_range': 'depth'}
+CHOICE_FILTERS = {
+    'tsunami_filter': ('tsunami', {'Solo con Tsunami': 1, 'Solo sin Tsunami': 0}),
+    'region_filter': ('ring_of_fire', {'Solo Ring of Fire': 1, 'Fuera Ring of Fire': 0}),
+}
+# Claves de la barra lateral que no filtran filas (o las consume otro filtro)
+NON_FILTER_KEYS = {'decluster_scale', 'show_advanced', 'chart_theme'}
+# Claves de solo presentación: no forman parte de la clave de una selección
+DISPLAY_KEYS = {'show_advanced', 'chart_theme'}
+
+MAX_BITMAP_VALUES = 64            # Columnas con más valores se filtran sin mapa de bits
+MAX_CACHED_SELECTIONS = 64
+SAMPLE_STRATEGIES = ['uniform', 'stratified', 'top']
+
+# Fuera del panel, la caché compartida (declustering) también se versiona por
+# el contenido del CSV; el panel registra después su propio proveedor, que
+# además purga las versiones antiguas
+register_version_provider(get_dataset_version)
+
+# ============================================================================
+# FILTROS
+# ============================================================================
+
+def normalize_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Filtros sin las claves que no cambian la selección: las de presentación
+    y la escala de declustering cuando el declustering está desactivado.
+    """
+    return {
+        key: value for key, value in filters.items()
+        if key not in DISPLAY_KEYS
+        and (key != 'decluster_scale' or filters.get('mainshocks_only'))
+    }
+
+
+def freeze_filters(filters: Dict[str, Any]) -> tuple:
+    """Representación hashable y ordenada de los filtros que afectan a las filas."""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, (list, tuple, set)) else value)
+        for key, value in normalize_filters(filters).items()
+    ))
+
+
+def sample_rows(df: pd.DataFrame, budget: int, strategy: str = 'uniform',
+                by: Optional[str] = None, seed: int = 0) -> pd.DataFrame:
+    """
+    Muestra de como máximo `budget` filas, en el orden original.
+
+    Args:
+        df: DataFrame a muestrear
+        budget: Número máximo de filas
+        strategy: 'uniform' (aleatoria), 'stratified' (proporcional a cada
+            valor de `by`, al menos una fila por estrato) o 'top' (las
+            `budget` filas con mayor `by`)
+        by: Columna de estratificación u ordenación
+        seed: Semilla (la misma vista y semilla dan la misma muestra)
+
+    Returns:
+        pd.DataFrame con la muestra
+
+    Raises:
+        ValueError: Si la estrategia no existe o le falta `by`
+    """
+    if strategy not in SAMPLE_STRATEGIES:
+        raise ValueError(f"Estrategia de muestreo desconocida: {strategy} ({SAMPLE_STRATEGIES})")
+    if strategy != 'uniform' and by is None:
+        raise ValueError(f"La estrategia '{strategy}' necesita la columna `by`")
+    if len(df) <= budget:
+        return df
+
+    rng = np.random.default_rng(seed)
+    if strategy == 'uniform':
+        positions = rng.choice(len(df), size=budget, replace=False)
+    elif strategy == 'top':
+        positions = np.argsort(-df[by].to_numpy(), kind='stable')[:budget]
+    else:
+        codes, uniques = pd.factorize(df[by], use_na_sentinel=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+        quotas = np.maximum(1, np.floor(counts * budget / len(df))).astype(int)
+        positions = np.concatenate([
+            rng.choice(np.flatnonzero(codes == code), size=min(quota, count), replace=False)
+            for code, (quota, count) in enumerate(zip(quotas, counts))
+        ])
+    return df.iloc[np.sort(positions)]
+
+# ============================================================================
+# MOTOR
+# ============================================================================
+
+class QueryEngine:
+    """
+    Motor de consultas sobre un catálogo (normalmente el completo).
+
+    Args:
+        df: Catálogo preparado (ver `read_events` / `open_store`)
+        fingerprint: Huella del catálogo; se calcula si no se indica
+    """
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Optional[str] = None):
+        self.df = df
+        self.fingerprint = fingerprint or get_data_fingerprint(df)
+        self._lock = threading.Lock()
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._bitmaps: Dict[str, Optional[Dict[Any, np.ndarray]]] = {}
+        self._selections: OrderedDict = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"QueryEngine({len(self.df)} filas, {len(self.df.columns)} columnas)"
+
+    # ------------------------------------------------------------------------
+    # Índices
+    # ------------------------------------------------------------------------
+
+    def _sorted_index(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(posiciones ordenadas, valores ordenados) de una columna."""
+        with self._lock:
+            if column not in self._sorted:
+                values = self.df[column].to_numpy()
+                order = np.argsort(values, kind='stable')
+                self._sorted[column] = (order, values[order])
+            return self._sorted[column]
+
+    def _bitmap_index(self, column: str) -> Optional[Dict[Any, np.ndarray]]:
+        """Máscara por valor de una columna, o None si tiene demasiados valores."""
+        with self._lock:
+            if column not in self._bitmaps:
+                codes, uniques = pd.factorize(self.df[column])
+                self._bitmaps[column] = (
+                    {value: codes == code for code, value in enumerate(uniques)}
+                    if len(uniques) <= MAX_BITMAP_VALUES else None
+                )
+            return self._bitmaps[column]
+
+    def _range_mask(self, column: str, low: Any, high: Any) -> np.ndarray:
+        order, values = self._sorted_index(column)
+        start = np.searchsorted(values, low, side='left')
+        stop = np.searchsorted(values, high, side='right')
+        mask = np.zeros(len(values), dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def _values_mask(self, column: str, wanted: Sequence) -> np.ndarray:
+        bitmaps = self._bitmap_index(column)
+        if bitmaps is None:
+            return self.df[column].isin(wanted).to_numpy()
+        mask = np.zeros(len(self.df), dtype=bool)
+        for value in wanted:
+            if value in bitmaps:
+                mask |= bitmaps[value]
+        return mask
+
+    # ------------------------------------------------------------------------
+    # Selección
+    # ------------------------------------------------------------------------
+
+    def positions(self, filters: Optional[Dict[str, Any]] = None,
+                  checkpoint: Optional[Callable[[], None]] = None) -> np.ndarray:
+        """
+        Posiciones (orden original) de las filas que cumplen los filtros.
+
+        Args:
+            filters: Filtros (claves de la barra lateral o columnas)
+            checkpoint: Punto de control entre filtros; puede lanzar una
+                excepción para abandonar un filtrado obsoleto
+
+        Returns:
+            np.ndarray de posiciones (solo lectura)
+
+        Raises:
+            ValueError: Si algún filtro no corresponde a ninguna columna
+        """
+        filters = filters or {}
+        key = freeze_filters(filters)
+        with self._lock:
+            if key in self._selections:
+                self._selections.move_to_end(key)
+                return self._selections[key]
+
+        checkpoint = checkpoint or (lambda: None)
+        mask = np.ones(len(self.df), dtype=bool)
+
+        # Declustering: se calcula sobre el catálogo completo, para que las
+        # réplicas se detecten aunque su evento principal quede fuera de la vista
+        if filters.get('mainshocks_only'):
+            mask &= get_mainshock_mask(self.df, self.fingerprint,
+                                       filters.get('decluster_scale', 1.0)).to_numpy()
+
+        for name, value in filters.items():
+            checkpoint()
+            if name in NON_FILTER_KEYS or name == 'mainshocks_only':
+                continue
+            if name in RANGE_FILTERS:
+                mask &= self._range_mask(RANGE_FILTERS[name], *value)
+            elif name in CHOICE_FILTERS:
+                column, options = CHOICE_FILTERS[name]
+                if value in options:  # 'Todos' / 'Todas' no filtran
+                    mask &= self._values_mask(column, [options[value]])
+            elif name == 'months':
+                if value:
+                    mask &= self._values_mask('Month', list(value))
+            elif name in self.df.columns:
+                if isinstance(value, tuple):
+                    mask &= self._range_mask(name, *value)
+                elif isinstance(value, (list, set)):
+                    mask &= self._values_mask(name, list(value))
+                else:
+                    mask &= self._values_mask(name, [value])
+            else:
+                raise ValueError(f"Filtro desconocido: {name}")
+
+        result = np.flatnonzero(mask)
+        result.flags.writeable = False
+        with self._lock:
+            self._selections[key] = result
+            while len(self._selections) > MAX_CACHED_SELECTIONS:
+                self._selections.popitem(last=False)
+        return result
+
+    def select_index(self, filters: Optional[Dict[str, Any]] = None,
+                     checkpoint: Optional[Callable[[], None]] = None) -> pd.Index:
+        """Índice (del catálogo) de las filas que cumplen los filtros."""
+        return self.df.index[self.positions(filters, checkpoint)]
+
+    def select(self, filters: Optional[Dict[str, Any]] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Filas que cumplen los filtros.
+
+        Args:
+            filters: Filtros (claves de la barra lateral o columnas)
+            columns: Columnas a devolver (None = todas)
+
+        Returns:
+            pd.DataFrame con el índice original del catálogo
+        """
+        df = self.df if columns is None else self.df[list(columns)]
+        return df.iloc[self.positions(filters)]
+
+    # ------------------------------------------------------------------------
+    # Agregación y muestreo
+    # ------------------------------------------------------------------------
+
+    def aggregate(self, group_by: Union[str, List[str], None],
+                  metrics: Dict[str, Tuple[str, str]],
+                  filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Métricas por grupo sobre las filas filtradas.
+
+        Args:
+            group_by: Columna(s) de agrupación; None agrega todas las filas
+            metrics: Nombre -> (columna, función de pandas), p. ej.
+                {'eventos': ('tsunami', 'size'), 'tasa': ('tsunami', 'mean')}
+            filters: Filtros (claves de la barra lateral o columnas)
+
+        Returns:
+            pd.DataFrame con una fila por grupo (o una sola fila)
+        """
+        keys = [] if group_by is None else [group_by] if isinstance(group_by, str) else list(group_by)
+        needed = list(dict.fromkeys(keys + [column for column, _ in metrics.values()]))
+        view = self.select(filters, needed)
+        if not keys:
+            return view.assign(_all=0).groupby('_all').agg(**metrics).reset_index(drop=True)
+        return view.groupby(keys, observed=True, sort=True).agg(**metrics).reset_index()
+
+    def sample(self, budget: int, strategy: str = 'uniform', by: Optional[str] = None,
+               filters: Optional[Dict[str, Any]] = None,
+               columns: Optional[List[str]] = None, seed: int = 0) -> pd.DataFrame:
+        """
+        Muestra de las filas filtradas (ver `sample_rows`).
+
+        Args:
+            budget: Número máximo de filas
+            strategy: 'uniform', 'stratified' o 'top'
+            by: Columna de estratificación u ordenación
+            filters: Filtros (claves de la barra lateral o columnas)
+            columns: Columnas a devolver (None = todas)
+            seed: Semilla
+
+        Returns:
+            pd.DataFrame con la muestra
+        """
+        view = self.select(filters)
+        sampled = sample_rows(view, budget, strategy, by, seed)
+        return sampled if columns is None else sampled[list(columns)]
+
+# ============================================================================
+# APERTURA
+# ============================================================================
+
+_engines: Dict[str, QueryEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def open_engine(path: Path = DATA_PATH) -> QueryEngine:
+    """
+    Motor sobre la versión vigente del catálogo, compartido en el proceso.
+
+    Abre el almacén columnar de la versión (`utils/store.py`) y lo publica
+    si todavía no existe; solo se conserva el motor de la última versión.
+
+    Args:
+        path: Ruta del CSV
+
+    Returns:
+        QueryEngine
+
+    Raises:
+        FileNotFoundError: Si el archivo de datos no existe
+    """
+    version = get_dataset_version(path)
+    with _engines_lock:
+        engine = _engines.get(version)
+        if engine is None:
+            try:
+                df = open_store(version)
+            except FileNotFoundError:
+                build_store(read_events(path), version)
+                df = open_store(version)
+            df.attrs[VERSION_ATTR] = version
+            engine = QueryEngine(df)
+            _engines.clear()
+            _engines[version] = engine
+        return engine
@@ -0,0 +1,206 @@
+"""
+Módulo de Tasas de Tsunami
+===========================
+Intervalos de confianza para tasas de tsunami globales y por segmento.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+from utils.bootstrap import DEFAULT_SEED
+from utils.cache import shared_cache
+from utils.lazy import lazy_module
+from utils.parallel import parallel_map
+
+# scipy.stats se importa en el primer cálculo que lo necesita
+stats = lazy_module('scipy.stats')
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+RATE_RESAMPLES = 10_000
+CONFIDENCE = 0.95
+CHUNK_DRAWS = 1_000_000             # Remuestras × segmentos por bloque
+PROCESS_POOL_THRESHOLD = 20_000_000  # A partir de aquí se reparte entre procesos
+
+SEGMENT_COLUMNS = {
+    'Year': 'Año',
+    'mag_category': 'Categoría de Magnitud',
+    'depth_category': 'Categoría de Profundidad',
+    'ring_of_fire': 'Ring of Fire'
+}
+
+INTERVAL_METHODS = ['Wilson', 'Clopper-Pearson', 'Bootstrap']
+
+# ============================================================================
+# INTERVALOS ANALÍTICOS
+# ============================================================================
+
+def wilson_interval(successes: np.ndarray, trials: np.ndarray,
+                    confidence: float = CONFIDENCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intervalo de Wilson para proporciones binomiales (vectorizado).
+
+    Args:
+        successes: Número de tsunamis por segmento
+        trials: Número de eventos por segmento
+        confidence: Nivel de confianza
+
+    Returns:
+        Tuple (límite inferior, límite superior)
+    """
+    k = np.asarray(successes, dtype=float)
+    n = np.asarray(trials, dtype=float)
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p_hat = k / n
+        denom = 1 + z ** 2 / n
+        center = (p_hat + z ** 2 / (2 * n)) / denom
+        half_width = z * np.sqrt(p_hat * (1 - p_hat) / n + z ** 2 / (4 * n ** 2)) / denom
+
+    return center - half_width, center + half_width
+
+
+def clopper_pearson_interval(successes: np.ndarray, trials: np.ndarray,
+                             confidence: float = CONFIDENCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intervalo exacto de Clopper-Pearson (vectorizado sobre la distribución beta).
+
+    Args:
+        successes: Número de tsunamis por segmento
+        trials: Número de eventos por segmento
+        confidence: Nivel de confianza
+
+    Returns:
+        Tuple (límite inferior, límite superior)
+    """
+    k = np.asarray(successes, dtype=float)
+    n = np.asarray(trials, dtype=float)
+    alpha = 1 - confidence
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        low = np.where(k > 0, stats.beta.ppf(alpha / 2, k, n - k + 1), 0.0)
+        high = np.where(k < n, stats.beta.ppf(1 - alpha / 2, k + 1, n - k), 1.0)
+
+    return low, high
+
+# ============================================================================
+# INTERVALO BOOTSTRAP
+# ============================================================================
+
+def _binomial_draws_chunk(trials: np.ndarray, p_hat: np.ndarray, n_resamples: int,
+                          seed: np.random.SeedSequence) -> np.ndarray:
+    """Un bloque de remuestras de la tasa de cada segmento."""
+    rng = np.random.default_rng(seed)
+    return rng.binomial(trials, p_hat, size=(n_resamples, len(trials))) / trials
+
+
+def bootstrap_rate_interval(successes: np.ndarray, trials: np.ndarray,
+                            n_resamples: int = RATE_RESAMPLES,
+                            confidence: float = CONFIDENCE,
+                            seed: int = DEFAULT_SEED) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intervalo bootstrap percentil de la tasa de cada segmento.
+
+    Remuestrear con reemplazo las n filas binarias de un segmento equivale a
+    extraer el número de tsunamis de una Binomial(n, p̂), así que cada
+    remuestra cuesta O(1) por segmento, independientemente del tamaño del
+    catálogo. Los bloques se reparten entre procesos cuando el volumen de
+    extracciones lo justifica.
+
+    Args:
+        successes: Número de tsunamis por segmento
+        trials: Número de eventos por segmento (todos > 0)
+        n_resamples: Número de remuestras
+        confidence: Nivel de confianza
+        seed: Semilla raíz
+
+    Returns:
+        Tuple (límite inferior, límite superior)
+    """
+    k = np.asarray(successes, dtype=np.int64)
+    n = np.asarray(trials, dtype=np.int64)
+    p_hat = k / n
+
+    chunk_size = max(1, CHUNK_DRAWS // max(len(n), 1))
+    sizes = [min(chunk_size, n_resamples - start)
+             for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    samples = np.vstack(parallel_map(
+        _binomial_draws_chunk,
+        [(n, p_hat, size, child) for size, child in zip(sizes, seeds)],
+        use_processes=n_resamples * len(n) >= PROCESS_POOL_THRESHOLD
+    ))
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+    return low, high
+
+# ============================================================================
+# TASAS POR SEGMENTO
+# ============================================================================
+
+def rate_interval(successes: np.ndarray, trials: np.ndarray, method: str = 'Wilson',
+                  n_resamples: int = RATE_RESAMPLES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula el intervalo de la tasa con el método indicado.
+
+    Args:
+        successes: Número de tsunamis por segmento
+        trials: Número de eventos por segmento
+        method: 'Wilson', 'Clopper-Pearson' o 'Bootstrap'
+        n_resamples: Remuestras (solo para 'Bootstrap')
+
+    Returns:
+        Tuple (límite inferior, límite superior)
+    """
+    if method == 'Wilson':
+        return wilson_interval(successes, trials)
+    if method == 'Clopper-Pearson':
+        return clopper_pearson_interval(successes, trials)
+    if method == 'Bootstrap':
+        return bootstrap_rate_interval(successes, trials, n_resamples)
+    raise ValueError(f"Método de intervalo desconocido: {method}")
+
+
+@shared_cache(max_entries=128)
+def get_segment_rates(_df: pd.DataFrame, fingerprint: str, segment: str,
+                      method: str = 'Wilson',
+                      n_resamples: int = RATE_RESAMPLES) -> pd.DataFrame:
+    """
+    Tasa de tsunami con IC por segmento, cacheada por filtro.
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        segment: Columna de segmentación (ver `SEGMENT_COLUMNS`)
+        method: Método del intervalo
+        n_resamples: Remuestras (solo para 'Bootstrap')
+
+    Returns:
+        pd.DataFrame con segmento, eventos, tsunamis, tasa e IC (en %)
+    """
+    counts = (
+        _df.groupby(segment, observed=True)['tsunami']
+        .agg(events='size', tsunamis='sum')
+        .reset_index()
+    )
+    counts = counts[counts['events'] > 0]
+
+    if counts.empty:
+        return pd.DataFrame(columns=[segment, 'events', 'tsunamis',
+                                     'rate', 'ci_low', 'ci_high'])
+
+    low, high = rate_interval(counts['tsunamis'].to_numpy(),
+                              counts['events'].to_numpy(),
+                              method, n_resamples)
+
+    counts['rate'] = counts['tsunamis'] / counts['events'] * 100
+    counts['ci_low'] = low * 100
+    counts['ci_high'] = high * 100
+
+    return counts
@@ -0,0 +1,37 @@
+"""
+Módulo de Regiones Geográficas
+===============================
+Definiciones geográficas compartidas por la carga de datos y los modelos.
+"""
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Caja que usa el panel para el Cinturón de Fuego: latitudes fuera de la
+# franja ecuatorial (|lat| > 10°) y longitudes entre -180° y -60°
+RING_OF_FIRE_MIN_ABS_LATITUDE = 10.0
+RING_OF_FIRE_LONGITUDE_RANGE = (-180.0, -60.0)
+
+# ============================================================================
+# PERTENENCIA A REGIONES
+# ============================================================================
+
+def in_ring_of_fire(latitude, longitude):
+    """
+    Indica si una o varias coordenadas caen en el Ring of Fire del panel.
+
+    Acepta escalares o arrays de NumPy/pandas y devuelve el mismo tipo de
+    resultado booleano. Con escalares no toca NumPy (ruta de baja latencia
+    de la puntuación de eventos).
+
+    Args:
+        latitude: Latitud(es) en grados
+        longitude: Longitud(es) en grados
+
+    Returns:
+        bool o array booleano
+    """
+    lon_min, lon_max = RING_OF_FIRE_LONGITUDE_RANGE
+    return ((abs(latitude) > RING_OF_FIRE_MIN_ABS_LATITUDE) &
+            (longitude >= lon_min) & (longitude <= lon_max))
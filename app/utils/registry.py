@@ -0,0 +1,153 @@
+"""
+Módulo de Registro de Modelos
+==============================
+Registro versionado de modelos en disco. El pipeline de entrenamiento
+escribe en él; el panel solo lo lee.
+
+Estructura:
+    models/registry/
+    ├── LATEST                  # Versión activa
+    └── <versión>/
+        ├── model.npz           # Parámetros + metadatos (ver utils.model)
+        └── metadata.json       # Metadatos legibles (métricas, búsqueda)
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.model import MODEL_DIR, save_model, load_model
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+REGISTRY_DIR = MODEL_DIR / "registry"
+LATEST_FILE = "LATEST"
+MODEL_FILE = "model.npz"
+METADATA_FILE = "metadata.json"
+
+# ============================================================================
+# ESCRITURA (PIPELINE OFFLINE)
+# ============================================================================
+
+def _atomic_write_text(path: Path, text: str):
+    """Escribe un fichero de texto de forma atómica (tmp + rename)."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def register_model(model: Dict[str, Any], registry_dir: Path = REGISTRY_DIR,
+                   make_latest: bool = True) -> Path:
+    """
+    Publica un modelo en el registro.
+
+    El directorio de la versión se escribe completo en una ruta temporal y
+    se renombra al final, de modo que un lector nunca ve una versión a medias.
+    Si la versión ya existe (dos entrenamientos en el mismo segundo) se le
+    añade un sufijo `-02`, `-03`... y se actualiza `model['version']`.
+
+    Args:
+        model: Modelo entrenado (debe incluir 'version')
+        registry_dir: Directorio raíz del registro
+        make_latest: Marcar la versión como activa
+
+    Returns:
+        Path: Directorio de la versión publicada
+    """
+    registry_dir = Path(registry_dir)
+    registry_dir.mkdir(parents=True, exist_ok=True)
+
+    base_version = model['version']
+    suffix = 1
+    while (registry_dir / model['version']).exists():
+        suffix += 1
+        model['version'] = f"{base_version}-{suffix:02d}"
+    version_dir = registry_dir / model['version']
+
+    staging_dir = Path(tempfile.mkdtemp(dir=registry_dir, prefix=f".{model['version']}."))
+    try:
+        save_model(model, staging_dir / MODEL_FILE)
+        metadata = {key: value for key, value in model.items()
+                    if key not in ('coef', 'mean', 'std')}
+        metadata['coefficients'] = dict(zip(model['features'],
+                                            [float(c) for c in model['coef']]))
+        (staging_dir / METADATA_FILE).write_text(
+            json.dumps(metadata, indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+        os.replace(staging_dir, version_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    if make_latest:
+        _atomic_write_text(registry_dir / LATEST_FILE, model['version'])
+
+    return version_dir
+
+# ============================================================================
+# LECTURA (PANEL)
+# ============================================================================
+
+def list_versions(registry_dir: Path = REGISTRY_DIR) -> List[str]:
+    """
+    Versiones registradas, de la más antigua a la más reciente.
+
+    Args:
+        registry_dir: Directorio raíz del registro
+
+    Returns:
+        List de versiones
+    """
+    registry_dir = Path(registry_dir)
+    if not registry_dir.exists():
+        return []
+    return sorted(path.name for path in registry_dir.iterdir()
+                  if path.is_dir() and not path.name.startswith('.')
+                  and (path / MODEL_FILE).exists())
+
+
+def latest_version(registry_dir: Path = REGISTRY_DIR) -> Optional[str]:
+    """
+    Versión activa del registro.
+
+    Args:
+        registry_dir: Directorio raíz del registro
+
+    Returns:
+        str con la versión, o None si el registro está vacío
+    """
+    latest_path = Path(registry_dir) / LATEST_FILE
+    if latest_path.exists():
+        version = latest_path.read_text(encoding='utf-8').strip()
+        if (Path(registry_dir) / version / MODEL_FILE).exists():
+            return version
+
+    versions = list_versions(registry_dir)
+    return versions[-1] if versions else None
+
+
+def load_registered_model(version: Optional[str] = None,
+                          registry_dir: Path = REGISTRY_DIR) -> Dict[str, Any]:
+    """
+    Carga (solo lectura) una versión del registro.
+
+    Args:
+        version: Versión a cargar; por defecto la activa
+        registry_dir: Directorio raíz del registro
+
+    Returns:
+        Dict del modelo
+
+    Raises:
+        FileNotFoundError: Si no hay modelos registrados
+    """
+    version = version or latest_version(registry_dir)
+    if version is None:
+        raise FileNotFoundError(f"No hay modelos registrados en {registry_dir}")
+    return load_model(Path(registry_dir) / version / MODEL_FILE)
@@ -0,0 +1,146 @@
+"""
+Módulo de Ventanas Móviles
+===========================
+Estadísticas en ventanas móviles de N días (eventos, fracción de tsunamis y
+magnitud máxima) sobre una rejilla diaria.
+
+Cada serie se calcula en O(días + eventos): los conteos con diferencias de
+sumas acumuladas y el máximo móvil con el algoritmo de van Herk/Gil-Werman,
+todo vectorizado con NumPy.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+from utils.cache import shared_cache
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+ROLLING_WINDOWS = [30, 90, 365]
+REGION_LABELS = {1: 'Ring of Fire', 0: 'Fuera Ring of Fire'}
+
+# ============================================================================
+# ALGORITMOS DE VENTANA
+# ============================================================================
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Suma de cada ventana [t - window + 1, t] con diferencias de sumas
+    acumuladas (O(n)).
+    """
+    cumulative = np.concatenate([[0], np.cumsum(values)])
+    starts = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+    return cumulative[1:] - cumulative[starts]
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Máximo de cada ventana [t - window + 1, t] con van Herk/Gil-Werman.
+
+    La serie se parte en bloques de tamaño `window`; el máximo de cualquier
+    ventana es el de un sufijo de un bloque y un prefijo del siguiente, de
+    modo que bastan dos barridos acumulados (O(n), sin depender de `window`).
+    Las posiciones previas al inicio de la serie cuentan como -inf.
+    """
+    n = len(values)
+    if n == 0:
+        return np.asarray(values, dtype=float)
+
+    # Relleno inicial para que toda ventana quede completa
+    padded = np.concatenate([np.full(window - 1, -np.inf), np.asarray(values, dtype=float)])
+    n_blocks = -(-len(padded) // window)
+    blocks = np.full(n_blocks * window, -np.inf)
+    blocks[:len(padded)] = padded
+    blocks = blocks.reshape(n_blocks, window)
+
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    # La ventana que termina en t (posición t + window - 1 del relleno)
+    # empieza en t del relleno
+    starts = np.arange(n)
+    return np.maximum(suffix[starts], prefix[starts + window - 1])
+
+# ============================================================================
+# SERIES MÓVILES
+# ============================================================================
+
+def daily_rolling_stats(days: np.ndarray, tsunami: np.ndarray, magnitude: np.ndarray,
+                        n_days: int, window: int) -> Dict[str, np.ndarray]:
+    """
+    Series diarias de eventos, fracción de tsunamis y magnitud máxima en la
+    ventana de `window` días que termina cada día.
+
+    Args:
+        days: Día de cada evento (entero desde el inicio de la rejilla)
+        tsunami: Etiqueta binaria de tsunami
+        magnitude: Magnitudes
+        n_days: Longitud de la rejilla diaria
+        window: Tamaño de la ventana (días)
+
+    Returns:
+        Dict con arrays 'events', 'tsunami_fraction' y 'max_magnitude'
+    """
+    daily_events = np.bincount(days, minlength=n_days)
+    daily_tsunamis = np.bincount(days, weights=tsunami, minlength=n_days)
+    daily_max = np.full(n_days, -np.inf)
+    np.maximum.at(daily_max, days, magnitude)
+
+    events = rolling_sum(daily_events, window)
+    tsunamis = rolling_sum(daily_tsunamis, window)
+    max_magnitude = rolling_max(daily_max, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.where(events > 0, tsunamis / events, np.nan)
+
+    return {
+        'events': events,
+        'tsunami_fraction': fraction,
+        'max_magnitude': np.where(np.isfinite(max_magnitude), max_magnitude, np.nan)
+    }
+
+
+@shared_cache(max_entries=64)
+def get_rolling_stats(_df: pd.DataFrame, fingerprint: str, window: int,
+                      by_region: bool = False) -> pd.DataFrame:
+    """
+    Estadísticas móviles diarias de la vista filtrada, globales o por región.
+
+    Args:
+        _df: DataFrame filtrado (con `event_time`)
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        window: Tamaño de la ventana (días)
+        by_region: Separar Ring of Fire y resto
+
+    Returns:
+        pd.DataFrame largo con date, region, events, tsunami_fraction y
+        max_magnitude
+    """
+    if len(_df) == 0:
+        return pd.DataFrame()
+
+    event_time = _df['event_time'].to_numpy(dtype='datetime64[D]')
+    start = event_time.min()
+    days = (event_time - start).astype(np.int64)
+    n_days = int(days.max()) + 1
+    dates = start + np.arange(n_days)
+
+    tsunami = _df['tsunami'].to_numpy(dtype=float)
+    magnitude = _df['magnitude'].to_numpy(dtype=float)
+
+    if by_region:
+        region = _df['ring_of_fire'].to_numpy()
+        groups = {REGION_LABELS[value]: region == value for value in np.unique(region)}
+    else:
+        groups = {'Global': slice(None)}
+
+    frames = []
+    for label, selection in groups.items():
+        stats = daily_rolling_stats(days[selection], tsunami[selection],
+                                    magnitude[selection], n_days, window)
+        frames.append(pd.DataFrame({'date': dates, 'region': label, **stats}))
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,144 @@
+"""
+Módulo de Puntuación de Riesgo
+===============================
+Puntuación de baja latencia de eventos individuales o en lote: nivel de
+alerta y probabilidad de tsunami del modelo registrado.
+
+La ruta de un evento individual usa solo aritmética de Python: ni pandas ni
+NumPy, cuyo coste fijo por llamada domina con una sola fila.
+"""
+
+import math
+import numpy as np
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+from utils.alerts import COMPILED_RULES, classify_alert, evaluate_alerts
+from utils.model import INPUT_COLUMNS, build_features, predict_proba
+from utils.regions import in_ring_of_fire
+from utils.registry import load_registered_model
+
+# ============================================================================
+# PUNTUADOR
+# ============================================================================
+
+class RiskScorer:
+    """
+    Puntuador precargado con un modelo del registro.
+
+    Al construirse pliega la estandarización en los coeficientes
+    (w' = w / std, b' = b - Σ w·mean / std), de modo que puntuar un evento
+    es un único producto escalar.
+    """
+
+    def __init__(self, model: Optional[Dict[str, Any]] = None):
+        self.model = model if model is not None else load_registered_model()
+        self.version = self.model['version']
+
+        coef = np.asarray(self.model['coef'], dtype=float)
+        mean = np.asarray(self.model['mean'], dtype=float)
+        std = np.asarray(self.model['std'], dtype=float)
+
+        self._weights = [float(w) for w in coef / std]
+        self._bias = float(self.model['intercept'] - np.sum(coef * mean / std))
+
+    # ------------------------------------------------------------------------
+    # EVENTO INDIVIDUAL
+    # ------------------------------------------------------------------------
+
+    def score_event(self, event: Mapping[str, float]) -> Dict[str, Any]:
+        """
+        Puntúa un evento.
+
+        Args:
+            event: Mapeo con magnitude, depth, latitude, longitude, nst, dmin, gap
+
+        Returns:
+            Dict con alert_level, probability y model_version
+
+        Raises:
+            KeyError: Si falta algún campo
+            ValueError: Si algún campo no es un número finito
+        """
+        magnitude = _finite(event, 'magnitude')
+        depth = _finite(event, 'depth')
+        latitude = _finite(event, 'latitude')
+        ring_of_fire = bool(in_ring_of_fire(latitude, _finite(event, 'longitude')))
+        shallow = 1.0 if depth < 70 else 0.0
+        ring = 1.0 if ring_of_fire else 0.0
+
+        # Mismo orden que utils.model.FEATURE_NAMES
+        features = (
+            magnitude,
+            math.log1p(max(depth, 0.0)),
+            shallow,
+            ring,
+            abs(latitude),
+            _finite(event, 'nst'),
+            _finite(event, 'dmin'),
+            _finite(event, 'gap'),
+            magnitude * shallow,
+            magnitude * ring
+        )
+
+        z = self._bias
+        for weight, value in zip(self._weights, features):
+            z += weight * value
+
+        return {
+            'alert_level': classify_alert(magnitude, depth, ring_of_fire),
+            'probability': _sigmoid(z),
+            'model_version': self.version
+        }
+
+    # ------------------------------------------------------------------------
+    # LOTES
+    # ------------------------------------------------------------------------
+
+    def score_batch(self, events: Sequence[Mapping[str, float]]) -> List[Dict[str, Any]]:
+        """
+        Puntúa un lote de eventos con una sola pasada vectorizada.
+
+        Args:
+            events: Lista de eventos (mismo formato que `score_event`)
+
+        Returns:
+            List de resultados en el mismo orden
+
+        Raises:
+            KeyError: Si a algún evento le falta un campo
+            ValueError: Si algún campo no es un número finito
+        """
+        if not events:
+            return []
+
+        columns = {col: np.fromiter((float(e[col]) for e in events), float, len(events))
+                   for col in INPUT_COLUMNS}
+        for col, values in columns.items():
+            invalid = np.flatnonzero(~np.isfinite(values))
+            if len(invalid):
+                raise ValueError(f"'{col}' no es un número finito (evento {invalid[0]})")
+        probabilities = predict_proba(self.model, build_features(columns))
+        codes = evaluate_alerts(columns['magnitude'], columns['depth'],
+                                in_ring_of_fire(columns['latitude'], columns['longitude']))
+        levels = COMPILED_RULES['levels'][codes]
+
+        return [
+            {'alert_level': level, 'probability': float(p), 'model_version': self.version}
+            for level, p in zip(levels.tolist(), probabilities)
+        ]
+
+
+def _finite(event: Mapping[str, float], column: str) -> float:
+    """Campo numérico de un evento; NaN o infinito no producen una alerta válida."""
+    value = float(event[column])
+    if not math.isfinite(value):
+        raise ValueError(f"'{column}' no es un número finito")
+    return value
+
+
+def _sigmoid(z: float) -> float:
+    """Función logística escalar numéricamente estable."""
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    exp_z = math.exp(z)
+    return exp_z / (1.0 + exp_z)
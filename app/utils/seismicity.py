@@ -0,0 +1,196 @@
+"""
+Módulo de Sismicidad
+=====================
+Estadística de Gutenberg-Richter (log10 N = a - b·M) por celda espacial y
+ventana de años: magnitud de completitud, b-value de Aki-Utsu y a-value.
+
+Todo se calcula a partir de histogramas de magnitud preagregados (una fila
+por celda y ventana), no de los eventos: el coste de las estimaciones no
+depende del tamaño del catálogo.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+
+from utils.cache import shared_cache
+from utils.parallel import parallel_map
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MAGNITUDE_BIN = 0.1
+MAXC_CORRECTION = 0.2  # Corrección habitual de la máxima curvatura
+MIN_EVENTS = 15
+GR_CELL_SIZES = [5.0, 10.0, 15.0, 20.0, 30.0, 45.0]
+DEFAULT_CELL_DEG = 20.0
+GLOBAL_CELL_DEG = 360.0  # Una sola celda: estimación global
+GR_YEAR_WINDOWS = {'Todo el período': None, '5 años': 5, '10 años': 10}
+CHUNK_ROWS = 20_000
+PROCESS_POOL_THRESHOLD = 5_000_000  # Celdas × bins a partir de las que se usan procesos
+
+# ============================================================================
+# HISTOGRAMAS
+# ============================================================================
+
+def magnitude_histograms(magnitude: np.ndarray, latitude: np.ndarray,
+                         longitude: np.ndarray, year: np.ndarray,
+                         cell_deg: float, year_window: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Histogramas de magnitud por celda espacial y ventana de años.
+
+    Args:
+        magnitude: Magnitudes
+        latitude: Latitudes (grados)
+        longitude: Longitudes (grados)
+        year: Año de cada evento
+        cell_deg: Tamaño de celda (grados)
+        year_window: Años por ventana (None = todo el período en una ventana)
+
+    Returns:
+        Dict con:
+            'hist': matriz (grupos × bins) de conteos
+            'centers': magnitud central de cada bin
+            'lat', 'lon': centro de la celda de cada grupo
+            'window_start', 'window_end': años que cubre cada grupo
+    """
+    magnitude = np.asarray(magnitude, dtype=float)
+    year = np.asarray(year, dtype=np.int64)
+
+    m_min = np.floor(magnitude.min() / MAGNITUDE_BIN + 1e-9) * MAGNITUDE_BIN
+    bins = np.round((magnitude - m_min) / MAGNITUDE_BIN).astype(np.int64)
+    n_bins = int(bins.max()) + 1
+    centers = m_min + np.arange(n_bins) * MAGNITUDE_BIN
+
+    n_lon_cells = int(np.ceil(360 / cell_deg))
+    lat_cell = np.floor((np.asarray(latitude, dtype=float) + 90) / cell_deg).astype(np.int64)
+    lon_cell = np.floor((np.asarray(longitude, dtype=float) + 180) / cell_deg).astype(np.int64) % n_lon_cells
+
+    first_year, last_year = int(year.min()), int(year.max())
+    span = year_window or (last_year - first_year + 1)
+    window = (year - first_year) // span
+
+    # Un grupo por (ventana, celda) presente en los datos
+    group_key = (window * (lat_cell.max() + 1) + lat_cell) * n_lon_cells + lon_cell
+    groups, group_idx = np.unique(group_key, return_inverse=True)
+    hist = np.bincount(group_idx * n_bins + bins,
+                       minlength=len(groups) * n_bins).reshape(len(groups), n_bins)
+
+    group_lon = groups % n_lon_cells
+    group_lat = (groups // n_lon_cells) % (lat_cell.max() + 1)
+    group_window = groups // (n_lon_cells * (lat_cell.max() + 1))
+    window_start = first_year + group_window * span
+
+    return {
+        'hist': hist,
+        'centers': centers,
+        'lat': -90 + (group_lat + 0.5) * cell_deg,
+        'lon': -180 + (group_lon + 0.5) * cell_deg,
+        'window_start': window_start,
+        'window_end': np.minimum(window_start + span - 1, last_year)
+    }
+
+# ============================================================================
+# ESTIMACIÓN DE GUTENBERG-RICHTER
+# ============================================================================
+
+def gutenberg_richter(hist: np.ndarray, centers: np.ndarray,
+                      min_events: int = MIN_EVENTS) -> Dict[str, np.ndarray]:
+    """
+    Mc, b-value y a-value de cada fila de histogramas, vectorizado.
+
+    - Mc: máxima curvatura (bin con más eventos) + `MAXC_CORRECTION`
+    - b: máxima verosimilitud de Aki-Utsu, b = log10(e) / (M̄ - (Mc - ΔM/2))
+    - σb: Shi y Bolt (1982)
+    - a: log10 N(M ≥ Mc) + b·Mc
+
+    Args:
+        hist: Matriz (grupos × bins) de conteos
+        centers: Magnitud central de cada bin
+        min_events: Mínimo de eventos sobre Mc para estimar (si no, NaN)
+
+    Returns:
+        Dict con arrays 'mc', 'n', 'b', 'b_std' y 'a' por grupo
+    """
+    hist = np.asarray(hist, dtype=float)
+    peak = hist.argmax(axis=1)
+    mc_bin = np.minimum(peak + int(round(MAXC_CORRECTION / MAGNITUDE_BIN)), len(centers) - 1)
+    mc = centers[mc_bin]
+
+    complete = np.arange(len(centers))[None, :] >= mc_bin[:, None]
+    counts = np.where(complete, hist, 0.0)
+    n = counts.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_mag = (counts @ centers) / n
+        b = np.log10(np.e) / (mean_mag - (mc - MAGNITUDE_BIN / 2))
+        variance = (counts * (centers[None, :] - mean_mag[:, None]) ** 2).sum(axis=1) / (n * (n - 1))
+        b_std = 2.3 * b ** 2 * np.sqrt(variance)
+        a = np.log10(n) + b * mc
+
+    enough = n >= max(min_events, 2)
+    return {
+        'mc': mc,
+        'n': n.astype(np.int64),
+        'b': np.where(enough, b, np.nan),
+        'b_std': np.where(enough, b_std, np.nan),
+        'a': np.where(enough, a, np.nan)
+    }
+
+
+def gutenberg_richter_parallel(hist: np.ndarray, centers: np.ndarray,
+                               min_events: int = MIN_EVENTS) -> Dict[str, np.ndarray]:
+    """
+    `gutenberg_richter` repartido por bloques de celdas.
+
+    En rejillas finas (muchas celdas × bins) los bloques van al pool de
+    procesos; en el resto se usa el de hilos.
+    """
+    tasks = [(hist[start:start + CHUNK_ROWS], centers, min_events)
+             for start in range(0, len(hist), CHUNK_ROWS)]
+    results = parallel_map(gutenberg_richter, tasks,
+                           use_processes=hist.size >= PROCESS_POOL_THRESHOLD)
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+# ============================================================================
+# SERVICIOS CACHEADOS
+# ============================================================================
+
+@shared_cache(max_entries=32)
+def get_gr_grid(_df: pd.DataFrame, fingerprint: str, cell_deg: float,
+                year_window: Optional[int] = None,
+                min_events: int = MIN_EVENTS) -> pd.DataFrame:
+    """
+    Parámetros de Gutenberg-Richter por celda y ventana de la vista filtrada.
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        cell_deg: Tamaño de celda (grados)
+        year_window: Años por ventana (None = todo el período)
+        min_events: Mínimo de eventos sobre Mc para estimar
+
+    Returns:
+        pd.DataFrame con una fila por celda y ventana: lat, lon, período,
+        eventos, mc, n_complete, b, b_std y a
+    """
+    if len(_df) == 0:
+        return pd.DataFrame()
+
+    hists = magnitude_histograms(_df['magnitude'].to_numpy(), _df['latitude'].to_numpy(),
+                                 _df['longitude'].to_numpy(), _df['Year'].to_numpy(),
+                                 cell_deg, year_window)
+    gr = gutenberg_richter_parallel(hists['hist'], hists['centers'], min_events)
+
+    return pd.DataFrame({
+        'lat': hists['lat'],
+        'lon': hists['lon'],
+        'period': [f"{start}-{end}" for start, end in zip(hists['window_start'], hists['window_end'])],
+        'events': hists['hist'].sum(axis=1),
+        'mc': gr['mc'],
+        'n_complete': gr['n'],
+        'b': gr['b'],
+        'b_std': gr['b_std'],
+        'a': gr['a']
+    })
@@ -0,0 +1,332 @@
+"""
+Módulo de Consultas SQL
+========================
+Motor SQL embebido para consultas ad hoc de solo lectura sobre el catálogo
+(tabla `events`, mismas columnas que `read_events`).
+
+- DuckDB (opcional, `pip install duckdb`): ejecución vectorizada y columnar;
+  los resultados se leen en lotes de Arrow si pyarrow está instalado.
+- sqlite3 (biblioteca estándar) si DuckDB no está disponible, con índices
+  sobre las columnas que filtra la barra lateral.
+
+Salvaguardas: una sola sentencia SELECT/WITH, sin palabras clave de
+escritura ni de configuración; además cada motor se bloquea en solo lectura
+(autorizador y `query_only` en sqlite; sin acceso externo ni cambios de
+configuración en DuckDB). Cada consulta tiene un límite de filas y un tiempo
+máximo: al vencer se interrumpe en el propio motor.
+"""
+
+import contextlib
+import importlib.util
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+import pandas as pd
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+TABLE_NAME = 'events'
+SQL_BACKENDS = ['duckdb', 'sqlite']
+DEFAULT_MAX_ROWS = 10_000
+DEFAULT_TIMEOUT_S = 10.0
+BATCH_ROWS = 2_048
+INDEXED_COLUMNS = ['Year', 'Month', 'magnitude', 'depth', 'tsunami', 'ring_of_fire']
+SQLITE_PROGRESS_STEPS = 10_000    # Instrucciones de la VM entre comprobaciones del plazo
+
+READ_ONLY_START = ('SELECT', 'WITH')
+FORBIDDEN_KEYWORDS = {
+    'INSERT', 'UPDATE', 'DELETE', 'DROP', 'CREATE', 'ALTER', 'TRUNCATE',
+    'ATTACH', 'DETACH', 'COPY', 'EXPORT', 'IMPORT', 'INSTALL', 'LOAD',
+    'PRAGMA', 'SET', 'RESET', 'CALL', 'VACUUM', 'CHECKPOINT',
+    'BEGIN', 'COMMIT', 'ROLLBACK', 'GRANT', 'REVOKE',
+}
+
+# Operaciones que el autorizador de sqlite permite durante una consulta
+_SQLITE_ALLOWED = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION,
+                   getattr(sqlite3, 'SQLITE_RECURSIVE', 33)}
+
+# ============================================================================
+# EXCEPCIONES
+# ============================================================================
+
+class QueryRejected(ValueError):
+    """La consulta no es una lectura admitida."""
+
+
+class QueryTimeout(Exception):
+    """La consulta superó su tiempo máximo y se interrumpió."""
+
+# ============================================================================
+# VALIDACIÓN
+# ============================================================================
+
+def _scan(sql: str) -> Tuple[str, str]:
+    """
+    Separa comentarios y literales de una consulta.
+
+    Returns:
+        (consulta sin comentarios, código sin comentarios ni literales)
+    """
+    clean, code = [], []
+    i, n = 0, len(sql)
+    while i < n:
+        char = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            if end == -1:
+                raise QueryRejected("Comentario sin cerrar")
+            clean.append(' ')
+            code.append(' ')
+            i = end + 2
+            continue
+        if char in ("'", '"'):
+            end = i + 1
+            while True:
+                end = sql.find(char, end)
+                if end == -1:
+                    raise QueryRejected("Literal o identificador sin cerrar")
+                if sql.startswith(char * 2, end):  # Comilla escapada
+                    end += 2
+                    continue
+                break
+            clean.append(sql[i:end + 1])
+            code.append(' ')
+            i = end + 1
+            continue
+        clean.append(char)
+        code.append(char)
+        i += 1
+    return ''.join(clean), ''.join(code)
+
+
+def validate_query(sql: str) -> str:
+    """
+    Comprueba que la consulta es una única lectura.
+
+    Args:
+        sql: Texto de la consulta
+
+    Returns:
+        str: Consulta sin comentarios ni `;` final
+
+    Raises:
+        QueryRejected: Si está vacía, tiene varias sentencias, no empieza por
+            SELECT/WITH o contiene palabras clave de escritura o configuración
+    """
+    clean, code = _scan(sql)
+    clean = clean.strip().rstrip(';').strip()
+    code = code.strip().rstrip(';').strip()
+    if not code:
+        raise QueryRejected("La consulta está vacía")
+    if ';' in code:
+        raise QueryRejected("Solo se admite una sentencia por consulta")
+
+    words = {word.upper() for word in re.findall(r'[A-Za-z_]+', code)}
+    if code.split(None, 1)[0].upper() not in READ_ONLY_START:
+        raise QueryRejected("Solo se admiten consultas SELECT o WITH")
+    forbidden = sorted(words & FORBIDDEN_KEYWORDS)
+    if forbidden:
+        raise QueryRejected(f"Palabras clave no permitidas: {', '.join(forbidden)}")
+    return clean
+
+# ============================================================================
+# MOTOR
+# ============================================================================
+
+def _installed(module: str) -> bool:
+    """Si un paquete opcional está instalado (sin importarlo)."""
+    return importlib.util.find_spec(module) is not None
+
+
+def _sqlite_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Columnas con tipos que sqlite admite (categorías y fechas como texto)."""
+    converted = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            converted[column] = series.astype(str)
+        elif series.dtype.kind == 'M':
+            converted[column] = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+    return df.assign(**converted) if converted else df
+
+
+def _sqlite_authorizer(action: int, *args) -> int:
+    return sqlite3.SQLITE_OK if action in _SQLITE_ALLOWED else sqlite3.SQLITE_DENY
+
+
+class SQLEngine:
+    """
+    Base de datos embebida con el catálogo como tabla `events`.
+
+    Args:
+        df: Catálogo preparado
+        backend: 'duckdb', 'sqlite' o None (DuckDB si está instalado)
+
+    Raises:
+        ValueError: Si el motor pedido no existe o no está instalado
+    """
+
+    def __init__(self, df: pd.DataFrame, backend: Optional[str] = None):
+        if backend is None:
+            backend = 'duckdb' if _installed('duckdb') else 'sqlite'
+        if backend not in SQL_BACKENDS:
+            raise ValueError(f"Motor SQL desconocido: {backend} ({SQL_BACKENDS})")
+        if backend == 'duckdb' and not _installed('duckdb'):
+            raise ValueError("DuckDB no está instalado: pip install duckdb")
+
+        self.backend = backend
+        self.columns = list(df.columns)
+        self._lock = threading.Lock()
+        if backend == 'duckdb':
+            self._connection = self._open_duckdb(df)
+        else:
+            self._connection = self._open_sqlite(df)
+
+    def __repr__(self) -> str:
+        return f"SQLEngine({self.backend}, tabla {TABLE_NAME})"
+
+    # ------------------------------------------------------------------------
+    # Apertura
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _open_duckdb(df: pd.DataFrame):
+        import duckdb
+
+        connection = duckdb.connect(':memory:')
+        connection.register('_catalog', df)
+        connection.execute(f"CREATE TABLE {TABLE_NAME} AS SELECT * FROM _catalog")
+        connection.unregister('_catalog')
+        # Sin ficheros, extensiones ni cambios de configuración desde las consultas
+        connection.execute("SET enable_external_access = false")
+        connection.execute("SET lock_configuration = true")
+        return connection
+
+    @staticmethod
+    def _open_sqlite(df: pd.DataFrame) -> sqlite3.Connection:
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        _sqlite_frame(df).to_sql(TABLE_NAME, connection, index=False)
+        for column in INDEXED_COLUMNS:
+            if column in df.columns:
+                connection.execute(f'CREATE INDEX "idx_{column}" ON {TABLE_NAME} ("{column}")')
+        connection.execute("ANALYZE")
+        connection.execute("PRAGMA query_only = ON")
+        connection.set_authorizer(_sqlite_authorizer)
+        return connection
+
+    # ------------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------------
+
+    def _duckdb_batches(self, sql: str, deadline: float):
+        """Lotes (DataFrame) de DuckDB; un temporizador interrumpe la consulta."""
+        cursor = self._connection.cursor()
+        timer = threading.Timer(max(0.0, deadline - time.perf_counter()), cursor.interrupt)
+        timer.start()
+        try:
+            cursor.execute(sql)
+            if _installed('pyarrow'):
+                for batch in cursor.fetch_record_batch(BATCH_ROWS):
+                    yield batch.to_pandas()
+            else:
+                while True:
+                    chunk = cursor.fetch_df_chunk()
+                    if chunk.empty:
+                        break
+                    yield chunk
+        except Exception as e:
+            if time.perf_counter() >= deadline:
+                raise QueryTimeout("La consulta superó el tiempo máximo") from e
+            raise
+        finally:
+            timer.cancel()
+            cursor.close()
+
+    def _sqlite_batches(self, sql: str, deadline: float):
+        """Lotes (DataFrame) de sqlite; el gestor de progreso aplica el plazo."""
+        connection = self._connection
+        connection.set_progress_handler(lambda: int(time.perf_counter() >= deadline),
+                                        SQLITE_PROGRESS_STEPS)
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql)
+            names = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(BATCH_ROWS)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=names)
+        except sqlite3.OperationalError as e:
+            if time.perf_counter() >= deadline:
+                raise QueryTimeout("La consulta superó el tiempo máximo") from e
+            raise
+        finally:
+            cursor.close()
+            connection.set_progress_handler(None, 0)
+
+    def execute(self, sql: str, max_rows: int = DEFAULT_MAX_ROWS,
+                timeout_s: float = DEFAULT_TIMEOUT_S,
+                on_batch: Optional[Callable[[pd.DataFrame], None]] = None) -> Dict[str, Any]:
+        """
+        Ejecuta una consulta de solo lectura leyendo el resultado por lotes.
+
+        Args:
+            sql: Consulta SELECT/WITH
+            max_rows: Filas máximas del resultado (el resto se descarta)
+            timeout_s: Tiempo máximo (segundos), incluida la lectura
+            on_batch: Se invoca con el resultado acumulado tras cada lote
+
+        Returns:
+            Dict con 'data', 'truncated', 'batches', 'elapsed_ms' y 'backend'
+
+        Raises:
+            QueryRejected: Si la consulta no es una lectura admitida
+            QueryTimeout: Si supera `timeout_s`
+        """
+        sql = validate_query(sql)
+        start = time.perf_counter()
+        deadline = start + timeout_s
+        frames: List[pd.DataFrame] = []
+        rows = 0
+        truncated = False
+
+        # Cada consulta de DuckDB usa su propio cursor; la conexión de sqlite se
+        # comparte y las consultas se serializan
+        guard = self._lock if self.backend == 'sqlite' else contextlib.nullcontext()
+        with guard:
+            batches = (self._duckdb_batches(sql, deadline) if self.backend == 'duckdb'
+                       else self._sqlite_batches(sql, deadline))
+            try:
+                for frame in batches:
+                    if rows >= max_rows:
+                        truncated = True
+                        break
+                    if rows + len(frame) > max_rows:
+                        frame = frame.iloc[:max_rows - rows]
+                        truncated = True
+                    frames.append(frame)
+                    rows += len(frame)
+                    if on_batch is not None:
+                        on_batch(pd.concat(frames, ignore_index=True))
+                    if truncated:
+                        break
+            finally:
+                batches.close()
+
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return {
+            'data': data,
+            'truncated': truncated,
+            'batches': len(frames),
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+            'backend': self.backend,
+        }
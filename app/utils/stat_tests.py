@@ -0,0 +1,279 @@
+"""
+Módulo de Pruebas Estadísticas
+===============================
+Servicio de pruebas estadísticas cacheadas y reproducibles.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any
+
+from utils.bootstrap import bootstrap_means, percentile_interval, DEFAULT_RESAMPLES
+from utils.cache import shared_cache
+from utils.lazy import lazy_module
+from utils.parallel import parallel_map
+
+# scipy.stats se importa en el primer cálculo que lo necesita
+stats = lazy_module('scipy.stats')
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+RANDOM_SEED = 42           # Semilla fija para muestreos reproducibles
+SHAPIRO_MAX_SAMPLE = 5000  # Límite recomendado por scipy para Shapiro-Wilk
+ALPHA = 0.05               # Nivel de significancia
+
+NUMERIC_COLUMNS = ['magnitude', 'depth', 'sig', 'nst', 'dmin', 'gap', 'cdi', 'mmi']
+CATEGORICAL_COLUMNS = ['depth_category', 'mag_category']
+
+# Umbrales de Romano et al. (2006) para |delta de Cliff|
+CLIFFS_DELTA_THRESHOLDS = [(0.474, 'Grande'), (0.33, 'Medio'), (0.147, 'Pequeño')]
+
+# ============================================================================
+# PRUEBAS DE NORMALIDAD
+# ============================================================================
+
+def _shapiro_test(values: np.ndarray, seed: int) -> Dict[str, Any]:
+    """Shapiro-Wilk sobre una muestra sembrada (máx. 5000 valores)."""
+    sample_size = min(SHAPIRO_MAX_SAMPLE, len(values))
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(values, size=sample_size, replace=False)
+    stat, p_value = stats.shapiro(sample)
+    return {
+        'name': 'Shapiro-Wilk',
+        'statistic': float(stat),
+        'p_value': float(p_value),
+        'n': sample_size,
+        'is_normal': bool(p_value > ALPHA)
+    }
+
+
+def _dagostino_test(values: np.ndarray) -> Dict[str, Any]:
+    """D'Agostino-Pearson K² sobre la columna completa."""
+    stat, p_value = stats.normaltest(values)
+    return {
+        'name': "D'Agostino K²",
+        'statistic': float(stat),
+        'p_value': float(p_value),
+        'n': len(values),
+        'is_normal': bool(p_value > ALPHA)
+    }
+
+
+def _anderson_test(values: np.ndarray) -> Dict[str, Any]:
+    """
+    Anderson-Darling sobre la columna completa.
+
+    Con scipy >= 1.17 se usa el p-valor interpolado (`method='interpolate'`,
+    acotado a [0.01, 0.15]); las versiones anteriores no admiten `method` y
+    se compara con el valor crítico al 5%.
+    """
+    try:
+        result = stats.anderson(values, dist='norm', method='interpolate')
+    except TypeError:
+        result = stats.anderson(values, dist='norm')
+        critical_5 = float(result.critical_values[
+            list(result.significance_level).index(5.0)
+        ])
+        return {
+            'name': 'Anderson-Darling',
+            'statistic': float(result.statistic),
+            'critical_value': critical_5,
+            'n': len(values),
+            'is_normal': bool(result.statistic < critical_5)
+        }
+    return {
+        'name': 'Anderson-Darling',
+        'statistic': float(result.statistic),
+        'p_value': float(result.pvalue),
+        'n': len(values),
+        'is_normal': bool(result.pvalue > ALPHA)
+    }
+
+
+def _run_normality_test(test: str, values: np.ndarray, seed: int) -> Dict[str, Any]:
+    """Ejecuta una prueba de la batería por nombre (tarea de `parallel_map`)."""
+    if test == 'shapiro':
+        return _shapiro_test(values, seed)
+    if test == 'dagostino':
+        return _dagostino_test(values)
+    return _anderson_test(values)
+
+
+@shared_cache(max_entries=256)
+def run_normality_tests(_df: pd.DataFrame, fingerprint: str, variable: str,
+                        seed: int = RANDOM_SEED) -> Dict[str, Dict[str, Any]]:
+    """
+    Ejecuta la batería de pruebas de normalidad sobre una variable.
+
+    Las tres pruebas se lanzan en paralelo con `parallel_map` (en línea si
+    se llama desde un trabajo de precálculo) y el resultado se cachea por (huella del filtro, variable, semilla), por lo
+    que el p-valor es estable entre reruns.
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        variable: Columna numérica a evaluar
+        seed: Semilla del muestreo de Shapiro-Wilk
+
+    Returns:
+        Dict {prueba: resultado}; vacío si hay menos de 8 observaciones
+    """
+    values = _df[variable].dropna().to_numpy(dtype=float)
+
+    # D'Agostino requiere al menos 8 observaciones
+    if len(values) < 8:
+        return {}
+
+    tests = ['shapiro', 'dagostino', 'anderson']
+    results = parallel_map(_run_normality_test, [(test, values, seed) for test in tests])
+    return dict(zip(tests, results))
+
+# ============================================================================
+# COMPARACIÓN DE GRUPOS (TSUNAMI VS NO TSUNAMI)
+# ============================================================================
+
+def _effect_size_label(delta: float) -> str:
+    """Clasifica la magnitud de un delta de Cliff."""
+    for threshold, label in CLIFFS_DELTA_THRESHOLDS:
+        if abs(delta) >= threshold:
+            return label
+    return 'Despreciable'
+
+
+def compare_numeric_groups(group_1: np.ndarray, group_0: np.ndarray,
+                           n_resamples: int = DEFAULT_RESAMPLES,
+                           seed: int = RANDOM_SEED) -> Dict[str, np.ndarray]:
+    """
+    Compara dos grupos columna a columna con pruebas no paramétricas.
+
+    Mann-Whitney U se evalúa para todas las columnas en una sola llamada
+    vectorizada; el delta de Cliff se deriva de U. El IC de la diferencia
+    de medias sale de un bootstrap estratificado por grupo.
+
+    Args:
+        group_1: Matriz (n1, p) del grupo con tsunami
+        group_0: Matriz (n0, p) del grupo sin tsunami
+        n_resamples: Remuestras bootstrap
+        seed: Semilla del bootstrap
+
+    Returns:
+        Dict de arrays de longitud p (medias, diferencia, IC, U, p-valor, delta)
+    """
+    n1, n0 = len(group_1), len(group_0)
+
+    u_stat, p_value = stats.mannwhitneyu(group_1, group_0, axis=0,
+                                         alternative='two-sided',
+                                         method='asymptotic')
+    cliffs_delta = 2 * u_stat / (n1 * n0) - 1
+
+    diff_samples = (bootstrap_means(group_1, n_resamples, seed) -
+                    bootstrap_means(group_0, n_resamples, seed + 1))
+    ci_low, ci_high = percentile_interval(diff_samples)
+
+    mean_1 = np.nanmean(group_1, axis=0)
+    mean_0 = np.nanmean(group_0, axis=0)
+
+    return {
+        'mean_1': mean_1,
+        'mean_0': mean_0,
+        'diff': mean_1 - mean_0,
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+        'u_stat': u_stat,
+        'p_value': p_value,
+        'cliffs_delta': cliffs_delta
+    }
+
+
+def chi_square_association(df: pd.DataFrame, column: str,
+                           target: str = 'tsunami') -> Dict[str, Any]:
+    """
+    Prueba chi-cuadrado de independencia entre una categoría y el objetivo.
+
+    Args:
+        df: DataFrame con ambas columnas
+        column: Columna categórica
+        target: Columna binaria objetivo
+
+    Returns:
+        Dict con chi2, grados de libertad, p-valor y V de Cramér, o None si
+        la tabla de contingencia no tiene al menos 2×2 celdas con datos
+    """
+    table = pd.crosstab(df[column], df[target])
+    table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+
+    if table.shape[0] < 2 or table.shape[1] < 2:
+        return None
+
+    chi2, p_value, dof, _ = stats.chi2_contingency(table.to_numpy())
+    n = table.to_numpy().sum()
+    cramers_v = np.sqrt(chi2 / (n * (min(table.shape) - 1)))
+
+    return {
+        'chi2': float(chi2),
+        'dof': int(dof),
+        'p_value': float(p_value),
+        'cramers_v': float(cramers_v)
+    }
+
+
+@shared_cache(max_entries=64)
+def run_group_comparison(_df: pd.DataFrame, fingerprint: str,
+                         n_resamples: int = DEFAULT_RESAMPLES,
+                         seed: int = RANDOM_SEED) -> Dict[str, pd.DataFrame]:
+    """
+    Motor de comparación tsunami vs no tsunami para la vista filtrada.
+
+    Args:
+        _df: DataFrame filtrado
+        fingerprint: Huella del filtro (ver `get_data_fingerprint`)
+        n_resamples: Remuestras bootstrap
+        seed: Semilla del bootstrap
+
+    Returns:
+        Dict con las tablas 'numeric' y 'categorical', o vacío si alguno de
+        los dos grupos no tiene eventos
+    """
+    is_tsunami = _df['tsunami'].to_numpy() == 1
+    if is_tsunami.all() or not is_tsunami.any():
+        return {}
+
+    numeric_cols = [col for col in NUMERIC_COLUMNS if col in _df.columns]
+    values = _df[numeric_cols].to_numpy(dtype=float)
+
+    result = compare_numeric_groups(values[is_tsunami], values[~is_tsunami],
+                                    n_resamples, seed)
+
+    numeric = pd.DataFrame({
+        'Variable': numeric_cols,
+        'Media (tsunami)': result['mean_1'],
+        'Media (sin tsunami)': result['mean_0'],
+        'Diferencia': result['diff'],
+        'IC 95% inf.': result['ci_low'],
+        'IC 95% sup.': result['ci_high'],
+        'U de Mann-Whitney': result['u_stat'],
+        'P-valor': result['p_value'],
+        'Delta de Cliff': result['cliffs_delta'],
+        'Efecto': [_effect_size_label(d) for d in result['cliffs_delta']]
+    })
+
+    categorical_rows = []
+    for col in CATEGORICAL_COLUMNS:
+        if col not in _df.columns:
+            continue
+        association = chi_square_association(_df, col)
+        if association is not None:
+            categorical_rows.append({
+                'Variable': col,
+                'Chi²': association['chi2'],
+                'Grados de libertad': association['dof'],
+                'P-valor': association['p_value'],
+                'V de Cramér': association['cramers_v']
+            })
+
+    return {
+        'numeric': numeric,
+        'categorical': pd.DataFrame(categorical_rows)
+    }
@@ -0,0 +1,191 @@
+"""
+Módulo de Almacén Columnar Compartido
+======================================
+Copia del dataset preparado en ficheros `.npy` por tipo de columna, que los
+procesos del panel abren con `mmap` en lugar de leer y preparar el CSV cada
+uno. Las páginas de datos viven una sola vez en la caché del sistema
+operativo y las comparten todos los workers del host.
+
+Cada tipo se guarda como una matriz (columnas × filas) en orden C, de modo
+que cada columna es contigua y el DataFrame se construye sobre vistas del
+fichero, sin copias. Los arrays son de solo lectura.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+STORE_DIR = Path(os.environ.get(
+    'TSUNAMI_STORE_DIR',
+    Path(__file__).parent.parent.parent / '.cache' / 'store'
+))
+META_FILE = 'meta.json'
+
+# pandas < 3 copia al concatenar salvo que se pida lo contrario; desde 3.0
+# (copy-on-write) nunca copia y el argumento está obsoleto
+_CONCAT_NO_COPY = {'copy': False} if int(pd.__version__.split('.')[0]) < 3 else {}
+
+# ============================================================================
+# ESCRITURA
+# ============================================================================
+
+def _column_group(series: pd.Series) -> str:
+    """Grupo de almacenamiento de una columna."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if series.dtype.kind == 'M':
+        return 'datetime'
+    if series.dtype.kind not in 'biuf':
+        raise ValueError(f"Tipo no soportado en el almacén: {series.name} ({series.dtype})")
+    return str(series.dtype)
+
+
+def build_store(df: pd.DataFrame, version: str) -> Path:
+    """
+    Escribe el almacén de una versión del dataset si no existe.
+
+    Se escribe en un directorio temporal y se publica con un renombrado
+    atómico: si varios procesos lo construyen a la vez, gana el primero y el
+    resto descarta su copia.
+
+    Args:
+        df: Dataset preparado (ver `read_events`)
+        version: Versión del dataset
+
+    Returns:
+        Path: Directorio del almacén
+
+    Raises:
+        ValueError: Si alguna columna tiene un tipo no soportado
+    """
+    target = STORE_DIR / version
+    if (target / META_FILE).exists():
+        return target
+
+    groups: Dict[str, List[str]] = {}
+    for column in df.columns:
+        groups.setdefault(_column_group(df[column]), []).append(column)
+
+    meta: Dict[str, Any] = {'rows': len(df), 'columns': [], 'index': None, 'categories': {}}
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        meta['index'] = 'index.npy'
+
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=STORE_DIR, prefix=f".{version}-"))
+    try:
+        for group, columns in groups.items():
+            if group == 'category':
+                values = np.stack([df[c].cat.codes.to_numpy(dtype=np.int32) for c in columns])
+                for c in columns:
+                    meta['categories'][c] = {'values': df[c].cat.categories.tolist(),
+                                             'ordered': bool(df[c].cat.ordered)}
+            elif group == 'datetime':
+                values = np.stack([df[c].to_numpy().view(np.int64) for c in columns])
+            else:
+                values = np.stack([df[c].to_numpy() for c in columns])
+            np.save(tmp_dir / f"{group}.npy", np.ascontiguousarray(values))
+            for row, column in enumerate(columns):
+                dtype = str(df[column].dtype) if group == 'datetime' else None
+                meta['columns'].append({'name': column, 'group': group, 'row': row, 'dtype': dtype})
+
+        if meta['index']:
+            np.save(tmp_dir / meta['index'], df.index.to_numpy())
+
+        order = {column: i for i, column in enumerate(df.columns)}
+        meta['columns'].sort(key=lambda entry: order[entry['name']])
+        (tmp_dir / META_FILE).write_text(json.dumps(meta, ensure_ascii=False))
+
+        try:
+            os.rename(tmp_dir, target)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)  # Otro proceso lo publicó antes
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return target
+
+# ============================================================================
+# LECTURA
+# ============================================================================
+
+def open_store(version: str) -> pd.DataFrame:
+    """
+    Abre el almacén de una versión como DataFrame respaldado por `mmap`.
+
+    Args:
+        version: Versión del dataset
+
+    Returns:
+        pd.DataFrame de solo lectura con las columnas en su orden original
+
+    Raises:
+        FileNotFoundError: Si el almacén de esa versión no existe
+    """
+    path = STORE_DIR / version
+    meta = json.loads((path / META_FILE).read_text())
+    arrays = {group: np.load(path / f"{group}.npy", mmap_mode='r')
+              for group in {entry['group'] for entry in meta['columns']}}
+    index = (pd.Index(np.load(path / meta['index'], mmap_mode='r')) if meta['index']
+             else pd.RangeIndex(meta['rows']))
+
+    # Tramos consecutivos del mismo grupo y filas contiguas: cada tramo es una
+    # vista de la matriz del fichero
+    parts = []
+    run: List[Dict[str, Any]] = []
+
+    def flush():
+        if not run:
+            return
+        group = run[0]['group']
+        names = [entry['name'] for entry in run]
+        if group == 'category':
+            for entry in run:
+                categories = meta['categories'][entry['name']]
+                parts.append(pd.DataFrame({entry['name']: pd.Categorical.from_codes(
+                    arrays[group][entry['row']], categories['values'], categories['ordered']
+                )}, index=index))
+        else:
+            block = arrays[group][run[0]['row']:run[-1]['row'] + 1]
+            if group == 'datetime':
+                block = block.view(run[0]['dtype'])
+            parts.append(pd.DataFrame(block.T, columns=names, index=index, copy=False))
+        run.clear()
+
+    for entry in meta['columns']:
+        if run and (entry['group'] != run[-1]['group'] or entry['row'] != run[-1]['row'] + 1
+                    or entry['dtype'] != run[-1]['dtype']):
+            flush()
+        run.append(entry)
+    flush()
+
+    return pd.concat(parts, axis=1, **_CONCAT_NO_COPY)
+
+
+def prune_stores(keep: str) -> int:
+    """
+    Borra los almacenes de versiones anteriores.
+
+    Args:
+        keep: Versión vigente
+
+    Returns:
+        int: Almacenes borrados
+    """
+    if not STORE_DIR.is_dir():
+        return 0
+    pruned = 0
+    for path in STORE_DIR.iterdir():
+        if path.is_dir() and path.name != keep and not path.name.startswith('.'):
+            shutil.rmtree(path, ignore_errors=True)
+            pruned += 1
+    return pruned
@@ -6,10 +6,15 @@ Define y aplica estilos personalizados para la aplicación Streamlit.
 
 import streamlit as st
 
+from utils.assets import minify_css
+
 def apply_custom_css():
     """
     Aplica estilos CSS personalizados a la aplicación.
     Incluye temas oscuros/claros, animaciones y componentes responsivos.
+    
+    El CSS se minimiza una sola vez por proceso y se emite siempre idéntico,
+    de modo que en las reejecuciones viaja como referencia.
     """
     
     custom_css = """
@@ -341,4 +346,4 @@ def apply_custom_css():
     </style>
     """
     
-    st.markdown(custom_css, unsafe_allow_html=True)
+    st.markdown(minify_css(custom_css), unsafe_allow_html=True)
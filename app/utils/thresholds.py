@@ -0,0 +1,182 @@
+"""
+Módulo de Umbrales
+===================
+Explorador de umbrales magnitud × profundidad: tablas de conteos acumulados
+que permiten consultar TPR/FPR, precisión y recall de cualquier par de
+cortes en tiempo constante.
+"""
+
+import numpy as np
+from typing import Dict, Any
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+MAX_MAGNITUDE_CUTOFFS = 200
+DEPTH_STEP_KM = 5.0
+
+# ============================================================================
+# CONSTRUCCIÓN DE LA TABLA
+# ============================================================================
+
+def magnitude_cutoffs(magnitude: np.ndarray) -> np.ndarray:
+    """
+    Cortes candidatos de magnitud: todos los valores observados, o cuantiles
+    si hay demasiados.
+    """
+    cutoffs = np.unique(magnitude)
+    if len(cutoffs) > MAX_MAGNITUDE_CUTOFFS:
+        cutoffs = np.unique(np.quantile(magnitude, np.linspace(0, 1, MAX_MAGNITUDE_CUTOFFS)))
+    return cutoffs
+
+
+def depth_cutoffs(depth: np.ndarray, step: float = DEPTH_STEP_KM) -> np.ndarray:
+    """Cortes candidatos de profundidad en pasos regulares hasta cubrir el máximo."""
+    max_depth = float(np.max(depth)) if len(depth) else step
+    return np.arange(step, max_depth + 2 * step, step)
+
+
+def build_threshold_table(magnitude: np.ndarray, depth: np.ndarray,
+                          labels: np.ndarray) -> Dict[str, Any]:
+    """
+    Tabla 2D de conteos para la regla "magnitud ≥ m y profundidad < d".
+
+    Cada evento se ubica una vez en su celda de la rejilla (búsqueda binaria,
+    O(n log n)); después, sumas acumuladas inversas en magnitud y directas en
+    profundidad dan los eventos disparados y los tsunamis capturados para
+    todos los pares de cortes a la vez.
+
+    Args:
+        magnitude: Magnitudes
+        depth: Profundidades (km)
+        labels: Etiqueta binaria de tsunami
+
+    Returns:
+        Dict con los cortes y las matrices 'triggered' y 'tp' (cortes de
+        magnitud × cortes de profundidad), más los totales de la vista
+    """
+    magnitude = np.asarray(magnitude, dtype=float)
+    depth = np.asarray(depth, dtype=float)
+    labels = np.asarray(labels, dtype=np.int64)
+
+    mag_grid = magnitude_cutoffs(magnitude)
+    depth_grid = depth_cutoffs(depth)
+    n_mag, n_depth = len(mag_grid), len(depth_grid)
+
+    # Índice del mayor corte m_i ≤ magnitud: el evento dispara para i ≤ mag_idx
+    mag_idx = np.searchsorted(mag_grid, magnitude, side='right') - 1
+    # Número de cortes d_j ≤ profundidad: el evento dispara para j ≥ depth_idx
+    depth_idx = np.searchsorted(depth_grid, depth, side='right')
+
+    valid = (mag_idx >= 0) & (depth_idx < n_depth)
+    cells = mag_idx[valid] * n_depth + depth_idx[valid]
+
+    size = n_mag * n_depth
+    total_hist = np.bincount(cells, minlength=size).reshape(n_mag, n_depth)
+    pos_hist = np.bincount(cells, weights=labels[valid], minlength=size).reshape(n_mag, n_depth)
+
+    # Suma acumulada inversa en magnitud (≥ m) y directa en profundidad (< d)
+    triggered = np.cumsum(np.cumsum(total_hist[::-1], axis=0)[::-1], axis=1)
+    tp = np.cumsum(np.cumsum(pos_hist[::-1], axis=0)[::-1], axis=1)
+
+    return {
+        'mag_grid': mag_grid,
+        'depth_grid': depth_grid,
+        'triggered': triggered.astype(np.int64),
+        'tp': tp.astype(np.int64),
+        'positives': int(labels.sum()),
+        'negatives': int(len(labels) - labels.sum())
+    }
+
+# ============================================================================
+# CONSULTAS
+# ============================================================================
+
+def rates_from_counts(triggered: np.ndarray, tp: np.ndarray,
+                      positives: int, negatives: int) -> Dict[str, np.ndarray]:
+    """
+    TPR, FPR y precisión a partir de conteos (escalares o matrices).
+
+    Args:
+        triggered: Eventos disparados
+        tp: Tsunamis capturados
+        positives: Total de tsunamis
+        negatives: Total de eventos sin tsunami
+
+    Returns:
+        Dict con tpr (= recall), fpr, precision y f1
+    """
+    fp = triggered - tp
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tpr = tp / positives if positives > 0 else np.zeros_like(tp, dtype=float)
+        fpr = fp / negatives if negatives > 0 else np.zeros_like(fp, dtype=float)
+        precision = np.where(triggered > 0, tp / triggered, np.nan)
+        f1 = 2 * precision * tpr / (precision + tpr)
+    return {'tpr': tpr, 'fpr': fpr, 'precision': precision, 'f1': f1}
+
+
+def lookup_threshold(table: Dict[str, Any], min_magnitude: float,
+                     max_depth: float) -> Dict[str, float]:
+    """
+    Métricas de un par de cortes en tiempo constante.
+
+    Los cortes se ajustan a la rejilla de la tabla: el menor corte de
+    magnitud ≥ `min_magnitude` (la misma regla sobre los datos salvo que la
+    rejilla sea de cuantiles) y el mayor corte de profundidad ≤ `max_depth`.
+    La rejilla de profundidad va en pasos fijos de `DEPTH_STEP_KM`, no por
+    valores observados: fuera de ella la profundidad se redondea hacia abajo
+    al paso (p. ej. 73 km se evalúa como < 70 km) y los conteos pueden
+    diferir de aplicar la regla directamente.
+
+    Args:
+        table: Tabla de `build_threshold_table`
+        min_magnitude: Corte de magnitud (≥)
+        max_depth: Corte de profundidad (<)
+
+    Returns:
+        Dict con conteos y métricas del par
+    """
+    i = int(np.searchsorted(table['mag_grid'], min_magnitude, side='left'))
+    j = int(np.searchsorted(table['depth_grid'], max_depth, side='right')) - 1
+
+    if i >= len(table['mag_grid']) or j < 0:
+        triggered, tp = 0, 0
+    else:
+        triggered, tp = int(table['triggered'][i, j]), int(table['tp'][i, j])
+
+    rates = rates_from_counts(np.float64(triggered), np.float64(tp),
+                              table['positives'], table['negatives'])
+    return {
+        'triggered': triggered,
+        'tp': tp,
+        'fp': triggered - tp,
+        'fn': table['positives'] - tp,
+        **{key: float(value) for key, value in rates.items()}
+    }
+
+
+def curves_at_depth(table: Dict[str, Any], max_depth: float) -> Dict[str, np.ndarray]:
+    """
+    Curvas ROC y PR al variar el corte de magnitud con la profundidad fija.
+
+    Args:
+        table: Tabla de `build_threshold_table`
+        max_depth: Corte de profundidad (<), redondeado hacia abajo a la
+            rejilla como en `lookup_threshold`
+
+    Returns:
+        Dict con los cortes de magnitud y sus tpr, fpr y precisión
+    """
+    j = int(np.searchsorted(table['depth_grid'], max_depth, side='right')) - 1
+    n_mag = len(table['mag_grid'])
+
+    if j < 0:
+        triggered = np.zeros(n_mag)
+        tp = np.zeros(n_mag)
+    else:
+        triggered = table['triggered'][:, j].astype(float)
+        tp = table['tp'][:, j].astype(float)
+
+    rates = rates_from_counts(triggered, tp, table['positives'], table['negatives'])
+    return {'mag_grid': table['mag_grid'], **rates}
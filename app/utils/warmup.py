@@ -0,0 +1,212 @@
+"""
+Módulo de Precálculo
+=====================
+Planes de precálculo para el planificador de trabajos: calientan las cachés
+de los análisis costosos (histogramas, correlaciones, pruebas estadísticas,
+capas de mapas, series temporales) para los filtros más habituales.
+
+Cada tarea llama a la función cacheada con exactamente los mismos
+argumentos que la interfaz, de modo que comparte su entrada de caché. Todo
+el cálculo (también filtrar las vistas de los predefinidos) se hace dentro
+del trabajo, nunca en la ejecución del script.
+"""
+
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from utils.aggregations import (
+    get_box_summary, get_correlation_matrix, get_histogram,
+    CORRELATION_COLUMNS, DISTRIBUTION_VARIABLES
+)
+from utils.data_loader import get_data_fingerprint, get_dataset_version, get_filtered_data
+from utils.decomposition import decompose_monthly, monthly_series
+from utils.jobs import Job, Task, get_job, submit_job
+from utils.query import freeze_filters
+from utils.rates import get_segment_rates, INTERVAL_METHODS, SEGMENT_COLUMNS
+from utils.rolling import get_rolling_stats, ROLLING_WINDOWS
+from utils.seismicity import (
+    get_gr_grid, DEFAULT_CELL_DEG, GLOBAL_CELL_DEG, GR_CELL_SIZES, GR_YEAR_WINDOWS, MIN_EVENTS
+)
+from utils.stat_tests import run_group_comparison, run_normality_tests
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+WARMUP_JOB_KEY = 'warmup'
+MAX_POPULAR_PRESETS = 3
+POPULAR_RELAUNCH_S = 60   # Intervalo mínimo entre precálculos de nuevos populares
+
+# Filtros que se precalculan siempre al arrancar (además de los populares)
+FILTER_PRESETS: List[Dict[str, Any]] = [
+    {},
+    {'region_filter': 'Solo Ring of Fire'},
+    {'tsunami_filter': 'Solo con Tsunami'},
+    {'mainshocks_only': True, 'decluster_scale': 1.0}
+]
+
+_usage = Counter()
+_usage_lock = threading.Lock()
+_warmup_lock = threading.Lock()
+_warmup_version: Optional[str] = None
+_warmed_presets: set = set()       # Filtros congelados ya encargados en esta versión
+_warmup_launched_at = 0.0
+
+# ============================================================================
+# POPULARIDAD DE FILTROS
+# ============================================================================
+
+def record_filter_usage(filters: Dict[str, Any]):
+    """Cuenta una aplicación de filtros para el ranking de populares."""
+    with _usage_lock:
+        _usage[freeze_filters(filters)] += 1
+
+
+def popular_presets(n: int = MAX_POPULAR_PRESETS) -> List[Dict[str, Any]]:
+    """Las `n` combinaciones de filtros más usadas en este proceso."""
+    with _usage_lock:
+        most_common = _usage.most_common(n)
+    return [{key: list(value) if isinstance(value, tuple) else value for key, value in frozen}
+            for frozen, _ in most_common]
+
+# ============================================================================
+# PLANES DE PRECÁLCULO
+# ============================================================================
+
+def _decompose_view(df_view: pd.DataFrame):
+    """Descomposición mensual con los mismos argumentos que la pestaña temporal."""
+    series = monthly_series(df_view)
+    decompose_monthly(series['events'], series['tsunamis'])
+
+
+def _preset_tasks(df: pd.DataFrame, preset: Dict[str, Any], label: str) -> List[Task]:
+    """Filtra un predefinido (dentro del trabajo) y devuelve sus tareas de vista."""
+    return view_tasks(get_filtered_data(df, preset), label=label)
+
+
+def view_tasks(df_view: pd.DataFrame, label: str = '') -> List[Task]:
+    """
+    Tareas que calientan los análisis costosos de una vista filtrada.
+
+    Args:
+        df_view: DataFrame filtrado
+        label: Prefijo de las etiquetas de progreso
+
+    Returns:
+        List de tareas, las de uso más probable primero
+    """
+    if len(df_view) == 0:
+        return []
+
+    fp = get_data_fingerprint(df_view)
+    prefix = f"{label} · " if label else ''
+
+    tasks: List[Task] = [
+        (f"{prefix}correlaciones", get_correlation_matrix,
+         (df_view, fp, tuple(CORRELATION_COLUMNS))),
+        (f"{prefix}comparación de grupos", run_group_comparison, (df_view, fp)),
+        (f"{prefix}descomposición temporal", _decompose_view, (df_view,)),
+        (f"{prefix}b-value global", get_gr_grid,
+         (df_view, fp, GLOBAL_CELL_DEG, None, MIN_EVENTS)),
+        (f"{prefix}mapa b-value", get_gr_grid,
+         (df_view, fp, DEFAULT_CELL_DEG, None, MIN_EVENTS))
+    ]
+
+    for variable in DISTRIBUTION_VARIABLES:
+        tasks.append((f"{prefix}histograma {variable}", get_histogram, (df_view, fp, variable)))
+        tasks.append((f"{prefix}box plot {variable}", get_box_summary, (df_view, fp, variable)))
+
+    for window in ROLLING_WINDOWS:
+        for by_region in (False, True):
+            tasks.append((f"{prefix}ventana {window} días", get_rolling_stats,
+                          (df_view, fp, window, by_region)))
+
+    for method in INTERVAL_METHODS:
+        for segment in SEGMENT_COLUMNS:
+            tasks.append((f"{prefix}tasas {segment} ({method})", get_segment_rates,
+                          (df_view, fp, segment, method)))
+
+    for variable in DISTRIBUTION_VARIABLES:
+        tasks.append((f"{prefix}normalidad {variable}", run_normality_tests,
+                      (df_view, fp, variable)))
+
+    for cell_deg in GR_CELL_SIZES:
+        for year_window in GR_YEAR_WINDOWS.values():
+            if (cell_deg, year_window) != (DEFAULT_CELL_DEG, None):
+                tasks.append((f"{prefix}mapa b-value {cell_deg:g}°", get_gr_grid,
+                              (df_view, fp, cell_deg, year_window, MIN_EVENTS)))
+
+    return tasks
+
+
+def start_warmup(df: pd.DataFrame, force: bool = False) -> Job:
+    """
+    Lanza el precálculo de los filtros predefinidos y populares.
+
+    Con una versión nueva del dataset (o con `force`) se precalculan todos y
+    el trabajo anterior, si seguía en curso, se cancela. Si solo cambia el
+    ranking de populares, se encargan únicamente los populares que aún no
+    se han precalculado, cuando el trabajo actual ha terminado y como mucho
+    una vez cada `POPULAR_RELAUNCH_S`: mientras se reparten los primeros
+    usos, cambiar de filtros no relanza el precálculo.
+
+    Args:
+        df: Catálogo completo
+        force: Relanzar todo aunque los datos no hayan cambiado
+
+    Returns:
+        Job de precálculo (el existente si no hacía falta relanzarlo)
+    """
+    global _warmup_version, _warmup_launched_at
+    version = get_dataset_version()
+
+    with _warmup_lock:
+        current = get_job(WARMUP_JOB_KEY)
+        if force or current is None or version != _warmup_version:
+            _warmup_version = version
+            _warmed_presets.clear()
+            presets = list(FILTER_PRESETS)
+            frozen = {freeze_filters(preset) for preset in presets}
+            for preset in popular_presets():
+                if freeze_filters(preset) not in frozen:
+                    presets.append(preset)
+        elif current.finished and time.time() - _warmup_launched_at >= POPULAR_RELAUNCH_S:
+            presets = [preset for preset in popular_presets()
+                       if freeze_filters(preset) not in _warmed_presets]
+            if not presets:
+                return current
+        else:
+            return current
+
+        _warmed_presets.update(freeze_filters(preset) for preset in presets)
+        _warmup_launched_at = time.time()
+
+        # Filtrar cada predefinido es una tarea más: la primera ejecución del
+        # script no espera a ningún filtrado ni desagrupamiento
+        tasks: List[Task] = [(f"preset {i + 1} · filtrado", _preset_tasks,
+                              (df, preset, f"preset {i + 1}"))
+                             for i, preset in enumerate(presets)]
+
+        return submit_job(WARMUP_JOB_KEY, "Filtros predefinidos y populares", tasks)
+
+
+def start_view_warmup(session_key: str, df_view: pd.DataFrame) -> Job:
+    """
+    Precalcula en segundo plano las variantes de la vista actual que la
+    interfaz todavía no ha pedido (otras variables, ventanas, mapas...).
+
+    Un nuevo envío para la misma sesión cancela el anterior: si el usuario
+    cambia los filtros a mitad de cálculo, el trabajo obsoleto se detiene.
+
+    Args:
+        session_key: Identificador de la sesión
+        df_view: DataFrame filtrado
+
+    Returns:
+        Job de la vista
+    """
+    return submit_job(f"view:{session_key}", "Vista actual", view_tasks(df_view))